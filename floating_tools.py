@@ -1,25 +1,49 @@
+import time
+_import_started = time.perf_counter()
 import maya.cmds as cmds
 import maya.mel as mel
+import maya.utils
 import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 from maya import OpenMayaUI as omui
 from functools import wraps
-
+import asyncio
+from collections import deque
+from contextlib import contextmanager, ContextDecorator
+import importlib
+import json
+import math
+import os
+import sys
+import threading
+import types
+
+_maya_imported = time.perf_counter()
 try:
     from PySide6 import QtWidgets, QtCore, QtGui
     from PySide6.QtGui import QColor
-    from PySide6.QtCore import QTimer, QPropertyAnimation, QEasingCurve
+    from PySide6.QtCore import QTimer
     from shiboken6 import wrapInstance
 except ImportError:
     from PySide2 import QtWidgets, QtCore, QtGui
     from PySide2.QtGui import QColor
-    from PySide2.QtCore import QTimer, QPropertyAnimation, QEasingCurve
+    from PySide2.QtCore import QTimer
     from shiboken2 import wrapInstance
+_qt_imported = time.perf_counter()
 
 
 def maya_main_window():
     main_window_ptr = omui.MQtUtil.mainWindow()
     return wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
 
+def create_popup_menu(parent, style):
+    # Window flags and translucency are set once here; changing them later makes Qt recreate the native window
+    menu = QtWidgets.QMenu(parent)
+    menu.setWindowFlags(menu.windowFlags() | QtCore.Qt.FramelessWindowHint | QtCore.Qt.NoDropShadowWindowHint)
+    menu.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+    menu.setStyleSheet(style)
+    return menu
+
 def hex_value(hex_color, factor):
     color = QColor(hex_color)
     h, s, v, a = color.getHsvF()
@@ -27,16 +51,1431 @@ def hex_value(hex_color, factor):
     color.setHsvF(h, s, v, a)
     return color.name()
 
+#----------------------------------------------------------------------------------------------------------------
+# Chrome Trace Event export. Spans are streamed to a JSON array file that can be opened in chrome://tracing or Perfetto.
+class ChromeTracer(object):
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self._file = None
+        self._first = True
+        self._pid = os.getpid()
+
+    def _now(self):
+        return time.perf_counter() * 1000000.0
+
+    def start(self, path=None):
+        if self.enabled:
+            self.stop()
+        if path is None:
+            path = os.path.join(cmds.internalVar(userTmpDir=True), 'floating_tools_trace.json')
+        self.path = path
+        self._file = open(path, 'w')
+        self._file.write('[')
+        self._first = True
+        self.enabled = True
+        self.write_event({'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': threading.get_ident(), 'args': {'name': 'Maya'}})
+        return path
+
+    def stop(self):
+        if not self.enabled:
+            return None
+        self.enabled = False
+        self._file.write(']')
+        self._file.close()
+        self._file = None
+        return self.path
+
+    def write_event(self, event):
+        if not self.enabled:
+            return
+        if not self._first:
+            self._file.write(',')
+        self._first = False
+        self._file.write(json.dumps(event))
+        if event.get('ph') != 'X':
+            self._file.flush()
+
+    def complete(self, name, cat, start, end=None, args=None):
+        # Writes a finished span from a start timestamp taken earlier with now()
+        if not self.enabled:
+            return
+        end = self._now() if end is None else end
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': end - start, 'pid': self._pid, 'tid': threading.get_ident()}
+        if args:
+            event['args'] = args
+        self.write_event(event)
+
+    def instant(self, name, cat, args=None):
+        if not self.enabled:
+            return
+        event = {'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'ts': self._now(), 'pid': self._pid, 'tid': threading.get_ident()}
+        if args:
+            event['args'] = args
+        self.write_event(event)
+
+    def now(self):
+        return self._now() if self.enabled else None
+
+    @contextmanager
+    def span(self, name, cat, args=None):
+        if not self.enabled:
+            yield
+            return
+        start = self._now()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, start, args=args)
+
+tracer = ChromeTracer()
+
+class _TracedCommands(object):
+    # Stands in for maya.cmds / maya.mel while a trace is recording so every issued command gets its own span
+    def __init__(self, module, prefix):
+        self._module = module
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        func = getattr(self._module, name)
+        if not callable(func):
+            return func
+        label = f"{self._prefix}.{name}"
+
+        @wraps(func)
+        def traced_command(*args, **kwargs):
+            with tracer.span(label, 'maya'):
+                return func(*args, **kwargs)
+        return traced_command
+
+_untraced_modules = {}
+
+def start_trace(path=None):
+    if not _untraced_modules:
+        _untraced_modules['cmds'] = cmds
+        _untraced_modules['mel'] = mel
+    path = tracer.start(path)
+    globals()['cmds'] = _TracedCommands(_untraced_modules['cmds'], 'cmds')
+    globals()['mel'] = _TracedCommands(_untraced_modules['mel'], 'mel')
+    print("Floating Tools trace recording to:", path)
+    return path
+
+def stop_trace():
+    if _untraced_modules:
+        globals()['cmds'] = _untraced_modules['cmds']
+        globals()['mel'] = _untraced_modules['mel']
+    path = tracer.stop()
+    if path:
+        print("Floating Tools trace saved:", path)
+    return path
+
+#----------------------------------------------------------------------------------------------------------------
+# Startup profiling. Every launch phase is timed against a budget in ms and the whole trace is logged when any
+# phase runs over. Results are appended to a small history file so first-paint latency can be compared per release.
+TOOL_VERSION = '1.1.0'
+
+STARTUP_BUDGETS_MS = {
+    'import: maya': 50,
+    'import: qt': 100,
+    'import: shape data': 5,
+    'import: total': 200,
+    'FloatingTools.__init__': 250,
+    'setup_ui: *': 40,
+    'get_keytick': 10,
+    'runtime commands': 20,
+    'radial menu': 30,
+    'first paint': 100,
+    'startup: total': 500,
+}
+
+class StartupProfiler(object):
+    history_size = 100
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = {}
+        self.order = []
+        self.paint_pending = None
+        self.finished = False
+        self._section = None
+
+    def add(self, name, start, end):
+        # Repeated phases (e.g. get_keytick) accumulate; the first start is kept for the trace
+        if name not in self.phases:
+            self.order.append(name)
+            self.phases[name] = [start, 0.0]
+        self.phases[name][1] += end - start
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    def section(self, name=None):
+        # Closes the running section and opens the next one, so long build functions need no re-indenting
+        now = time.perf_counter()
+        if self._section:
+            self.add(self._section[0], self._section[1], now)
+        self._section = (name, now) if name else None
+
+    def budget(self, name):
+        if name in STARTUP_BUDGETS_MS:
+            return STARTUP_BUDGETS_MS[name]
+        return STARTUP_BUDGETS_MS.get(name.split(':')[0] + ': *')
+
+    def durations(self):
+        return [(name, self.phases[name][1] * 1000.0, self.budget(name)) for name in self.order]
+
+    def finish(self):
+        if self.finished:
+            return
+        now = time.perf_counter()
+        if self.paint_pending is not None:
+            self.add('first paint', self.paint_pending, now)
+            self.paint_pending = None
+        self.add('startup: total', self.start, now)
+        self.finished = True
+
+        durations = self.durations()
+        for name, ms, budget in durations:
+            start = self.phases[name][0]
+            tracer.complete(name, 'startup', start * 1000000.0, (start * 1000000.0) + ms * 1000.0)
+
+        over = [(name, ms, budget) for name, ms, budget in durations if budget is not None and ms > budget]
+        if over:
+            print(f"Floating Tools {TOOL_VERSION} startup trace ({durations[-1][1]:.1f} ms):")
+            for name, ms, budget in durations:
+                flag = '  <-- over budget' if budget is not None and ms > budget else ''
+                budget_text = f"{budget} ms" if budget is not None else '-'
+                print(f"    {name:<32}{ms:>9.1f} ms  / {budget_text}{flag}")
+            cmds.warning("Floating Tools startup over budget: " + ', '.join(f"{name} {ms:.1f}/{budget} ms" for name, ms, budget in over))
+        self.record_history(durations)
+
+    def record_history(self, durations):
+        try:
+            path = startup_history_path()
+            history = startup_history()
+            history.append({
+                'version': TOOL_VERSION,
+                'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'phases': {name: round(ms, 3) for name, ms, budget in durations},
+            })
+            with open(path, 'w') as f:
+                json.dump(history[-self.history_size:], f)
+        except (IOError, OSError, TypeError, ValueError):
+            pass
+
+def startup_history_path():
+    return os.path.join(cmds.internalVar(userAppDir=True), 'floating_tools_startup.json')
+
+def startup_history(version=None):
+    try:
+        with open(startup_history_path()) as f:
+            history = json.load(f)
+    except (IOError, OSError, ValueError):
+        return []
+    if version is not None:
+        history = [entry for entry in history if entry.get('version') == version]
+    return history
+
+startup_profiler = StartupProfiler(_import_started)
+startup_profiler.add('import: maya', _import_started, _maya_imported)
+startup_profiler.add('import: qt', _maya_imported, _qt_imported)
+
+#----------------------------------------------------------------------------------------------------------------
+# Event-loop stall monitor. A heartbeat timer runs on the main thread while the panel is visible; a beat that arrives
+# more than threshold_ms late means the event loop was blocked. The stall is charged to the longest tool action that
+# ran since the previous beat, or to Maya itself when none did.
+class StallMonitor(object):
+    interval_ms = 50
+    threshold_ms = 100
+    history = 500
+    buckets_ms = (250, 500, 1000, 2000, 5000)
+    outside_action = 'Maya (no Floating Tools action)'
+
+    def __init__(self):
+        self.timer = None
+        self.last_beat = None
+        self.depth = 0
+        self.finished = []
+        self.stalls = deque(maxlen=self.history)
+
+    def set_active(self, active):
+        if active == self.active():
+            return
+        if not active:
+            self.timer.stop()
+            self.last_beat = None
+            return
+        if self.timer is None:
+            self.timer = QtCore.QTimer()
+            self.timer.setInterval(self.interval_ms)
+            self.timer.timeout.connect(self.beat)
+        self.finished = []
+        self.last_beat = time.perf_counter()
+        self.timer.start()
+
+    def active(self):
+        return self.timer is not None and self.timer.isActive()
+
+    @contextmanager
+    def action(self, name):
+        if self.last_beat is None:
+            yield
+            return
+        # Only the outermost action is recorded, so a button and the command it runs count once
+        self.depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.finished.append((name, time.perf_counter() - started))
+
+    def beat(self):
+        now = time.perf_counter()
+        late_ms = (now - self.last_beat) * 1000.0 - self.interval_ms
+        if late_ms >= self.threshold_ms:
+            name = max(self.finished, key=lambda action: action[1])[0] if self.finished else self.outside_action
+            self.stalls.append((name, late_ms))
+            tracer.instant(f"stall: {name}", 'stall', {'ms': round(late_ms, 1)})
+        self.finished = []
+        self.last_beat = now
+
+    def histogram(self):
+        # {action: [count, max ms, count per bucket]} with the last bucket for stalls over buckets_ms[-1]
+        rows = {}
+        for name, ms in self.stalls:
+            row = rows.setdefault(name, [0, 0.0, [0] * (len(self.buckets_ms) + 1)])
+            row[0] += 1
+            row[1] = max(row[1], ms)
+            row[2][next((index for index, bound in enumerate(self.buckets_ms) if ms < bound), len(self.buckets_ms))] += 1
+        return rows
+
+    def print_report(self):
+        rows = self.histogram()
+        if not rows:
+            print(f"Floating Tools stall monitor: no stalls over {self.threshold_ms} ms yet.")
+            return
+        headers = [f"<{bound}" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]}"]
+        print(f"Floating Tools stalls over {self.threshold_ms} ms (last {len(self.stalls)}):")
+        print(f"    {'action':<36}{'count':>6}{'max ms':>9}" + ''.join(f"{header:>7}" for header in headers))
+        for name, (count, worst, buckets) in sorted(rows.items(), key=lambda item: -item[1][0]):
+            print(f"    {name[:36]:<36}{count:>6}{worst:>9.1f}" + ''.join(f"{bucket:>7}" for bucket in buckets))
+
+stall_monitor = StallMonitor()
+
+#----------------------------------------------------------------------------------------------------------------
+# Shared cache for widget resources. Icons are decoded once per resource path and text widths are shaped once per
+# (font, text), no matter how many buttons use them.
+class ResourceCache(object):
+    def __init__(self):
+        self.icons = {}
+        self.text_widths = {}
+        self.style_sheets = {}
+
+    def icon(self, path):
+        icon = self.icons.get(path)
+        if icon is None:
+            icon = self.icons[path] = QtGui.QIcon(path)
+        return icon
+
+    def style_sheet(self, key, build):
+        style = self.style_sheets.get(key)
+        if style is None:
+            style = self.style_sheets[key] = build()
+        return style
+
+    def text_width(self, font, text):
+        key = (font.key(), text)
+        width = self.text_widths.get(key)
+        if width is None:
+            width = self.text_widths[key] = QtGui.QFontMetrics(font).horizontalAdvance(text)
+        return width
+
+    def clear(self):
+        self.icons.clear()
+        self.text_widths.clear()
+        self.style_sheets.clear()
+
+resource_cache = ResourceCache()
+
+#----------------------------------------------------------------------------------------------------------------
+# Selection snapshots. The service keeps one resolved snapshot of the active selection and drops it from Maya
+# callbacks (selection, rename, reparent, undo/redo), so consecutive actions on the same selection share it.
+class SelectionSnapshot(object):
+    def __init__(self):
+        self.selection_list = om.MGlobal.getActiveSelectionList()
+        self.count = self.selection_list.length()
+        self._names = {}
+        self._dag_items = None
+
+    def is_empty(self):
+        return self.count == 0
+
+    def names(self, long=False, flatten=False):
+        # Resolved on first use; a snapshot is only handed out while it still matches the active selection
+        key = (long, flatten)
+        if key not in self._names:
+            self._names[key] = cmds.ls(selection=True, long=long, flatten=flatten) or []
+        return list(self._names[key])
+
+    def dag_items(self):
+        # [(MDagPath, component MObject)], the component is a null MObject for whole objects
+        if self._dag_items is None:
+            self._dag_items = []
+            for i in range(self.count):
+                try:
+                    self._dag_items.append(self.selection_list.getComponent(i))
+                except (RuntimeError, TypeError):
+                    pass
+        return self._dag_items
+
+    def has_components(self):
+        # Components can only be selected on hilited objects, so large object selections skip the item scan
+        if not cmds.ls(hilite=True):
+            return False
+        return any(not component.isNull() for dag_path, component in self.dag_items())
+
+    def dag_paths(self):
+        return [dag_path for dag_path, component in self.dag_items() if component.isNull()]
+
+    def components(self):
+        return [(dag_path, component) for dag_path, component in self.dag_items() if not component.isNull()]
+
+class SelectionService(object):
+    def __init__(self):
+        self._snapshot = None
+        self._callback_ids = []
+        self._listeners = []
+
+    def add_listener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def installed(self):
+        return bool(self._callback_ids)
+
+    def install(self):
+        if self._callback_ids:
+            return
+        self._callback_ids.append(om.MModelMessage.addCallback(om.MModelMessage.kActiveListModified, self.invalidate))
+        self._callback_ids.append(om.MDagMessage.addAllDagChangesCallback(self.invalidate))
+        for event in ('NameChanged', 'Undo', 'Redo', 'SceneOpened', 'NewSceneOpened'):
+            self._callback_ids.append(om.MEventMessage.addEventCallback(event, self.invalidate))
+
+    def uninstall(self):
+        for callback_id in self._callback_ids:
+            try:
+                om.MMessage.removeCallback(callback_id)
+            except RuntimeError:
+                pass
+        self._callback_ids = []
+        self._snapshot = None
+
+    def invalidate(self, *args):
+        self._snapshot = None
+        for listener in self._listeners:
+            listener()
+
+    def snapshot(self):
+        # Without callbacks there is nothing to invalidate a cached snapshot, so every call resolves a fresh one
+        if self._snapshot is None or not self._callback_ids:
+            snapshot = SelectionSnapshot()
+            if not self._callback_ids:
+                return snapshot
+            self._snapshot = snapshot
+        return self._snapshot
+
+    def is_current(self, snapshot):
+        return bool(self._callback_ids) and snapshot is self._snapshot
+
+    def reselect(self, snapshot):
+        # Restores the snapshot's selection, skipping the select when nothing changed it in the meantime
+        if not self.is_current(snapshot):
+            cmds.select(snapshot.names(long=True))
+
+selection_service = SelectionService()
+
+#----------------------------------------------------------------------------------------------------------------
+# Undoable API batches. Plain OpenMaya edits never reach the undo queue, so batched engines hand an ApiBatch to a
+# tiny MPxCommand plugin (written next to the user prefs and loaded on first use). The command applies the batch
+# and keeps it for undoIt/redoIt, giving one undo entry per batch instead of one per edited plug.
+BATCH_COMMAND = 'floatingToolsBatch'
+BATCH_QUEUE_MODULE = 'floating_tools_batch_queue'
+
+BATCH_PLUGIN_SOURCE = '''import maya.api.OpenMaya as om
+
+
+def maya_useNewAPI():
+    pass
+
+
+class FloatingToolsBatchCommand(om.MPxCommand):
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        self.batch = None
+
+    @staticmethod
+    def creator():
+        return FloatingToolsBatchCommand()
+
+    def isUndoable(self):
+        return self.batch is not None
+
+    def doIt(self, args):
+        import floating_tools_batch_queue as queue
+        if not queue.pending:
+            raise RuntimeError('floatingToolsBatch: no batch queued')
+        self.batch = queue.pending.pop(0)
+        self.batch.redo()
+
+    def redoIt(self):
+        self.batch.redo()
+
+    def undoIt(self):
+        self.batch.undo()
+
+
+def initializePlugin(plugin):
+    om.MFnPlugin(plugin, 'Floating Tools', '1.0').registerCommand('floatingToolsBatch', FloatingToolsBatchCommand.creator)
+
+
+def uninitializePlugin(plugin):
+    om.MFnPlugin(plugin).deregisterCommand('floatingToolsBatch')
+'''
+
+def batch_queue():
+    # Shared through sys.modules so the plugin finds it however this tool was loaded (file, shelf or drop)
+    queue = sys.modules.get(BATCH_QUEUE_MODULE)
+    if queue is None:
+        queue = types.ModuleType(BATCH_QUEUE_MODULE)
+        queue.pending = []
+        sys.modules[BATCH_QUEUE_MODULE] = queue
+    return queue
+
+def ensure_batch_plugin():
+    if cmds.pluginInfo('floatingToolsBatch', query=True, loaded=True):
+        return True
+    try:
+        folder = os.path.join(cmds.internalVar(userAppDir=True), 'floating_tools', 'plug-ins')
+        path = os.path.join(folder, 'floatingToolsBatch.py')
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        current = None
+        if os.path.exists(path):
+            with open(path) as f:
+                current = f.read()
+        if current != BATCH_PLUGIN_SOURCE:
+            # Batch runner workers start together, so each writes its own file and renames it over the plugin in one step
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                f.write(BATCH_PLUGIN_SOURCE)
+            os.replace(temp_path, path)
+        cmds.loadPlugin(path, quiet=True)
+    except (IOError, OSError, RuntimeError) as error:
+        cmds.warning(f"Floating Tools batch plugin unavailable, edits will not be undoable: {error}")
+        return False
+    return True
+
+class ApiBatch(object):
+    # Collects DG/DAG modifier edits and anim curve edits; nothing touches the scene until execute()
+    def __init__(self, name='floatingToolsBatch'):
+        self.name = name
+        self.modifier = om.MDagModifier()
+        self.anim_change = oma.MAnimCurveChange()
+        self.anim_edits = []
+        self.size = 0
+        self.done_once = False
+
+    def __len__(self):
+        return self.size
+
+    def set_plug(self, plug, value):
+        if isinstance(value, bool):
+            self.modifier.newPlugValueBool(plug, value)
+        elif isinstance(value, int):
+            self.modifier.newPlugValueInt(plug, value)
+        else:
+            self.modifier.newPlugValueDouble(plug, value)
+        self.size += 1
+
+    def add_anim_edit(self, edit):
+        # edit(anim_change) performs one MFnAnimCurve edit, passing anim_change so it can be undone
+        self.anim_edits.append(edit)
+        self.size += 1
+
+    def key_plug(self, plug, value):
+        # Modifier edits never reach auto-key, so the key setAttr would have set on the plug's curve is set here
+        curve_fn = oma.MFnAnimCurve(plug.source().node())
+        key_time = oma.MAnimControl.currentTime()
+
+        def edit(change):
+            index = curve_fn.find(key_time)
+            if index is None:
+                curve_fn.addKey(key_time, value, change=change)
+            else:
+                curve_fn.setValue(index, value, change)
+        self.add_anim_edit(edit)
+
+    def redo(self):
+        self.modifier.doIt()
+        if self.done_once:
+            self.anim_change.redoIt()
+        else:
+            for edit in self.anim_edits:
+                edit(self.anim_change)
+            self.anim_edits = []
+            self.done_once = True
+
+    def undo(self):
+        self.anim_change.undoIt()
+        self.modifier.undoIt()
+
+    def execute(self):
+        if not self.size:
+            return
+        with tracer.span(f"api batch: {self.name} ({self.size} edits)", 'undo'):
+            if chunked_executor.paused:
+                chunked_executor.deferred.append(self.execute)
+                return
+            if ensure_batch_plugin():
+                batch_queue().pending.append(self)
+                getattr(cmds, BATCH_COMMAND)()
+            else:
+                self.redo()
+
+def plug_is_settable(plug):
+    # Locked plugs and plugs driven by anything but an anim curve are left alone, the same as setAttr would
+    if plug.isLocked:
+        return False
+    if plug.isDestination:
+        return plug.source().node().hasFn(om.MFn.kAnimCurve)
+    return True
+
+def negated(plug):
+    return -plug.asDouble()
+
+RESET_TRANSLATE = (('translateX', 0.0), ('translateY', 0.0), ('translateZ', 0.0))
+RESET_ROTATE = (('rotateX', 0.0), ('rotateY', 0.0), ('rotateZ', 0.0))
+RESET_SCALE = (('scaleX', 1.0), ('scaleY', 1.0), ('scaleZ', 1.0))
+PASTE_INVERSE_VALUES = (('translateX', negated), ('rotateY', negated), ('rotateZ', negated))
+
+class undo_chunk(ContextDecorator):
+    # One named chunk per user action; chunks opened while another is open just join the outer one. Setting rollback
+    # undoes the whole chunk as soon as the outermost one closes.
+    depth = 0
+    rollback = False
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        undo_chunk.depth += 1
+        if undo_chunk.depth == 1:
+            cmds.undoInfo(openChunk=True, chunkName=self.name)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if undo_chunk.depth == 1:
+            cmds.undoInfo(closeChunk=True)
+            if undo_chunk.rollback:
+                undo_chunk.rollback = False
+                cmds.undo()
+        undo_chunk.depth -= 1
+        return False
+
 def undoable(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        cmds.undoInfo(openChunk=True)
-        try:
+        with tracer.span(f"undo chunk: {func.__name__}", 'undo'), undo_chunk(func.__name__):
             return func(*args, **kwargs)
-        finally:
-            cmds.undoInfo(closeChunk=True)
     return wrapper
 
+#----------------------------------------------------------------------------------------------------------------
+# Operations. Every action has a read-only plan() that gathers what it needs from the scene in bulk and an
+# apply() that writes it in bulk. Plans can be inspected without touching the scene (dry runs and cost
+# estimates), and several operations can run together in one undo chunk sharing one ApiBatch.
+class Plan(object):
+    def __init__(self, operation, targets=None, cost=0, warning=None, **data):
+        self.operation = operation
+        self.targets = targets or []
+        self.cost = cost
+        self.warning = warning
+        self.data = data
+
+    def describe(self):
+        if self.warning:
+            return f"{self.operation.label}: {self.warning}"
+        return f"{self.operation.label}: this will touch {self.cost} {self.operation.cost_unit} on {len(self.targets)} node(s)."
+
+class Operation(object):
+    name = ''
+    label = ''
+    cost_unit = 'plugs'
+    # batched operations only queue edits on the shared ApiBatch; others issue commands directly in apply()
+    batched = False
+    refresh = True
+    disable_auto_key = True
+    dg_mode = False
+    # Plans that stay valid while the selection is unchanged can be replayed by repeat-last without planning again
+    cache_plan = False
+    # Lists that apply() handles item by item ('targets' or keys of plan.data), so a large plan can run in slices
+    chunk_keys = ()
+
+    def plan(self, snapshot):
+        raise NotImplementedError
+
+    def apply(self, plan, batch):
+        raise NotImplementedError
+
+    def run(self, snapshot=None, dry_run=False):
+        return run_operations([self], snapshot=snapshot, dry_run=dry_run)[0]
+
+def run_operations(operations, snapshot=None, dry_run=False, name=None, plans=None):
+    snapshot = snapshot or selection_service.snapshot()
+    name = name or '+'.join(operation.name for operation in operations)
+    if plans is None:
+        plans = []
+        for operation in operations:
+            with tracer.span(f"plan: {operation.name}", 'operation'):
+                plans.append(operation.plan(snapshot))
+    if dry_run:
+        for plan in plans:
+            print(plan.describe())
+        return plans
+
+    for plan in plans:
+        if plan.warning:
+            cmds.warning(plan.describe())
+    runnable = [plan for plan in plans if not plan.warning]
+    if not runnable:
+        return plans
+
+    guard = suspend_evaluation(
+        refresh=any(plan.operation.refresh for plan in runnable),
+        disable_auto_key=all(plan.operation.disable_auto_key for plan in runnable),
+        dg_mode=any(plan.operation.dg_mode for plan in runnable))
+    label = ' + '.join(operation.label for operation in operations)
+    with guard, undo_chunk(name), tracer.span(f"apply: {name}", 'operation'):
+        if chunked_executor.wants(runnable):
+            if not chunked_executor.run(runnable, name, label):
+                undo_chunk.rollback = True
+                cmds.warning(f"{label} cancelled. Everything it changed has been undone.")
+                return plans
+        else:
+            batch = ApiBatch(name)
+            for plan in runnable:
+                if not plan.operation.batched and len(batch):
+                    # Direct commands must see the queued edits of earlier operations
+                    batch.execute()
+                    batch = ApiBatch(name)
+                plan.operation.apply(plan, batch)
+            batch.execute()
+
+    if all(operation.cache_plan for operation in operations):
+        remember_last_command(name, label, lambda: replay_operations(operations, snapshot, plans, name))
+    else:
+        remember_last_command(name, label, lambda: run_operations(operations, name=name))
+    return plans
+
+def replay_operations(operations, snapshot, plans, name):
+    # An unchanged selection means the cached plans still describe the scene, so the query phase is skipped
+    if selection_service.is_current(snapshot):
+        return run_operations(operations, snapshot=snapshot, name=name, plans=plans)
+    return run_operations(operations, name=name)
+
+OPERATIONS = {}
+
+def register_operation(operation):
+    OPERATIONS[operation.name] = operation
+    return operation
+
+def run_operation(name, dry_run=False):
+    return OPERATIONS[name].run(dry_run=dry_run)
+
+def selected_transforms(snapshot):
+    # [(MObject, MFnDependencyNode)] for each selected transform, once each, in selection order
+    seen = set()
+    transforms = []
+    for i in range(snapshot.count):
+        node = snapshot.selection_list.getDependNode(i)
+        if not node.hasFn(om.MFn.kTransform):
+            continue
+        handle = om.MObjectHandle(node).hashCode()
+        if handle not in seen:
+            seen.add(handle)
+            transforms.append((node, om.MFnDependencyNode(node)))
+    return transforms
+
+class TransformValuesOperation(Operation):
+    # Sets transform channels on every selected transform. Values may be callables taking the plug; they are
+    # resolved in apply() so they see the scene after any `before` MEL command has run.
+    batched = True
+    cache_plan = True
+
+    def __init__(self, name, label, values, before=None, disable_auto_key=True):
+        self.name = name
+        self.label = label
+        self.values = values
+        self.before = before
+        self.batched = before is None
+        self.disable_auto_key = disable_auto_key
+        # The MEL command must run once, before all of the values, so those plans are never sliced
+        self.chunk_keys = ('entries',) if before is None else ()
+
+    def plan(self, snapshot):
+        targets = []
+        entries = []
+        for node, node_fn in selected_transforms(snapshot):
+            targets.append(node_fn.name())
+            for attribute, value in self.values:
+                plug = node_fn.findPlug(attribute, False)
+                if plug_is_settable(plug):
+                    entries.append((plug, value))
+        return Plan(self, targets, len(entries), entries=entries)
+
+    def apply(self, plan, batch):
+        if self.before:
+            mel.eval(self.before)
+        auto_key = not self.disable_auto_key and cmds.autoKeyframe(query=True, state=True)
+        for plug, value in plan.data['entries']:
+            value = value(plug) if callable(value) else value
+            batch.set_plug(plug, value)
+            # Checked now rather than in plan(), since the `before` command may just have keyed the plug
+            if auto_key and plug.isDestination and plug.source().node().hasFn(om.MFn.kAnimCurve):
+                batch.key_plug(plug, value)
+
+class FreezeOperation(Operation):
+    cost_unit = 'channels'
+    cache_plan = True
+    chunk_keys = ('targets',)
+
+    def __init__(self, name, label, translate, rotate, scale):
+        self.name = name
+        self.label = label
+        self.flags = {'translate': translate, 'rotate': rotate, 'scale': scale}
+
+    def plan(self, snapshot):
+        targets = snapshot.names(long=True)
+        if not targets:
+            return Plan(self, warning="No objects selected.")
+        return Plan(self, targets, len(targets) * 3 * sum(self.flags.values()))
+
+    def apply(self, plan, batch):
+        cmds.makeIdentity(plan.targets, apply=True, normal=False, preserveNormals=True, **self.flags)
+
+class SnapToStoredPositionOperation(Operation):
+    name = 'move_to_stored_position'
+    label = 'Move to Pos'
+
+    def plan(self, snapshot):
+        targets = snapshot.names(long=True)
+        if not targets:
+            return Plan(self, warning="Please select at least one object to move.")
+        # A missing locator is created at the origin in apply()
+        locator_exists = cmds.objExists('storedPositionLocator')
+        stored_position = cmds.xform('storedPositionLocator', query=True, translation=True, worldSpace=True) if locator_exists else [0.0, 0.0, 0.0]
+        offsets = []
+        for obj in targets:
+            current_position = cmds.xform(obj, query=True, worldSpace=True, rotatePivot=True)
+            offsets.append([stored_position[i] - current_position[i] for i in range(3)])
+        return Plan(self, targets, len(targets) * 3, offsets=offsets, stored_position=stored_position,
+                    create_locator=not locator_exists, snapshot=snapshot)
+
+    def apply(self, plan, batch):
+        if plan.data['create_locator']:
+            create_loc_object('storedPositionLocator')
+            cmds.setAttr('storedPositionLocator.visibility', 0)
+        for obj, offset in zip(plan.targets, plan.data['offsets']):
+            cmds.move(offset[0], offset[1], offset[2], obj, relative=True, worldSpace=True)
+        selection_service.reselect(plan.data['snapshot'])
+        print(f"Moved {len(plan.targets)} object(s) to stored position: {plan.data['stored_position']}")
+
+class SnapToActiveOperation(Operation):
+    name = 'object_to_active_position'
+    label = 'Snap to Active Object'
+
+    def plan(self, snapshot):
+        selected_objects = snapshot.names(long=True)
+        if len(selected_objects) < 2:
+            return Plan(self, warning="Please select at least two objects.")
+        active_object = selected_objects[-1]
+        active_position = cmds.xform(active_object, query=True, worldSpace=True, rotatePivot=True)
+        targets = [obj for obj in selected_objects[:-1] if obj != active_object]
+        offsets = []
+        for obj in targets:
+            current_position = cmds.xform(obj, query=True, worldSpace=True, rotatePivot=True)
+            offsets.append([active_position[i] - current_position[i] for i in range(3)])
+        return Plan(self, targets, len(targets) * 3, offsets=offsets, reselect=selected_objects[:-1])
+
+    def apply(self, plan, batch):
+        for obj, offset in zip(plan.targets, plan.data['offsets']):
+            cmds.move(offset[0], offset[1], offset[2], obj, relative=True, worldSpace=True)
+        cmds.select(plan.data['reselect'], replace=True)
+
+class ObjectsOperation(Operation):
+    # Runs one bulk command over the objects behind the selection (components count as their objects)
+    cost_unit = 'nodes'
+    chunk_keys = ('targets',)
+
+    def __init__(self, name, label, command, refresh=True):
+        self.name = name
+        self.label = label
+        self.command = command
+        self.refresh = refresh
+
+    def plan(self, snapshot):
+        names = snapshot.names(long=True)
+        # ls with an empty list would return every node in the scene
+        targets = (cmds.ls(names, objectsOnly=True, long=True) or []) if names else []
+        if not targets:
+            return Plan(self, warning="No objects selected.")
+        return Plan(self, targets, len(targets))
+
+    def apply(self, plan, batch):
+        self.command(plan.targets)
+
+class OffsetGroupOperation(Operation):
+    name = 'create_adjustment_group'
+    label = 'Create Adjustment Group'
+    cost_unit = 'nodes'
+    dg_mode = True
+    chunk_keys = ('targets', 'nodes', 'parents')
+
+    def plan(self, snapshot):
+        targets = snapshot.names(long=True)
+        if not targets:
+            return Plan(self, warning="No objects selected. Please select at least one object.")
+        # Controls and parents are kept by UUID, since grouping a selected parent changes the long path of its children
+        nodes = [cmds.ls(ctrl_obj, uuid=True)[0] for ctrl_obj in targets]
+        parents = [cmds.listRelatives(ctrl_obj, parent=True, fullPath=True) for ctrl_obj in targets]
+        parents = [cmds.ls(parent[0], uuid=True)[0] if parent else None for parent in parents]
+        return Plan(self, targets, len(targets), nodes=nodes, parents=parents)
+
+    def apply(self, plan, batch):
+        for node, parent in zip(plan.data['nodes'], plan.data['parents']):
+            ctrl_obj = cmds.ls(node, long=True)[0]
+            current_parent = cmds.ls(parent, long=True)[0] if parent else None
+            grp1_name = f"{ctrl_obj.split('|')[-1]}_offset"
+            ctrl_grp1 = cmds.group(empty=True, name=grp1_name)
+            cmds.matchTransform(ctrl_grp1, ctrl_obj)
+            if current_parent:
+                ctrl_grp1 = cmds.parent(ctrl_grp1, current_parent)[0]
+            cmds.parent(ctrl_obj, ctrl_grp1)
+
+class ZeroKeysOperation(Operation):
+    name = 'zero_out'
+    label = 'Zero Out'
+    cost_unit = 'keys'
+    batched = True
+
+    def plan(self, snapshot):
+        anim_curves = cmds.keyframe(query=True, selected=True, name=True) or []
+        entries = []
+        for curve in anim_curves:
+            indices = cmds.keyframe(curve, query=True, selected=True, indexValue=True) or []
+            if indices:
+                entries.append((curve, [int(index) for index in indices]))
+        cost = sum(len(indices) for curve, indices in entries)
+        if not cost:
+            return Plan(self, warning="No keyframe selected. Please select keyframe(s) in the Graph Editor.")
+        return Plan(self, [curve for curve, indices in entries], cost, entries=entries)
+
+    def apply(self, plan, batch):
+        for curve, indices in plan.data['entries']:
+            curve_fn = oma.MFnAnimCurve(om.MSelectionList().add(curve).getDependNode(0))
+            for index in indices:
+                batch.add_anim_edit(lambda change, curve_fn=curve_fn, index=index: curve_fn.setValue(index, 0.0, change))
+        print(f"Set {plan.cost} keyframe(s) to zero across {len(plan.targets)} animation curve(s).")
+
+register_operation(TransformValuesOperation('reset_move', 'Reset Move', RESET_TRANSLATE, disable_auto_key=False))
+register_operation(TransformValuesOperation('reset_rotate', 'Reset Rotate', RESET_ROTATE, disable_auto_key=False))
+register_operation(TransformValuesOperation('reset_scale', 'Reset Scale', RESET_SCALE, disable_auto_key=False))
+register_operation(TransformValuesOperation('reset_all', 'Reset All', RESET_TRANSLATE + RESET_ROTATE + RESET_SCALE, disable_auto_key=False))
+register_operation(TransformValuesOperation('paste_inverse', 'Paste Inverse', PASTE_INVERSE_VALUES, before='timeSliderPasteKey false;', disable_auto_key=False))
+register_operation(FreezeOperation('freeze_transformation', 'Freeze Transformations', True, True, True))
+register_operation(FreezeOperation('freeze_translate', 'Freeze Translate', True, False, False))
+register_operation(FreezeOperation('freeze_rotate', 'Freeze Rotate', False, True, False))
+register_operation(FreezeOperation('freeze_scale', 'Freeze Scale', False, False, True))
+register_operation(ObjectsOperation('delete_history', 'Delete History', lambda targets: cmds.delete(targets, constructionHistory=True)))
+register_operation(ObjectsOperation('center_pivot', 'Center Pivot', lambda targets: cmds.xform(targets, centerPivots=True), refresh=False))
+register_operation(SnapToStoredPositionOperation())
+register_operation(SnapToActiveOperation())
+register_operation(OffsetGroupOperation())
+register_operation(ZeroKeysOperation())
+
+#----------------------------------------------------------------------------------------------------------------
+# Chunked execution for very large selections. The plans are applied slice by slice inside the open undo chunk.
+# Between slices the event loop runs so the panel can show progress. User input waits until the run is over, except
+# Esc, which cancels and rolls back the chunk. Command server batches and API batches that arrive meanwhile wait too,
+# so a rollback only undoes this run. Slice sizes adapt per operation so each slice takes about slice_budget_ms.
+def plan_size(plan):
+    key = plan.operation.chunk_keys[0]
+    return len(plan.targets if key == 'targets' else plan.data[key])
+
+def slice_plan(plan, start, stop):
+    keys = plan.operation.chunk_keys
+    targets = plan.targets[start:stop] if 'targets' in keys else plan.targets
+    data = {key: value[start:stop] if key in keys else value for key, value in plan.data.items()}
+    return Plan(plan.operation, targets, plan.cost, plan.warning, **data)
+
+class ChunkedExecutor(object):
+    threshold = 2000
+    one_shot_ms = 100.0
+    slice_budget_ms = 30.0
+    first_slice = 200
+    min_slice = 10
+    max_slice = 20000
+
+    def __init__(self):
+        # ms per item from each operation's last slice, used to size the next slice and to skip chunking small runs
+        self.rates = {}
+        # progress(label, done, total) is set by the open panel; total None hides the progress bar
+        self.progress = None
+        self.running = False
+        # True while the event loop runs between slices; work that would land in the open chunk goes to deferred
+        self.paused = False
+        self.deferred = []
+
+    def wants(self, plans):
+        if self.running or not command_table().record_repeat or QtWidgets.QApplication.instance() is None or cmds.about(batch=True):
+            return False
+        sizes = [(plan.operation.name, plan_size(plan)) for plan in plans if plan.operation.chunk_keys]
+        if sum(size for name, size in sizes) < self.threshold:
+            return False
+        if all(name in self.rates for name, size in sizes):
+            return sum(self.rates[name] * size for name, size in sizes) > self.one_shot_ms
+        return True
+
+    def slice_size(self, operation):
+        rate = self.rates.get(operation.name)
+        if rate is None:
+            return self.first_slice
+        return int(min(self.max_slice, max(self.min_slice, self.slice_budget_ms / max(rate, 0.0001))))
+
+    def run(self, plans, name, label):
+        # Returns False when Esc cancelled the run; the caller rolls back the undo chunk
+        total = sum(plan_size(plan) if plan.operation.chunk_keys else 1 for plan in plans)
+        done = 0
+        self.running = True
+        # Maya watches for Esc itself during a computation, so it is seen without delivering any input events
+        computation = om.MComputation()
+        computation.beginComputation(False, True, False)
+        try:
+            for plan in plans:
+                operation = plan.operation
+                if not operation.chunk_keys:
+                    batch = ApiBatch(name)
+                    operation.apply(plan, batch)
+                    batch.execute()
+                    done += 1
+                    continue
+                size = plan_size(plan)
+                start = 0
+                while start < size:
+                    stop = min(size, start + self.slice_size(operation))
+                    started = time.perf_counter()
+                    with tracer.span(f"slice: {operation.name} {start}-{stop}", 'operation'):
+                        # Every slice executes its own batch, so the edits land before the UI gets its turn
+                        batch = ApiBatch(name)
+                        operation.apply(slice_plan(plan, start, stop), batch)
+                        batch.execute()
+                    self.rates[operation.name] = (time.perf_counter() - started) * 1000.0 / (stop - start)
+                    done += stop - start
+                    start = stop
+                    if self.progress is not None:
+                        self.progress(label, done, total)
+                    self.paused = True
+                    try:
+                        QtWidgets.QApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
+                    finally:
+                        self.paused = False
+                    if computation.isInterruptRequested():
+                        return False
+            return True
+        finally:
+            computation.endComputation()
+            self.running = False
+            if self.progress is not None:
+                self.progress(label, done, None)
+            if self.deferred:
+                # Runs once the caller has closed (or rolled back) the undo chunk
+                maya.utils.executeDeferred(self.resume)
+
+    def resume(self):
+        deferred, self.deferred = self.deferred, []
+        for func in deferred:
+            func()
+
+chunked_executor = ChunkedExecutor()
+
+#----------------------------------------------------------------------------------------------------------------
+# Command table. Every tool action is registered by name so hotkeys, marking menus and runtime commands can
+# dispatch it straight from the table, without the panel being open or even built.
+COMMAND_MODULE = 'floating_tools_commands'
+RUNTIME_COMMAND_PREFIX = 'FloatingTools_'
+RUNTIME_COMMAND_CATEGORY = 'Custom Scripts.Floating Tools'
+TOOL_COMMANDS = {}
+
+def register_command(name, label, func, repeatable=True):
+    if not repeatable:
+        TOOL_COMMANDS[name] = (label, func)
+        return func
+
+    @wraps(func)
+    def command():
+        table = command_table()
+        remembered = table.remembered
+        result = func()
+        # Commands that resolved their own parameters or plans have already remembered a cheaper replay
+        if table.remembered == remembered:
+            remember_last_command(name, label, func)
+        return result
+    TOOL_COMMANDS[name] = (label, command)
+    return command
+
+def tool_command(label):
+    # Registers a FloatingTools handler and makes it a staticmethod, so it runs the same with or without the panel
+    def register(func):
+        return staticmethod(register_command(func.__name__, label, func))
+    return register
+
+def command_table():
+    # Shared through sys.modules like the batch queue, so runtime commands find the latest load of this tool
+    table = sys.modules.get(COMMAND_MODULE)
+    if table is None:
+        table = types.ModuleType(COMMAND_MODULE)
+        table.runtime_commands_installed = False
+        table.rotate_increment = 90.0
+        table.last_command = None
+        table.remembered = 0
+        table.radial_menu = None
+        table.command_server = None
+        table.record_repeat = True
+        sys.modules[COMMAND_MODULE] = table
+    table.commands = TOOL_COMMANDS
+    table.dispatch = run_tool_command
+    table.repeat_last = repeat_last_command
+    return table
+
+def run_tool_command(name):
+    label, func = TOOL_COMMANDS[name]
+    with tracer.span(f"command: {name}", 'command'), stall_monitor.action(label):
+        return func()
+
+def remember_last_command(name, label, replay):
+    # Maya's repeatLast (G key) calls back into the table, which replays with the parameters resolved this time
+    table = command_table()
+    # Pipeline batches must not take over the artist's G key
+    if not table.record_repeat:
+        return
+    table.last_command = (name, label, replay)
+    table.remembered += 1
+    if cmds.about(batch=True):
+        return
+    cmds.repeatLast(addCommand=f'python("import sys; sys.modules[{COMMAND_MODULE!r}].repeat_last()")', addCommandLabel=label)
+
+def repeat_last_command():
+    last_command = command_table().last_command
+    if last_command is None:
+        cmds.warning("No Floating Tools action to repeat yet.")
+        return
+    name, label, replay = last_command
+    with tracer.span(f"repeat: {name}", 'command'), stall_monitor.action(label):
+        return replay()
+
+def runtime_command_source(name):
+    return (f"import sys; table = sys.modules.get('{COMMAND_MODULE}'); "
+            f"table.dispatch('{name}') if table else __import__('maya.cmds').cmds.warning("
+            f"'Floating Tools is not loaded in this session. Click the FLT shelf button once.')")
+
+def install_runtime_commands():
+    table = command_table()
+    if table.runtime_commands_installed:
+        return
+    for name, (label, func) in TOOL_COMMANDS.items():
+        install_runtime_command(name, label)
+    table.runtime_commands_installed = True
+
+def install_runtime_command(name, label):
+    runtime_name = RUNTIME_COMMAND_PREFIX + name
+    source = runtime_command_source(name)
+    if cmds.runTimeCommand(runtime_name, exists=True):
+        cmds.runTimeCommand(runtime_name, edit=True, annotation=label, command=source, commandLanguage='python')
+        return
+    # Not default, so Maya saves them with the user's runtime commands and hotkeys survive a restart
+    cmds.runTimeCommand(runtime_name, category=RUNTIME_COMMAND_CATEGORY, annotation=label, command=source,
+                        commandLanguage='python', default=False)
+    cmds.nameCommand(runtime_name + 'NameCommand', annotation=label, command=runtime_name, sourceType='mel')
+
+@undoable
+def rotate_selected(x, y, z, increment=None):
+    table = command_table()
+    if increment is None:
+        increment = table.rotate_increment
+    # Hotkeys reuse the last increment typed in the panel
+    table.rotate_increment = increment
+    selected_objects = selection_service.snapshot().names()
+    if not selected_objects:
+        cmds.warning("No objects selected.")
+        return
+
+    for obj in selected_objects:
+        cmds.rotate(x * increment, y * increment, z * increment, obj, relative=True, objectSpace=True)
+    remember_last_command('rotate', f"Rotate {x * increment:g} {y * increment:g} {z * increment:g}", lambda: rotate_selected(x, y, z, increment))
+
+for _axis, _vector in (('X', (1, 0, 0)), ('Y', (0, 1, 0)), ('Z', (0, 0, 1))):
+    register_command(f'rotate_pos_{_axis}', f'Rotate +{_axis}', lambda vector=_vector: rotate_selected(*vector))
+    register_command(f'rotate_neg_{_axis}', f'Rotate -{_axis}', lambda vector=_vector: rotate_selected(*[-v for v in vector]))
+
+#----------------------------------------------------------------------------------------------------------------
+# Command server. Pipeline scripts send newline-delimited JSON-RPC 2.0 to a localhost socket. A request array is a
+# batch: it runs on Maya's main thread in one undo chunk and all of its responses come back on one line.
+COMMAND_SERVER_PORT = 7720
+# Built without escapes because this source is embedded in the drop installer's string
+RPC_LINE_END = chr(10).encode()
+
+def rpc_error(request_id, code, message):
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+def run_rpc_command(name, params):
+    # targets are selected before the command runs, curves have all their keys selected (for zero_out and friends)
+    targets = params.get('targets')
+    if targets is not None:
+        if targets:
+            cmds.select(targets, replace=True)
+        else:
+            cmds.select(clear=True)
+    curves = params.get('curves')
+    if curves:
+        cmds.selectKey(curves, replace=True)
+    selection_service.invalidate()
+    if params.get('dry_run'):
+        if name not in OPERATIONS:
+            raise ValueError(f"{name} cannot be dry run")
+        plan = run_operation(name, dry_run=True)
+        return {'description': plan.describe(), 'cost': plan.cost, 'targets': plan.targets, 'warning': plan.warning}
+    run_tool_command(name)
+    return {'selection': cmds.ls(selection=True, long=True) or []}
+
+def run_rpc_request(request):
+    if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+        return rpc_error(None, -32600, 'Invalid Request')
+    request_id = request.get('id')
+    method = request['method']
+    params = request.get('params', {})
+    if not isinstance(params, dict):
+        result = None
+        response = rpc_error(request_id, -32602, 'Invalid params: expected an object')
+    elif method == 'commands':
+        result = {name: label for name, (label, func) in TOOL_COMMANDS.items()}
+    elif method not in TOOL_COMMANDS:
+        result = None
+        response = rpc_error(request_id, -32601, f"Method not found: {method}")
+    else:
+        try:
+            result = run_rpc_command(method, params)
+        except Exception as error:
+            result = None
+            response = rpc_error(request_id, -32000, f"{type(error).__name__}: {error}")
+    if result is not None:
+        response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+    # Requests without an id are notifications and get no response
+    return response if 'id' in request else None
+
+def run_rpc_batch(requests):
+    table = command_table()
+    original_selection = cmds.ls(selection=True, long=True) or []
+    table.record_repeat = False
+    try:
+        with suspend_evaluation(disable_auto_key=False), undo_chunk(f"Floating Tools RPC ({len(requests)} requests)"):
+            with tracer.span(f"rpc batch: {len(requests)} requests", 'command'), stall_monitor.action('Command server batch'):
+                responses = [run_rpc_request(request) for request in requests]
+            # The artist's selection is restored inside the chunk, so undoing the batch leaves it alone too
+            if original_selection:
+                cmds.select(original_selection, replace=True)
+            else:
+                cmds.select(clear=True)
+    finally:
+        table.record_repeat = True
+        selection_service.invalidate()
+    return [response for response in responses if response is not None]
+
+def run_rpc_batch_unless_paused(requests):
+    return None if chunked_executor.paused else run_rpc_batch(requests)
+
+class CommandServer(object):
+    # Longest request line, in bytes. asyncio's default of 64 KiB is too small for batches that carry many targets.
+    line_limit = 16 * 1024 * 1024
+
+    def __init__(self, port=COMMAND_SERVER_PORT, host='127.0.0.1'):
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.error = None
+
+    def running(self):
+        return self.server is not None and self.loop is not None and self.loop.is_running()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await self.read_line(reader)
+                if line is None:
+                    response = rpc_error(None, -32600, f"Invalid Request: longer than {self.line_limit} bytes")
+                elif not line:
+                    break
+                else:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        response = rpc_error(None, -32700, 'Parse error')
+                    else:
+                        batched = isinstance(message, list)
+                        requests = message if batched else [message]
+                        if not requests:
+                            responses = [rpc_error(None, -32600, 'Invalid Request')]
+                        elif self.thread is None:
+                            # Serving in the foreground (mayapy), so this already is the main thread
+                            responses = run_rpc_batch(requests)
+                        else:
+                            responses = await self.run_in_main_thread(requests)
+                        response = responses if batched else (responses[0] if responses else None)
+                if response is not None:
+                    writer.write(json.dumps(response).encode() + RPC_LINE_END)
+                    await writer.drain()
+        finally:
+            writer.close()
+
+    async def run_in_main_thread(self, requests):
+        # A batch that reaches the main thread while a chunked run has the event loop would land in that run's undo
+        # chunk, so it is turned away there and sent again shortly
+        while True:
+            responses = await self.loop.run_in_executor(None, maya.utils.executeInMainThreadWithResult, run_rpc_batch_unless_paused, requests)
+            if responses is not None:
+                return responses
+            await asyncio.sleep(0.05)
+
+    async def read_line(self, reader):
+        # Returns None for a line over line_limit. It is read to its end and dropped, so the next request starts clean.
+        try:
+            return await reader.readuntil(RPC_LINE_END)
+        except asyncio.IncompleteReadError as error:
+            return error.partial
+        except asyncio.LimitOverrunError as error:
+            overrun = error
+        while True:
+            await reader.readexactly(overrun.consumed)
+            try:
+                await reader.readuntil(RPC_LINE_END)
+                return None
+            except asyncio.IncompleteReadError:
+                return None
+            except asyncio.LimitOverrunError as error:
+                overrun = error
+
+    def serve(self, ready=None):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle, self.host, self.port, limit=self.line_limit))
+        except OSError as error:
+            self.error = error
+            self.loop.close()
+            return
+        finally:
+            if ready is not None:
+                ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+            self.server = None
+
+    def start(self):
+        # Inside Maya the loop runs on a daemon thread and hands every batch to the main thread
+        if self.running():
+            return True
+        ready = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self.serve, args=(ready,), name='FloatingToolsCommandServer', daemon=True)
+        self.thread.start()
+        ready.wait(5)
+        if self.error is not None:
+            cmds.warning(f"Floating Tools command server could not listen on {self.host}:{self.port}: {self.error}")
+            self.thread = None
+            return False
+        print(f"Floating Tools command server listening on {self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread is not None:
+            self.thread.join(2)
+            self.thread = None
+
+def command_server():
+    table = command_table()
+    if table.command_server is None:
+        table.command_server = CommandServer()
+    return table.command_server
+
+#----------------------------------------------------------------------------------------------------------------
+class suspend_evaluation(ContextDecorator):
+    # Decorator / context manager for batch operations: viewport refresh is suspended, auto-key and the parallel
+    # evaluation manager can be switched off, and everything is restored afterwards even if the operation raises.
+    # Nested guards are no-ops so a guarded helper can run inside a guarded handler.
+    depth = 0
+
+    def __init__(self, refresh=True, disable_auto_key=True, dg_mode=False):
+        self.refresh = refresh
+        self.disable_auto_key = disable_auto_key
+        self.dg_mode = dg_mode
+        self.restore = []
+
+    def __enter__(self):
+        suspend_evaluation.depth += 1
+        if suspend_evaluation.depth > 1:
+            return self
+        self.restore = []
+        try:
+            if self.refresh and not cmds.about(batch=True):
+                cmds.refresh(suspend=True)
+                self.restore.append(lambda: cmds.refresh(suspend=False))
+            if self.disable_auto_key and cmds.autoKeyframe(query=True, state=True):
+                cmds.autoKeyframe(state=False)
+                self.restore.append(lambda: cmds.autoKeyframe(state=True))
+            if self.dg_mode:
+                mode = cmds.evaluationManager(query=True, mode=True)[0]
+                if mode != 'off':
+                    cmds.evaluationManager(mode='off')
+                    self.restore.append(lambda: cmds.evaluationManager(mode=mode))
+        except Exception:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        suspend_evaluation.depth -= 1
+        while self.restore:
+            self.restore.pop()()
+        return False
+
+@suspend_evaluation()
 def create_loc_object(object_name):
     object_data = {"shapes":[{"pos_vectors":[[0.0,1.0,0.0],[0.707107,0.707107,0.0],[1.0,0.0,0.0],[0.707107,-0.707107,0.0],[0.0,-1.0,0.0],[-0.707107,-0.707107,0.0],[-1.0,0.0,0.0],[-0.707107,0.707107,0.0],[0.0,1.0,0.0]],"degree":1,"knots":[],"form":0,"offset":[0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,1.0]},{"pos_vectors":[[0.0,0.0,1.0],[0.707107,-0.0,0.707107],[1.0,0.0,0.0],[0.707107,0.0,-0.707107],[0.0,0.0,-1.0],[-0.707107,0.0,-0.707107],[-1.0,0.0,0.0],[-0.707107,-0.0,0.707107],[0.0,0.0,1.0]],"degree":1,"knots":[],"form":0,"offset":[0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,1.0]},{"pos_vectors":[[0.0,0.0,1.0],[0.0,0.707107,0.707107],[-0.0,1.0,0.0],[-0.0,0.707107,-0.707107],[0.0,0.0,-1.0],[0.0,-0.707107,-0.707107],[0.0,-1.0,0.0],[0.0,-0.707107,0.707107],[0.0,0.0,1.0]],"degree":1,"knots":[],"form":0,"offset":[0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,1.0]},{"pos_vectors":[[-1.687391,0.0,0.0],[1.687391,0.0,0.0]],"degree":1,"knots":[],"form":2,"offset":[0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,1.0]},{"pos_vectors":[[0.0,0.0,1.687391],[0.0,0.0,-1.687391]],"degree":1,"knots":[],"form":2,"offset":[0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,1.0]},{"pos_vectors":[[0.0,-1.687391,0.0],[0.0,1.687391,0.0]],"degree":1,"knots":[],"form":2,"offset":[0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,0.433188,0.0,0.0,0.0,0.0,1.0]}]}
     created_curves = []
@@ -93,6 +1532,7 @@ def create_loc_object(object_name):
     cmds.setAttr(f"{object_name}.overrideColor", 13)
 
 #----------------------------------------------------------------------------------------------------------------
+@suspend_evaluation()
 def create_curve(object_name, object_data):
         created_curves = []
         shapes_data = object_data.get("shapes", [object_data])
@@ -149,6 +1589,7 @@ def create_curve(object_name, object_data):
         
         return object_name
 
+_shapes_started = time.perf_counter()
 circle_18_shape = {"shapes": [{"pos_vectors":[[1.0,0.0,0.0],[0.939693,0.34202,0.0],[0.766044,0.642788,0.0],[0.5,0.866025,0.0],[0.173648,0.984808,0.0],[-0.173648,0.984808,0.0],[-0.5,0.866025,0.0],[-0.766044,0.642788,0.0],[-0.939693,0.34202,0.0],[-1.0,0.0,0.0],[-0.939693,-0.34202,0.0],[-0.766044,-0.642788,0.0],[-0.5,-0.866025,0.0],[-0.173648,-0.984808,0.0],[0.173648,-0.984808,0.0],[0.5,-0.866025,0.0],[0.766044,-0.642788,0.0],[0.939693,-0.34202,0.0],[1.0,0.0,0.0]],"degree":1,"knots":[0.0,1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0,9.0,10.0,11.0,12.0,13.0,14.0,15.0,16.0,17.0,18.0],"form":0,"offset":[1.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,1.195995,1.0]}]}
 square_shape  = {"shapes": [{"pos_vectors":[[1.0,1.0,0.0],[-1.0,1.0,0.0],[-1.0,-1.0,0.0],[1.0,-1.0,0.0],[1.0,1.0,0.0]],"degree":1,"knots":[0.0,1.0,2.0,3.0,4.0],"form":0,"offset":[1.0,0.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,-1.0,0.0,0.0,0.0,0.0,0.0,1.0]}]}
 cube_shape = {"shapes": [{"pos_vectors":[[-5.150279,5.150279,5.150279],[-5.150279,5.150279,-5.150279],[5.150279,5.150279,-5.150279],[5.150279,5.150279,5.150279],[-5.150279,5.150279,5.150279],[-5.150279,-5.150279,5.150279],[-5.150279,-5.150279,-5.150279],[-5.150279,5.150279,-5.150279],[-5.150279,5.150279,5.150279],[-5.150279,-5.150279,5.150279],[5.150279,-5.150279,5.150279],[5.150279,5.150279,5.150279],[5.150279,5.150279,-5.150279],[5.150279,-5.150279,-5.150279],[5.150279,-5.150279,5.150279],[5.150279,-5.150279,-5.150279],[-5.150279,-5.150279,-5.150279]],"degree":1,"knots":[0.0,1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0,9.0,10.0,11.0,12.0,13.0,14.0,15.0,16.0],"form":0,"offset":[0.205628,0.0,0.0,0.0,0.0,0.205628,0.0,0.0,0.0,0.0,0.205628,0.0,0.0,0.0,0.0,1.0]}]}
@@ -157,6 +1598,246 @@ pyramid_shape = {"shapes": [{"pos_vectors":[[-0.738213,-0.0,-0.738213],[0.738213
 arrow_shape = {"shapes": [{"pos_vectors":[[-0.418175,-1.25,0.0],[-0.418175,-0.25,0.0],[-1.0,-0.25,0.0],[0.0,1.25,0.0],[1.0,-0.25,0.0],[0.418175,-0.25,0.0],[0.418175,-1.25,0.0],[-0.418175,-1.25,0.0]],"degree":1,"knots":[0.0,1.0,2.0,3.0,4.0,5.0,6.0,7.0],"form":0,"offset":[1.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,1.0,0.0,0.0,0.0,0.0,1.0]}]}
 cycle_shape = {"shapes": [{"pos_vectors":[[1.821412,-0.0,3.228411],[2.575865,-0.0,2.649498],[3.154778,-0.0,1.895045],[3.518698,-0.0,1.016465],[3.642823,-0.0,0.073633],[3.518698,-0.0,-0.8692],[3.154777,-0.0,-1.74778],[2.575865,-0.0,-2.502233],[1.821411,-0.0,-3.081145],[1.421608,-0.0,-2.462164],[0.717669,-0.0,-4.559907],[0.720485,-0.0,-4.567671],[2.786863,-0.0,-4.843799],[2.45964,-0.0,-4.18659],[3.478457,-0.0,-3.404825],[4.260222,-0.0,-2.386008],[4.75166,-0.0,-1.199571],[4.919281,-0.0,0.073632],[4.751661,-0.0,1.346836],[4.260222,-0.0,2.533273],[3.478457,-0.0,3.55209],[2.459641,-0.0,4.333856],[2.459641,-0.0,4.333856],[2.459641,-0.0,4.333856],[2.459641,-0.0,4.333856]],"degree":1,"knots":[0.0,1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0,9.0,10.0,11.0,12.0,13.0,14.0,15.0,16.0,17.0,18.0,19.0,20.0,21.0,22.0,23.0,24.0],"form":2,"offset":[0.329236,0.0,0.0,0.0,0.0,0.329236,0.0,0.0,0.0,0.0,0.329236,0.0,0.0,0.0,0.0,1.0]},
                           {"pos_vectors":[[-1.821412,-0.0,3.228411],[-1.540693,-0.0,2.763896],[-0.698641,-0.0,4.568377],[-0.702549,-0.0,4.57625],[-2.736469,-0.0,4.843799],[-2.459641,-0.0,4.333856],[-3.478457,-0.0,3.55209],[-4.260222,-0.0,2.533273],[-4.751661,-0.0,1.346836],[-4.919281,-0.0,0.073632],[-4.75166,-0.0,-1.199571],[-4.260222,-0.0,-2.386008],[-3.478457,-0.0,-3.404825],[-2.45964,-0.0,-4.18659],[-1.821411,-0.0,-3.081145],[-2.575865,-0.0,-2.502233],[-3.154777,-0.0,-1.74778],[-3.518698,-0.0,-0.8692],[-3.642823,-0.0,0.073633],[-3.518698,-0.0,1.016465],[-3.154778,-0.0,1.895045],[-2.575865,-0.0,2.649498],[-2.575865,-0.0,2.649498],[-2.575865,-0.0,2.649498],[-2.575865,-0.0,2.649498]],"degree":1,"knots":[0.0,1.0,2.0,3.0,4.0,5.0,6.0,7.0,8.0,9.0,10.0,11.0,12.0,13.0,14.0,15.0,16.0,17.0,18.0,19.0,20.0,21.0,22.0,23.0,24.0],"form":2,"offset":[0.329236,0.0,0.0,0.0,0.0,0.329236,0.0,0.0,0.0,0.0,0.329236,0.0,0.0,0.0,0.0,1.0]}]}
+startup_profiler.add('import: shape data', _shapes_started, time.perf_counter())
+
+#----------------------------------------------------------------------------------------------------------------
+class SelectionContextWatcher(QtCore.QObject):
+    # Bursts of selection callbacks (e.g. a marquee over thousands of objects) only restart a zero-interval timer,
+    # so the context is resolved once when the event loop next goes idle.
+    contextChanged = QtCore.Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.context = None
+        self.active = True
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.update_context)
+        # Kept, because relaunching the tool rebinds the module-level service before this watcher is stopped
+        self.selection_service = selection_service
+        self.selection_service.add_listener(self.schedule)
+
+    def schedule(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def set_active(self, active):
+        # Paused while the panel is hidden; one refresh on resume catches up on everything that changed meanwhile
+        if active == self.active:
+            return
+        self.active = active
+        if active:
+            self.selection_service.add_listener(self.schedule)
+            self.schedule()
+        else:
+            self.stop()
+
+    def stop(self):
+        self.selection_service.remove_listener(self.schedule)
+        self.timer.stop()
+
+    def update_context(self):
+        with tracer.span('selection context', 'ui'):
+            snapshot = self.selection_service.snapshot()
+            components = snapshot.has_components()
+            context = {
+                'selection': snapshot.count,
+                'objects': len(snapshot.dag_paths()) if components else snapshot.count,
+                'components': components,
+                'keys': cmds.keyframe(query=True, selected=True, keyframeCount=True) or 0,
+            }
+        if context != self.context:
+            self.context = context
+            self.contextChanged.emit(context)
+
+def shape_path(dag_path):
+    # Component selections can come back on the transform; points and change callbacks belong to the shape
+    if dag_path.hasFn(om.MFn.kTransform) and dag_path.numberOfShapesDirectlyBelow():
+        dag_path = om.MDagPath(dag_path)
+        dag_path.extendToShape()
+    return dag_path
+
+class SelectionReadout(QtWidgets.QLabel):
+    # Selection count, world center and bounding box for the Modeling panel. Mesh points are read in bulk once per
+    # mesh in object space and moved to world space on every update, so moving the mesh or any parent needs no new
+    # read. The cache is dropped when the mesh changes or the time changes (deformers), and only kept for meshes that
+    # have a change callback. Points are sampled with a stride that adapts to keep each update under budget_ms.
+    budget_ms = 2.0
+    min_sample_limit = 64
+    max_sample_limit = 20000
+    watch_limit = 32
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet('''QLabel { color: rgba(200, 200, 200, .6); background-color: transparent; font-size: 10px; }''')
+        self.sample_limit = 4000
+        self.mesh_points = {}
+        self.node_callbacks = {}
+        self.time_callback = None
+        self.active = True
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.update_readout)
+        self.selection_service = selection_service
+        self.selection_service.add_listener(self.schedule)
+        self.watch_time(True)
+
+    def schedule(self, delay=0):
+        if not self.timer.isActive():
+            self.timer.start(delay)
+
+    def set_active(self, active):
+        # Inactive, the readout drops its listener and node callbacks and is rebuilt once when it is shown again
+        if active == self.active:
+            return
+        self.active = active
+        if active:
+            self.selection_service.add_listener(self.schedule)
+            self.watch_time(True)
+            self.schedule()
+        else:
+            self.stop()
+
+    def stop(self):
+        self.selection_service.remove_listener(self.schedule)
+        self.timer.stop()
+        # Without callbacks nothing would tell the cache about edits, so it is read again when shown
+        self.watch_nodes([])
+        self.watch_time(False)
+        self.mesh_points.clear()
+
+    def watch_time(self, active):
+        if active and self.time_callback is None:
+            self.time_callback = om.MDGMessage.addTimeChangeCallback(self.time_changed)
+        elif not active and self.time_callback is not None:
+            try:
+                om.MMessage.removeCallback(self.time_callback)
+            except RuntimeError:
+                pass
+            self.time_callback = None
+
+    def time_changed(self, time, client_data=None):
+        # Deformed and skinned meshes change without an attribute change callback on the shape
+        self.mesh_points.clear()
+        self.schedule(30)
+
+    def watch_nodes(self, dag_paths):
+        # Attribute-change callbacks on the first few selected nodes catch point edits, world matrix callbacks catch
+        # moves of the node or any of its parents
+        wanted = dict((dag_path.fullPathName(), dag_path) for dag_path in dag_paths[:self.watch_limit])
+        for path in list(self.node_callbacks):
+            if path not in wanted:
+                try:
+                    om.MMessage.removeCallbacks(self.node_callbacks.pop(path))
+                except RuntimeError:
+                    pass
+        for path, dag_path in wanted.items():
+            if path not in self.node_callbacks:
+                self.node_callbacks[path] = [
+                    om.MNodeMessage.addAttributeChangedCallback(dag_path.node(), self.node_changed, path),
+                    om.MDagMessage.addWorldMatrixModifiedCallback(dag_path, self.world_changed),
+                ]
+
+    def node_changed(self, message, plug, other_plug, path):
+        self.mesh_points.pop(path, None)
+        self.schedule(30)
+
+    def world_changed(self, transform, modified, client_data=None):
+        # Cached points are in object space, so a move only needs a refresh
+        self.schedule(30)
+
+    def component_points(self, dag_path, component, limit):
+        # Returns (points, element count, sampled) for one component selection item
+        if dag_path.hasFn(om.MFn.kMesh) and component.hasFn(om.MFn.kSingleIndexedComponent):
+            indexed = om.MFnSingleIndexedComponent(component)
+            count = indexed.elementCount
+            stride = max(1, -(-count // limit))
+            elements = [indexed.element(i) for i in range(0, count, stride)]
+            dag_path = shape_path(dag_path)
+            mesh = om.MFnMesh(dag_path)
+            if component.hasFn(om.MFn.kMeshEdgeComponent):
+                vertex_ids = set()
+                for edge in elements:
+                    vertex_ids.update(mesh.getEdgeVertices(edge))
+            elif component.hasFn(om.MFn.kMeshPolygonComponent):
+                vertex_ids = set()
+                for face in elements:
+                    vertex_ids.update(mesh.getPolygonVertices(face))
+            else:
+                vertex_ids = elements
+            points = self.object_points(mesh, dag_path.fullPathName())
+            matrix = dag_path.inclusiveMatrix()
+            return [points[index] * matrix for index in vertex_ids], count, stride > 1
+        selection_list = om.MSelectionList()
+        selection_list.add((dag_path, component))
+        values = cmds.xform(selection_list.getSelectionStrings(), query=True, worldSpace=True, translation=True) or []
+        count = len(values) // 3
+        stride = max(1, -(-count // limit))
+        points = [om.MPoint(values[i * 3], values[i * 3 + 1], values[i * 3 + 2]) for i in range(0, count, stride)]
+        return points, count, stride > 1
+
+    def object_points(self, mesh, mesh_path):
+        points = self.mesh_points.get(mesh_path)
+        # A topology change the callbacks missed still shows up as a different vertex count
+        if points is None or len(points) != mesh.numVertices:
+            points = mesh.getPoints(om.MSpace.kObject)
+            # Without a change callback the points could go stale, so they are only kept for watched meshes
+            if mesh_path in self.node_callbacks:
+                self.mesh_points[mesh_path] = points
+        return points
+
+    def update_readout(self):
+        if not self.isVisible():
+            return
+        started = time.perf_counter()
+        with tracer.span('selection readout', 'ui'):
+            snapshot = self.selection_service.snapshot()
+            objects = snapshot.dag_paths()
+            components = snapshot.components()
+            # Component meshes come first, since only watched meshes keep their points cached
+            self.watch_nodes([shape_path(dag_path) for dag_path, component in components] + objects)
+
+            bounds = []
+            count = 0
+            sampled = False
+            if objects:
+                stride = max(1, -(-len(objects) // self.sample_limit))
+                sampled = stride > 1
+                count += len(objects)
+                box = cmds.exactWorldBoundingBox([dag_path.fullPathName() for dag_path in objects[::stride]])
+                bounds.append((box[:3], box[3:]))
+
+            for dag_path, component in components:
+                points, item_count, item_sampled = self.component_points(dag_path, component, self.sample_limit)
+                if points:
+                    bounds.append(([min(point[axis] for point in points) for axis in range(3)],
+                                   [max(point[axis] for point in points) for axis in range(3)]))
+                    count += item_count
+                    sampled = sampled or item_sampled
+            for mesh_path in [mesh_path for mesh_path in self.mesh_points if mesh_path not in self.node_callbacks]:
+                del self.mesh_points[mesh_path]
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if elapsed_ms > self.budget_ms:
+            self.sample_limit = max(self.min_sample_limit, self.sample_limit // 2)
+        elif elapsed_ms < self.budget_ms * 0.25 and sampled:
+            self.sample_limit = min(self.max_sample_limit, self.sample_limit * 2)
+
+        if not bounds:
+            self.setText('Nothing selected')
+            self.setToolTip('')
+            return
+        low = [min(bound[0][axis] for bound in bounds) for axis in range(3)]
+        high = [max(bound[1][axis] for bound in bounds) for axis in range(3)]
+        center = [(low[axis] + high[axis]) * 0.5 for axis in range(3)]
+        size = [high[axis] - low[axis] for axis in range(3)]
+        prefix = '~' if sampled else ''
+        self.setText(f"{prefix}{count} sel   C {center[0]:.2f}, {center[1]:.2f}, {center[2]:.2f}   "
+                     f"B {size[0]:.2f} x {size[1]:.2f} x {size[2]:.2f}")
+        self.setToolTip(f"<html><body><p style='white-space:nowrap;'>Bounds min {low[0]:.3f}, {low[1]:.3f}, {low[2]:.3f}<br>"
+                        f"Bounds max {high[0]:.3f}, {high[1]:.3f}, {high[2]:.3f}"
+                        f"{'<br>Sampled estimate' if sampled else ''}</p></body></html>")
 
 #----------------------------------------------------------------------------------------------------------------
 class CustomButton(QtWidgets.QPushButton):
@@ -164,6 +1845,12 @@ class CustomButton(QtWidgets.QPushButton):
     doubleClicked = QtCore.Signal()
     rightClicked = QtCore.Signal(QtCore.QPoint)
 
+    # 'immediate': single clicks fire on release. If the button also has a double-click action, a second click
+    # inside the double-click interval undoes the single-click action and runs the double-click action instead.
+    # 'legacy': single clicks wait 300 ms to rule out a double click before firing.
+    click_dispatch = 'immediate'
+    click_chunk_serial = 0
+
     def __init__(self, text='', icon=None, color='#4d4d4d', tooltip='', flat=False, size=None, width=None, height=None, parent=None, radius=3, ContextMenu=False, cmColor='#00749a', onlyContext=False):
         super().__init__(parent)
         self.setFlat(flat)
@@ -172,12 +1859,12 @@ class CustomButton(QtWidgets.QPushButton):
         self.cmColor = cmColor
         self.onlyContext = onlyContext
         self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
-        self.setStyleSheet(self.get_style_sheet(color, flat, radius))
+        self.setStyleSheet(self.cached_style_sheet())
         
         icon_size = size if size else 24
         
         if icon:
-            self.setIcon(QtGui.QIcon(icon))
+            self.setIcon(resource_cache.icon(icon))
             self.setIconSize(QtCore.QSize(icon_size, icon_size))
         
         if text:
@@ -202,10 +1889,11 @@ class CustomButton(QtWidgets.QPushButton):
             self.setLayoutDirection(QtCore.Qt.LeftToRight)
         
         self.setToolTip(f"<html><body><p style='color:white; white-space:nowrap; '>{tooltip}</p></body></html>")
+        self.trace_name = text if text and len(text) > 1 else tooltip.split(':')[0].split('.')[0]
         
         self.context_menu = None
         if ContextMenu or onlyContext:
-            self.context_menu = QtWidgets.QMenu(self)
+            self.context_menu = create_popup_menu(self, self.get_menu_style_sheet())
             self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
             self.customContextMenuRequested.connect(self.show_context_menu)
 
@@ -213,6 +1901,8 @@ class CustomButton(QtWidgets.QPushButton):
         self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.performSingleClick)
         self.click_count = 0
+        self.click_wait_start = None
+        self.single_click_chunk = None
         self.reset_button_state()
 
         #--------------------------------------------------------------------------------------------------------
@@ -234,6 +1924,10 @@ class CustomButton(QtWidgets.QPushButton):
                 QPushButton:pressed {{
                     background-color: {hex_value(color, 0.8)};
                 }}
+                QPushButton:disabled {{
+                    background-color: {hex_value(color, 0.6)};
+                    color: #777777;
+                }}
                 QToolTip {{
                     background-color: {color};
                     color: white;
@@ -241,21 +1935,19 @@ class CustomButton(QtWidgets.QPushButton):
                 }}
             '''
         
+    def cached_style_sheet(self):
+        return resource_cache.style_sheet(('button', self.base_color, self.isFlat(), self.radius), lambda: self.get_style_sheet(self.base_color, self.isFlat(), self.radius))
+
     def calculate_button_width(self, text, padding=20):
-        font_metrics = QtGui.QFontMetrics(QtWidgets.QApplication.font())
-        text_width = font_metrics.horizontalAdvance(text)
-        return text_width + padding
+        return resource_cache.text_width(QtWidgets.QApplication.font(), text) + padding
 
     def addToMenu(self, name, function):
         if self.context_menu:
             action = self.context_menu.addAction(name)
             action.triggered.connect(function)
 
-    def show_context_menu(self, pos):
-        if self.context_menu:
-            self.context_menu.setWindowFlags(self.context_menu.windowFlags() | QtCore.Qt.FramelessWindowHint | QtCore.Qt.NoDropShadowWindowHint)
-            self.context_menu.setAttribute(QtCore.Qt.WA_TranslucentBackground)
-            self.context_menu.setStyleSheet(f'''
+    def get_menu_style_sheet(self):
+        return f'''
                 QMenu {{
                     background-color: rgba(30, 30, 30, .7);
                     border-radius: 3px;
@@ -269,23 +1961,29 @@ class CustomButton(QtWidgets.QPushButton):
                 }}
                 QMenu::item:selected {{
                     background-color: #00ade6;
-                }}''')
+                }}'''
+
+    def show_context_menu(self, pos):
+        if self.context_menu:
             self.context_menu.exec_(self.mapToGlobal(pos))
             
         
     #--------------------------------------------------------------------------------------------------------
     def mousePressEvent(self, event):
+        tracer.instant(f"press: {self.trace_name}", 'input')
         if self.onlyContext:
             if event.button() in (QtCore.Qt.LeftButton, QtCore.Qt.RightButton):
                 self.show_context_menu(event.pos())
         else:
             if event.button() == QtCore.Qt.LeftButton:
                 self.click_count += 1
-                if not self.timer.isActive():
+                # In 'immediate' mode the double-click window opens on release, so a press held past it still clicks
+                if self.click_dispatch == 'legacy' and not self.timer.isActive():
+                    self.click_wait_start = tracer.now()
                     self.timer.start(300)
             elif event.button() == QtCore.Qt.RightButton:
                 self.rightClicked.emit(event.pos())
-        super(CustomButton, self).mousePressEvent(event)
+        super().mousePressEvent(event)
         maya_main_window().activateWindow()
         
         
@@ -296,23 +1994,68 @@ class CustomButton(QtWidgets.QPushButton):
                 if self.click_count == 2:
                     self.timer.stop()
                     self.click_count = 0
-                    self.doubleClicked.emit()
-        super(CustomButton, self).mouseReleaseEvent(event)
+                    self.trace_click_wait()
+                    self.revert_single_click()
+                    with tracer.span(f"handler: {self.trace_name} (double)", 'handler'), stall_monitor.action(f"{self.trace_name} (double)"):
+                        self.doubleClicked.emit()
+                elif self.click_count == 1 and self.click_dispatch != 'legacy':
+                    if self.has_double_click():
+                        self.timer.start(QtWidgets.QApplication.doubleClickInterval())
+                    else:
+                        self.click_count = 0
+                    if self.rect().contains(event.pos()):
+                        self.emit_single_click()
+        super().mouseReleaseEvent(event)
         
 
     def performSingleClick(self):
+        if self.click_dispatch != 'legacy' and self.isDown():
+            # The second press of a double click is still held; its release decides
+            return
+        self.trace_click_wait()
         if not self.onlyContext:
-            if self.click_count == 1:
-                self.singleClicked.emit()
+            if self.click_count == 1 and self.click_dispatch == 'legacy':
+                with tracer.span(f"handler: {self.trace_name}", 'handler'), stall_monitor.action(self.trace_name):
+                    self.singleClicked.emit()
         self.click_count = 0
+        self.single_click_chunk = None
+
+    def has_double_click(self):
+        return self.receivers(QtCore.SIGNAL('doubleClicked()')) > 0
+
+    def emit_single_click(self):
+        with tracer.span(f"handler: {self.trace_name}", 'handler'), stall_monitor.action(self.trace_name):
+            if not self.has_double_click():
+                self.singleClicked.emit()
+                return
+            # Uniquely named chunk so a following double click can take back exactly this action
+            CustomButton.click_chunk_serial += 1
+            chunk_name = f"{self.trace_name} #{CustomButton.click_chunk_serial}"
+            with undo_chunk(chunk_name):
+                self.singleClicked.emit()
+            self.single_click_chunk = chunk_name
+
+    def revert_single_click(self):
+        if self.single_click_chunk and cmds.undoInfo(query=True, undoName=True) == self.single_click_chunk:
+            with tracer.span(f"revert single click: {self.trace_name}", 'undo'):
+                cmds.undo()
+        self.single_click_chunk = None
+
+    def trace_click_wait(self):
+        if self.click_wait_start is not None:
+            tracer.complete(f"click wait: {self.trace_name}", 'input', self.click_wait_start)
+            self.click_wait_start = None
 
     def leaveEvent(self, event):
         self.reset_button_state()
-        super(CustomButton, self).leaveEvent(event)
+        super().leaveEvent(event)
         
 
     def reset_button_state(self):
-        self.setStyleSheet(self.get_style_sheet(self.base_color, self.isFlat(), self.radius))
+        # Re-setting an identical style sheet still re-polishes the button, and this runs on every leave event
+        style = self.cached_style_sheet()
+        if self.styleSheet() != style:
+            self.setStyleSheet(style)
 
 
 class CustomFrame(QtWidgets.QFrame):
@@ -349,7 +2092,7 @@ class ToggleButton(QtWidgets.QPushButton):
     #toggled= QtCore.Signal(bool)  # Custom signal
 
     def __init__(self, text, button_id, bg_color = '#5285A6',tooltip = '', border_radius = 10, parent=None):
-        super(ToggleButton, self).__init__(text, parent)
+        super().__init__(text, parent)
         self.button_id = button_id
         self.setCheckable(True)
         self.setFixedSize(20, 20)
@@ -368,9 +2111,737 @@ class ToggleButton(QtWidgets.QPushButton):
         self.toggled_with_id.emit(checked, self.button_id)
         #maya_main_window().activateWindow()
 
+#----------------------------------------------------------------------------------------------------------------
+RADIAL_MENU_ITEMS = ('set_key', 'reset_all', 'paste_inverse', 'move_objects_to_stored_position', 'zero_out',
+                     'freeze_transformation', 'store_component_position', 'center_pivot')
+RADIAL_MENU_ICONS = {
+    'set_key': ':setKeyframe.png',
+    'reset_all': ':delete.png',
+    'move_objects_to_stored_position': ':absolute.png',
+    'freeze_transformation': ':FreezeTransform.png',
+    'store_component_position': ':ghostingObjectTypeLocator.png',
+    'center_pivot': ':CenterPivot.png',
+}
+
+class RadialMenu(QtWidgets.QWidget):
+    # Marking menu over the command table. The ring and the item icons are painted once into cached pixmaps, so
+    # popping it up only moves the window and blits; the highlighted item is the only thing drawn per hover.
+    radius = 110
+    dead_zone = 24
+    item_width = 124
+    item_height = 26
+    icon_size = 16
+    tap_ms = 250
+
+    def __init__(self, items=RADIAL_MENU_ITEMS, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(QtCore.Qt.Popup | QtCore.Qt.FramelessWindowHint | QtCore.Qt.NoDropShadowWindowHint)
+        self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+        self.setMouseTracking(True)
+        self.items = [(name, TOOL_COMMANDS[name][0]) for name in items if name in TOOL_COMMANDS]
+        side = 2 * (self.radius + self.item_width // 2) + 8
+        self.setFixedSize(side, side)
+        self.center = QtCore.QPoint(side // 2, side // 2)
+        self.step = 360.0 / max(len(self.items), 1)
+        self.item_rects = []
+        for index in range(len(self.items)):
+            angle = math.radians(90 - index * self.step)
+            x = self.center.x() + math.cos(angle) * self.radius
+            y = self.center.y() - math.sin(angle) * self.radius
+            self.item_rects.append(QtCore.QRectF(x - self.item_width / 2, y - self.item_height / 2, self.item_width, self.item_height))
+        self.hovered = None
+        self.shown_at = 0.0
+        self.ring = None
+        self.icons = []
+        self.prebuild()
+
+    def prebuild(self):
+        screen = QtWidgets.QApplication.primaryScreen()
+        device_pixel_ratio = screen.devicePixelRatio() if screen else 1.0
+        self.ring = QtGui.QPixmap(int(self.width() * device_pixel_ratio), int(self.height() * device_pixel_ratio))
+        self.ring.setDevicePixelRatio(device_pixel_ratio)
+        self.ring.fill(QtCore.Qt.transparent)
+        self.icons = []
+        for name, label in self.items:
+            icon = resource_cache.icon(RADIAL_MENU_ICONS[name]) if name in RADIAL_MENU_ICONS else None
+            # A resource missing from this Maya version leaves the item with its label only
+            pixmap = icon.pixmap(self.icon_size, self.icon_size) if icon is not None and not icon.isNull() else None
+            self.icons.append(pixmap if pixmap is not None and not pixmap.isNull() else None)
+        painter = QtGui.QPainter(self.ring)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QColor(31, 31, 31, 200))
+        painter.drawEllipse(QtCore.QPointF(self.center), self.dead_zone, self.dead_zone)
+        for index in range(len(self.items)):
+            self.paint_item(painter, index, '#4d4d4d')
+        painter.end()
+
+    def paint_item(self, painter, index, color):
+        rect = self.item_rects[index]
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QColor(color))
+        painter.drawRoundedRect(rect, 3, 3)
+        icon = self.icons[index]
+        if icon is not None:
+            painter.drawPixmap(QtCore.QPointF(rect.left() + 5, rect.center().y() - self.icon_size / 2), icon)
+            rect = rect.adjusted(self.icon_size + 5, 0, 0, 0)
+        painter.setPen(QColor('white'))
+        text = painter.fontMetrics().elidedText(self.items[index][1], QtCore.Qt.ElideRight, int(rect.width()) - 8)
+        painter.drawText(rect, QtCore.Qt.AlignCenter, text)
+
+    def popup(self, position):
+        with tracer.span('radial menu: popup', 'ui'):
+            self.hovered = None
+            self.shown_at = time.perf_counter()
+            self.move(position - self.center)
+            self.show()
+            self.raise_()
+            self.activateWindow()
+
+    def item_at(self, pos):
+        dx = pos.x() - self.center.x()
+        dy = self.center.y() - pos.y()
+        if not self.items or dx * dx + dy * dy < self.dead_zone * self.dead_zone:
+            return None
+        # Clockwise from the top, matching the layout in __init__
+        angle = (90 - math.degrees(math.atan2(dy, dx))) % 360
+        return int((angle + self.step / 2) // self.step) % len(self.items)
+
+    def trigger(self):
+        index = self.hovered
+        self.hide()
+        if index is not None:
+            run_tool_command(self.items[index][0])
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self.ring)
+        if self.hovered is not None:
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            self.paint_item(painter, self.hovered, '#00749a')
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        hovered = self.item_at(event.pos())
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        self.hovered = self.item_at(event.pos())
+        self.trigger()
+
+    def keyPressEvent(self, event):
+        if event.key() == QtCore.Qt.Key_Escape:
+            self.hovered = None
+            self.hide()
+
+    def keyReleaseEvent(self, event):
+        if event.isAutoRepeat():
+            return
+        # A quick tap of the hotkey leaves the menu open for clicking; holding it and releasing picks the hovered item
+        if self.hovered is None and (time.perf_counter() - self.shown_at) * 1000 < self.tap_ms:
+            return
+        self.trigger()
+
+def radial_menu():
+    table = command_table()
+    if table.radial_menu is None:
+        prebuild_radial_menu()
+    return table.radial_menu
+
+def prebuild_radial_menu():
+    # Rebuilt once per load of this tool so the cached menu always dispatches to the current commands
+    table = command_table()
+    if table.radial_menu is not None:
+        try:
+            table.radial_menu.deleteLater()
+        except RuntimeError:
+            pass
+    with tracer.span('radial menu: build', 'ui'):
+        table.radial_menu = RadialMenu(parent=maya_main_window())
+
+def show_radial_menu():
+    radial_menu().popup(QtGui.QCursor.pos())
+
+register_command('radial_menu', 'Radial Menu', show_radial_menu, repeatable=False)
+
+#----------------------------------------------------------------------------------------------------------------
+# Panel layout. Panels are plain data: named button rows bound to command names, and panels made of blocks (frames
+# of rows, labels and a few built-in widgets). PanelBuilder compiles them into widgets, and a row used by several
+# panels is defined and compiled once. floating_tools_layout.json in Maya's user app directory can replace or add
+# rows and panels by id, and reorder panels with "order", without editing this file.
+ADJUSTMENT_GROUP_TOOLTIP = '<b>Create Adjustment Group:</b> <br> Single Click: Create offset group for selected objects. <br> Double Click: Select the control object and the joint object to create the adjustment group.'
+
+PANEL_ROWS = {
+    'reset': [
+        {'text': 'Move', 'icon': ':delete.png', 'color': '#262626', 'size': 16, 'tooltip': "Resets the moved object values to Origin.", 'action': 'reset_move', 'context': 'objects'},
+        {'text': 'Rotate', 'icon': ':delete.png', 'color': '#262626', 'size': 16, 'tooltip': "Resets the rotated object values to Origin.", 'action': 'reset_rotate', 'context': 'objects'},
+        {'text': 'Scale', 'icon': ':delete.png', 'color': '#262626', 'size': 16, 'tooltip': "Resets the scaled object values to Origin.", 'action': 'reset_scale', 'context': 'objects'},
+        {'text': 'Reset All', 'color': '#CF2222', 'tooltip': "Resets all the object transform to Origin.", 'action': 'reset_all', 'context': 'objects'},
+    ],
+    'store': [
+        {'text': 'Store Pos', 'color': '#16AAA6', 'tooltip': "Store Position: Stores the position of selected Vertices, Edges or Faces. Double Click to make locator visible", 'action': 'store_component_position', 'double_action': 'store_component_position_vis'},
+        {'text': 'Move to Pos', 'color': '#D58C09', 'tooltip': "Move to Position: Move selected object(s) to the stored position.", 'action': 'move_objects_to_stored_position', 'context': 'objects'},
+        {'icon': ':parentConstraint.png', 'color': 'transparent', 'tooltip': "Constraint active object to selected object.", 'action': 'parent_constraint', 'double_action': 'parent_constraint_options', 'context': 'two_objects'},
+        {'name': 'adjustment_grp_button', 'text': 'GRP', 'color': '#133266', 'width': 35, 'tooltip': ADJUSTMENT_GROUP_TOOLTIP, 'action': 'create_adjustment_group', 'double_action': 'create_adjustment_group_move', 'context': 'objects'},
+    ],
+    'pivots': [
+        {'icon': ':CenterPivot.png', 'color': 'transparent', 'tooltip': "Resets the selected object(s) pivot to the center.", 'action': 'center_pivot', 'context': 'objects'},
+        {'icon': ':DeleteHistory.png', 'color': 'transparent', 'tooltip': "Delete construction history on selected object(s).", 'action': 'delete_history', 'context': 'objects'},
+        {'icon': ':FreezeTransform.png', 'color': 'transparent', 'tooltip': "Changes curent transform values to base transform values.", 'action': 'freeze_transformation', 'context': 'objects',
+         'menu': [['Freeze Translate', 'freeze_translate'], ['Freeze Rotate', 'freeze_rotate'], ['Freeze Scale', 'freeze_scale']]},
+        {'icon': ':absolute.png', 'color': '#4d4d4d', 'size': 22, 'tooltip': "Object to world Origin: Moves object to world origin.", 'action': 'object_to_world_origin', 'context': 'selection'},
+        {'icon': ':absolute.png', 'color': '#C41B16', 'size': 22, 'tooltip': "Snap to Active Object: Moves selected object(s) to Active Objects Position.", 'action': 'object_to_active_position', 'context': 'two_objects'},
+        {'icon': ':absolute.png', 'color': '#049E9F', 'size': 22, 'tooltip': "Pivot to Stored Position: Moves the object(s) Stored Position.", 'action': 'pivot_to_world_origin', 'context': 'objects'},
+        {'icon': ':absolute.png', 'color': '#6C9809', 'size': 22, 'tooltip': "Selected Pivot to Active Pivot: Moves the pivot of selected object(s) to the pivot of active objects(s).", 'action': 'selected_pivot_to_active_pivot', 'context': 'two_objects'},
+    ],
+    'match': [
+        {'text': 'Move', 'icon': ':ghostingObjectTypeLocator.png', 'color': '#262626', 'size': 16, 'tooltip': "Match Transforms.", 'action': 'match_move', 'context': 'two_objects'},
+        {'text': 'Rotate', 'icon': ':ghostingObjectTypeLocator.png', 'color': '#262626', 'size': 16, 'tooltip': "Match Rotation.", 'action': 'match_rotate', 'context': 'two_objects'},
+        {'text': 'Scale', 'icon': ':ghostingObjectTypeLocator.png', 'color': '#262626', 'size': 16, 'tooltip': "Match Scaling.", 'action': 'match_scale', 'context': 'two_objects'},
+        {'text': 'Match All', 'color': '#CF2222', 'tooltip': "Match All Transforms.", 'action': 'match_all', 'context': 'two_objects'},
+    ],
+    'shapes': [
+        {'text': '⬤', 'color': '#202C39', 'tooltip': "Circle Shape", 'action': 'circle_sc'},
+        {'text': '◻', 'color': '#283845', 'tooltip': "SquareShape", 'action': 'square_sc'},
+        {'text': '🎲', 'color': '#596762', 'tooltip': "Cube Shape", 'action': 'cube_sc'},
+        {'text': '▲', 'color': '#544E61', 'tooltip': "Triangle Shape", 'action': 'triangle_sc'},
+        {'text': '🗼', 'color': '#867558', 'tooltip': "Pyramid Shape", 'action': 'pyramid_sc'},
+        {'text': '⬆', 'color': '#205d8b', 'tooltip': "Arrow Shape", 'action': 'arrow_sc'},
+        {'text': '↻', 'color': '#783F8E', 'tooltip': "Cycle Shape", 'action': 'cycle_sc'},
+    ],
+    'timeline_keys': [
+        {'text': 'Key', 'color': '#d62e22', 'tooltip': "Sets key frame.", 'action': 'set_key', 'context': 'selection'},
+        {'text': 'Key', 'color': '#3fb07f', 'tooltip': "Sets breakdown frame.", 'action': 'set_breakdown', 'context': 'selection'},
+        {'text': 'Copy', 'color': '#293F64', 'tooltip': "Copy selected key(s).", 'action': 'copy_keys', 'context': 'selection'},
+        {'text': 'Paste', 'color': '#1699CA', 'tooltip': "Paste copied key(s).", 'action': 'paste_keys', 'context': 'selection'},
+    ],
+    'timeline_edit': [
+        {'text': 'Paste Inverse', 'color': '#9416CA', 'tooltip': "Paste Inverted copied keys(s).", 'action': 'paste_inverse', 'context': 'selection'},
+        {'text': '<', 'color': '#496d88', 'width': 24, 'tooltip': "Remove Inbetween at current time.", 'action': 'remove_inbetweens', 'context': 'selection'},
+        {'text': '>', 'color': '#496d88', 'width': 24, 'tooltip': "Add Inbetween at current time.", 'action': 'add_inbetweens', 'context': 'selection'},
+        {'text': 'Delete Key', 'color': '#A00000', 'size': 16, 'tooltip': "Deletes keys from the given start frame to the current frame.", 'action': 'delete_keys', 'context': 'selection'},
+        {'icon': ':moreOverlay.png', 'color': '#444444', 'tooltip': "More Options.", 'only_menu': True, 'menu_color': '#5285a6',
+         'menu': [['Mute All', 'mute_all'], ['Unmute All', 'unMute_all'], ['Mute Selected', 'mute_selected'], ['Unmute Selected', 'unMute_selected'], ['Break Connections', 'break_connections']]},
+    ],
+    'graph_keys': [
+        {'text': 'Key', 'color': '#d62e22', 'tooltip': "Sets key frame.", 'action': 'set_graph_key', 'context': 'selection'},
+        {'text': 'Key', 'color': '#0E8E9A', 'tooltip': "Insert Key Inserts a key on the visible curves in the graph editor.", 'action': 'insert_key'},
+        {'text': 'Copy', 'color': '#293F64', 'tooltip': "Copy Keys:This copies the selected key(s).", 'action': 'copy_graph_key', 'context': 'selection'},
+        {'text': 'Paste', 'color': '#1699CA', 'tooltip': "Paste Keys:This pastes the copied key(s).", 'action': 'paste_graph_key'},
+    ],
+    'graph_paste': [
+        {'text': 'Paste Selected', 'color': '#5DA380', 'tooltip': "Pastes the selected keys to the current frame in the graph editor.", 'action': 'copy_and_paste_selected_keys', 'context': 'keys'},
+        {'text': 'Invert', 'color': '#965D94', 'tooltip': "Inverts the selected keys in the graph editor.", 'action': 'invert_keys', 'context': 'keys'},
+    ],
+    'graph_edit': [
+        {'text': 'Zero Out', 'color': '#AF8E4F', 'tooltip': "Sets the selected keys to zero in the graph editor.", 'action': 'zero_out', 'context': 'keys'},
+        {'text': 'Delete Key', 'color': '#A00000', 'size': 16, 'tooltip': "Deletes selected keys.", 'action': 'delete_keys_graphEditor', 'context': 'keys'},
+    ],
+}
+
+PANELS = [
+    {'id': 'modeling', 'tooltip': 'Modeling Tools', 'checked': True, 'switch_on': 'components', 'blocks': [
+        {'frame': 'menu_frame_1', 'items': [
+            {'row': 'reset'},
+            {'row': 'store'},
+            {'inset': ['pivots'], 'background': 'rgba(30, 30, 30, .75)'},
+            {'widget': 'selection_readout'},
+        ]},
+        {'label': 'Modeling Tools', 'more_toggle': True},
+        {'frame': 'match_frame', 'more': True, 'items': [{'row': 'match'}]},
+        {'widget': 'orient_frame', 'more': True},
+        {'frame': 'shapeFrame', 'more': True, 'items': [{'row': 'shapes'}]},
+    ]},
+    {'id': 'timeline', 'tooltip': 'Time Line Tools', 'blocks': [
+        {'frame': 'menu_frame_2', 'spacing': 6, 'items': [
+            {'row': 'reset'},
+            {'inset': ['timeline_keys', 'timeline_edit'], 'margin': 6, 'spacing': 6, 'background': 'rgba(30, 30, 30, .75)'},
+        ]},
+        {'widget': 'keytick_frame', 'align': 'right'},
+        {'label': 'Timeline Tools'},
+    ]},
+    {'id': 'graph', 'tooltip': 'Graph Editor Tools', 'switch_on': 'keys', 'blocks': [
+        {'frame': 'menu_frame_3', 'width': 250, 'margin': 5, 'align': 'right', 'items': [
+            {'inset': ['graph_keys', 'graph_paste', 'graph_edit'], 'background': 'rgba(30, 30, 30, .6)'},
+        ]},
+        {'label': 'Graph Editor Tools'},
+    ]},
+]
+
+FRAME_STYLE = 'QFrame {{ border: 0px solid gray; border-radius: {radius}px; background-color: {background}; }}'
+
+def frame_style_sheet(radius, background):
+    return resource_cache.style_sheet(('frame', radius, background), lambda: FRAME_STYLE.format(radius=radius, background=background))
+
+def panel_layout_path():
+    return os.path.join(cmds.internalVar(userAppDir=True), 'floating_tools_layout.json')
+
+PANEL_ENTRY_POINT_GROUP = 'floating_tools.panels'
+
+class PanelPlugin(object):
+    # A panel that lives in its own module. Until its toggle is first checked only the id, module path and tooltip are
+    # known; then the module is imported and can provide:
+    #   PANEL = {'tooltip': ..., 'blocks': [...]}   the same blocks as PANELS
+    #   ROWS = {'row_name': [button, ...]}         optional, the same buttons as PANEL_ROWS
+    #   COMMANDS = {'name': ('Label', func)}       optional, registered like the built-in commands
+    #   def build_<widget>(owner)                  optional, for {'widget': '<widget>'} blocks
+    def __init__(self, panel_id, module_name, tooltip=None, switch_on=None):
+        self.panel_id = panel_id
+        self.module_name = module_name
+        self.tooltip = tooltip
+        self.switch_on = switch_on
+        self.module = None
+
+    def stub(self):
+        # Enough for the toggle column, without importing anything
+        panel = {'id': self.panel_id, 'tooltip': self.tooltip or self.panel_id, 'plugin': self}
+        if self.switch_on:
+            panel['switch_on'] = self.switch_on
+        return panel
+
+    def load(self):
+        if self.module is not None:
+            return self.module
+        with tracer.span(f"import panel: {self.panel_id}", 'ui'):
+            module = importlib.import_module(self.module_name)
+        table = command_table()
+        for name, (label, func) in getattr(module, 'COMMANDS', {}).items():
+            register_command(name, label, func)
+            if table.runtime_commands_installed:
+                install_runtime_command(name, label)
+        self.module = module
+        return module
+
+def discover_panel_plugins(overrides):
+    # Entry points are read from the installed package metadata only; no plugin module is imported here
+    plugins = {}
+    try:
+        from importlib import metadata
+        entry_points = metadata.entry_points()
+    except ImportError:
+        entry_points = {}
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group=PANEL_ENTRY_POINT_GROUP)
+    else:
+        entry_points = entry_points.get(PANEL_ENTRY_POINT_GROUP, [])
+    for entry_point in entry_points:
+        plugins[entry_point.name] = PanelPlugin(entry_point.name, entry_point.value.partition(':')[0])
+    # The layout file can add plugins by module path, or give an entry-point plugin a tooltip and auto switch
+    for panel_id, options in overrides.get('plugins', {}).items():
+        plugin = plugins.get(panel_id)
+        if plugin is None:
+            if 'module' not in options:
+                cmds.warning(f"Floating Tools layout plugin {panel_id} has no module.")
+                continue
+            plugin = plugins[panel_id] = PanelPlugin(panel_id, options['module'])
+        plugin.module_name = options.get('module', plugin.module_name)
+        plugin.tooltip = options.get('tooltip', plugin.tooltip)
+        plugin.switch_on = options.get('switch_on', plugin.switch_on)
+    return list(plugins.values())
+
+class PanelSpec(object):
+    # The spec in use is cached with the layout file's modification time, so it is only read again after an edit
+    cached = None
+
+    def __init__(self, rows, panels):
+        self.rows = rows
+        self.panels = panels
+        self.compiled_rows = {}
+
+    @classmethod
+    def current(cls):
+        path = panel_layout_path()
+        key = os.path.getmtime(path) if os.path.exists(path) else None
+        if cls.cached is None or cls.cached[0] != key:
+            cls.cached = (key, cls.load(path if key is not None else None))
+        return cls.cached[1]
+
+    @classmethod
+    def load(cls, path=None):
+        overrides = {}
+        if path is not None:
+            try:
+                with open(path) as f:
+                    overrides = json.load(f)
+            except (IOError, OSError, ValueError) as error:
+                cmds.warning(f"Floating Tools ignored the layout in {path}: {error}")
+        try:
+            return cls.merge(overrides)
+        except (AttributeError, KeyError, TypeError, ValueError) as error:
+            # Valid JSON in the wrong shape, such as a panel without an id
+            cmds.warning(f"Floating Tools ignored the layout in {path}, it is not a valid layout: {type(error).__name__}: {error}")
+            return cls.merge({})
+
+    @classmethod
+    def merge(cls, overrides):
+        # Shapes are checked up front; mistakes the builder finds later only replace their own panel (see build_panel)
+        for row_id, buttons in overrides.get('rows', {}).items():
+            if not isinstance(buttons, list) or not all(isinstance(button, dict) for button in buttons):
+                raise TypeError(f"row {row_id} is not a list of buttons")
+        for panel in overrides.get('panels', []):
+            blocks = panel.get('blocks')
+            if not isinstance(blocks, list) or not all(isinstance(block, dict) for block in blocks):
+                raise TypeError(f"panel {panel['id']} has no list of blocks")
+        rows = dict(PANEL_ROWS)
+        panels = list(PANELS)
+        rows.update(overrides.get('rows', {}))
+        panel_index = {panel['id']: index for index, panel in enumerate(panels)}
+        for plugin in discover_panel_plugins(overrides):
+            if plugin.panel_id in panel_index:
+                cmds.warning(f"Floating Tools panel plugin {plugin.panel_id} clashes with a built-in panel and was skipped.")
+                continue
+            panel_index[plugin.panel_id] = len(panels)
+            panels.append(plugin.stub())
+        for panel in overrides.get('panels', []):
+            if panel['id'] in panel_index:
+                panels[panel_index[panel['id']]] = panel
+            else:
+                panels.append(panel)
+        if 'order' in overrides:
+            by_id = {panel['id']: panel for panel in panels}
+            panels = [by_id[panel_id] for panel_id in overrides['order'] if panel_id in by_id]
+        return cls(rows, panels)
+
+    def load_plugin(self, panel):
+        # Imports the plugin behind a stub panel and returns the full panel; rows from the layout file win over its ROWS
+        plugin = panel['plugin']
+        module = plugin.load()
+        for row_id, buttons in getattr(module, 'ROWS', {}).items():
+            self.rows.setdefault(row_id, buttons)
+        return dict(module.PANEL, id=plugin.panel_id, tooltip=panel['tooltip']), module
+
+    def compile_row(self, row_id):
+        # Resolves every button of a row once: CustomButton arguments, bound commands and menu entries
+        compiled = self.compiled_rows.get(row_id)
+        if compiled is not None:
+            return compiled
+        compiled = []
+        for button in self.rows[row_id]:
+            arguments = {key: button[key] for key in ('text', 'icon', 'color', 'tooltip', 'size', 'width', 'height', 'radius') if key in button}
+            arguments['ContextMenu'] = bool(button.get('menu'))
+            arguments['onlyContext'] = button.get('only_menu', False)
+            if 'menu_color' in button:
+                arguments['cmColor'] = button['menu_color']
+            compiled.append({
+                'arguments': arguments,
+                'action': self.resolve(button.get('action')),
+                'double_action': self.resolve(button.get('double_action')),
+                'menu': [(label, self.resolve(action)) for label, action in button.get('menu', [])],
+                'context': button.get('context'),
+                'name': button.get('name'),
+            })
+        self.compiled_rows[row_id] = compiled
+        return compiled
+
+    def resolve(self, action):
+        if action is None:
+            return None
+        if action not in TOOL_COMMANDS:
+            cmds.warning(f"Floating Tools layout refers to an unknown command: {action}")
+            return None
+        return TOOL_COMMANDS[action][1]
+
+class PanelBuilder(object):
+    frame_width = 280
+
+    def __init__(self, owner, spec):
+        self.owner = owner
+        self.spec = spec
+        self.module = None
+
+    def build_panel(self, panel, layout, module=None):
+        # Returns [(widget, needs_more)] so the owner can show the "More" blocks on demand
+        self.module = module
+        blocks = []
+        for block in panel['blocks']:
+            if 'frame' in block:
+                widget = self.build_frame(block)
+            elif 'label' in block:
+                widget = self.build_label(panel['id'], block)
+            else:
+                widget = self.build_widget(block['widget'])
+            if block.get('align') == 'right':
+                layout.addWidget(widget, 0, QtCore.Qt.AlignRight)
+            else:
+                layout.addWidget(widget)
+            blocks.append((widget, block.get('more', False)))
+        return blocks
+
+    def build_frame(self, block):
+        frame = QtWidgets.QFrame()
+        frame.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        frame.setFixedWidth(block.get('width', self.frame_width))
+        frame.setStyleSheet(frame_style_sheet(4, 'rgba(40, 40, 40, .6)'))
+        layout = QtWidgets.QVBoxLayout(frame)
+        margin = block.get('margin', 7)
+        spacing = block.get('spacing', 7)
+        layout.setContentsMargins(margin, margin, margin, margin)
+        layout.setSpacing(spacing)
+        for item in block.get('items', []):
+            if 'row' in item:
+                layout.addLayout(self.build_row(item['row'], item.get('spacing', 7)))
+            elif 'inset' in item:
+                layout.addWidget(self.build_inset(item))
+            else:
+                layout.addWidget(self.build_widget(item['widget']))
+        setattr(self.owner, block['frame'], frame)
+        return frame
+
+    def build_inset(self, item):
+        frame = QtWidgets.QFrame()
+        frame.setStyleSheet(frame_style_sheet(5, item.get('background', 'rgba(30, 30, 30, .75)')))
+        layout = QtWidgets.QVBoxLayout(frame)
+        margin = item.get('margin', 7)
+        spacing = item.get('spacing', 7)
+        layout.setContentsMargins(margin, margin, margin, margin)
+        layout.setSpacing(spacing)
+        for row_id in item['inset']:
+            layout.addLayout(self.build_row(row_id, spacing))
+        return frame
+
+    def build_row(self, row_id, spacing):
+        layout = QtWidgets.QHBoxLayout()
+        layout.setSpacing(spacing)
+        for button in self.spec.compile_row(row_id):
+            layout.addWidget(self.build_button(button))
+        return layout
+
+    def build_button(self, compiled):
+        button = CustomButton(**compiled['arguments'])
+        if compiled['action'] is not None:
+            button.singleClicked.connect(compiled['action'])
+        if compiled['double_action'] is not None:
+            button.doubleClicked.connect(compiled['double_action'])
+        for label, action in compiled['menu']:
+            if action is not None:
+                button.addToMenu(label, action)
+        if compiled['context']:
+            self.owner.bind_context(compiled['context'], button)
+        if compiled['name']:
+            setattr(self.owner, compiled['name'], button)
+        return button
+
+    def build_label(self, panel_id, block):
+        widget = QtWidgets.QWidget()
+        layout = QtWidgets.QHBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        label = QtWidgets.QLabel(block['label'])
+        label.setStyleSheet('QLabel { color:rgba(160, 160, 160, .5) }')
+        layout.addWidget(label)
+        layout.addStretch()
+        if block.get('more_toggle'):
+            more_toggle = ToggleButton("More", 11, tooltip='Show More Tools', border_radius=3, bg_color='rgba(40, 40, 40, .3)')
+            more_toggle.setFixedSize(50, 20)
+            more_toggle.setChecked(settings.get('more', {}).get(panel_id, False))
+            more_toggle.toggled.connect(lambda checked: self.owner.toggle_more(panel_id))
+            layout.addWidget(more_toggle)
+            self.owner.more_toggles[panel_id] = more_toggle
+        return widget
+
+    def build_widget(self, name):
+        # Widgets that are more than a row of buttons come from the plugin's build_<name>(owner) or FloatingTools.build_<name>()
+        build = getattr(self.module, f"build_{name}", None)
+        if build is not None:
+            return build(self.owner)
+        return getattr(self.owner, f"build_{name}")()
+
+#----------------------------------------------------------------------------------------------------------------
+class SettingsStore(object):
+    # UI state that survives a relaunch, kept in floating_tools_settings.json in the user app directory. The file is
+    # read once per session. Changes are collected for delay_ms and then written by a background thread, so dragging
+    # the window or typing an increment never waits on the disk.
+    delay_ms = 500
+
+    def __init__(self):
+        self.values = None
+        self.path = None
+        self.timer = None
+        self.lock = threading.Lock()
+        # Every flush is numbered, so a write thread that only gets the lock after a newer write does not undo it
+        self.generation = 0
+        self.written = 0
+
+    def load(self):
+        if self.values is not None:
+            return self.values
+        self.path = os.path.join(cmds.internalVar(userAppDir=True), 'floating_tools_settings.json')
+        self.values = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self.values = json.load(f)
+            except (IOError, OSError, ValueError) as error:
+                cmds.warning(f"Floating Tools ignored its settings in {self.path}: {error}")
+        return self.values
+
+    def get(self, key, default=None):
+        return self.load().get(key, default)
+
+    def set(self, key, value):
+        values = self.load()
+        if key in values and values[key] == value:
+            return
+        values[key] = value
+        if self.timer is None:
+            self.timer = QtCore.QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.flush)
+        self.timer.start(self.delay_ms)
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.stop()
+        self.generation += 1
+        data = json.dumps(self.values, indent=1)
+        threading.Thread(target=self.write, args=(self.path, data, self.generation), daemon=True).start()
+
+    def close(self):
+        # Pending changes are written before this returns, and after any write still running on the background thread,
+        # so a relaunch that loads the file straight after the old panel closes reads everything it saved
+        if not self.pending():
+            with self.lock:
+                pass
+            return
+        self.timer.stop()
+        self.generation += 1
+        self.write(self.path, json.dumps(self.values, indent=1), self.generation)
+
+    def write(self, path, data, generation):
+        # Written next to the file and renamed over it, so Maya quitting mid-write never leaves half a file behind
+        with self.lock:
+            if generation < self.written:
+                return
+            self.written = generation
+            try:
+                with open(path + '.tmp', 'w') as f:
+                    f.write(data)
+                os.replace(path + '.tmp', path)
+            except (IOError, OSError) as error:
+                maya.utils.executeDeferred(cmds.warning, f"Floating Tools could not save its settings: {error}")
+
+    def pending(self):
+        return self.timer is not None and self.timer.isActive()
+
+settings = SettingsStore()
+
+#----------------------------------------------------------------------------------------------------------------
+DOCK_DISTANCE = 24
+DOCK_MARGIN = 6
+
+def screen_layout_key():
+    # Positions are remembered per monitor layout, so a laptop on and off its docking station each keep their own spot
+    return ';'.join(sorted(f"{rect.x()},{rect.y()},{rect.width()}x{rect.height()}" for rect in (screen.geometry() for screen in QtGui.QGuiApplication.screens())))
+
+def save_window_position(pos):
+    positions = dict(settings.get('positions', {}))
+    positions[screen_layout_key()] = [pos.x(), pos.y()]
+    settings.set('positions', positions)
+
+def initial_window_position():
+    saved = settings.get('positions', {}).get(screen_layout_key())
+    if saved is not None:
+        pos = QtCore.QPoint(*saved)
+        if QtGui.QGuiApplication.screenAt(pos) is not None:
+            return pos
+    # First launch on this layout: the old 1280, 700 spot, scaled to the screen Maya is on
+    screen = QtGui.QGuiApplication.screenAt(maya_main_window().geometry().center()) or QtGui.QGuiApplication.primaryScreen()
+    rect = screen.availableGeometry()
+    return QtCore.QPoint(rect.x() + rect.width() * 2 // 3, rect.y() + rect.height() * 65 // 100)
+
+def viewport_rect():
+    try:
+        widget = wrapInstance(int(omui.M3dView.active3dView().widget()), QtWidgets.QWidget)
+    except (RuntimeError, TypeError):
+        return None
+    return QtCore.QRect(widget.mapToGlobal(QtCore.QPoint(0, 0)), widget.size())
+
+def snap_axis(value, length, low, high):
+    # The nearest of the two edges within DOCK_DISTANCE, or None
+    best = None
+    for edge in (low + DOCK_MARGIN, high + 1 - length - DOCK_MARGIN):
+        if abs(value - edge) <= DOCK_DISTANCE and (best is None or abs(value - edge) < abs(value - best)):
+            best = edge
+    return best
+
+class WindowDragger(QtCore.QObject):
+    # Mouse moves only record where the window should go. The window itself moves at most once per display frame, so
+    # a high-rate mouse does not recomposite the translucent window for every event.
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.snap = settings.get('snap_to_edges', True)
+        self.offset = None
+        self.target = None
+        self.frame_ms = 16.0
+        self.screen_rects = []
+        self.viewport = None
+        self.last_move = QtCore.QElapsedTimer()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def press(self, global_pos):
+        self.offset = global_pos - self.window.frameGeometry().topLeft()
+        screen = self.window.screen()
+        self.frame_ms = 1000.0 / max(screen.refreshRate(), 1.0) if screen is not None else 16.0
+        # Dock targets are looked up once per drag, not per mouse event
+        self.screen_rects = [screen.availableGeometry() for screen in QtGui.QGuiApplication.screens()] if self.snap else []
+        self.viewport = viewport_rect() if self.snap else None
+
+    def drag(self, global_pos):
+        if self.offset is None:
+            return
+        self.target = global_pos - self.offset
+        if self.timer.isActive():
+            return
+        wait = self.frame_ms - self.last_move.elapsed() if self.last_move.isValid() else 0
+        if wait <= 0:
+            self.flush()
+        else:
+            self.timer.start(int(math.ceil(wait)))
+
+    def flush(self):
+        self.timer.stop()
+        if self.target is None:
+            return
+        self.window.move(self.docked(self.target))
+        self.target = None
+        self.last_move.start()
+
+    def release(self):
+        if self.offset is None:
+            return
+        self.flush()
+        self.offset = None
+        save_window_position(self.window.pos())
+
+    def docked(self, pos):
+        if not self.snap:
+            return pos
+        size = self.window.frameGeometry().size()
+        # Viewport corners only catch the window when both edges are close
+        if self.viewport is not None:
+            x = snap_axis(pos.x(), size.width(), self.viewport.left(), self.viewport.right())
+            y = snap_axis(pos.y(), size.height(), self.viewport.top(), self.viewport.bottom())
+            if x is not None and y is not None:
+                return QtCore.QPoint(x, y)
+        center = pos + QtCore.QPoint(size.width() // 2, size.height() // 2)
+        for rect in self.screen_rects:
+            if rect.contains(center):
+                x = snap_axis(pos.x(), size.width(), rect.left(), rect.right())
+                y = snap_axis(pos.y(), size.height(), rect.top(), rect.bottom())
+                return QtCore.QPoint(pos.x() if x is None else x, pos.y() if y is None else y)
+        return pos
+
 class FloatingTools(QtWidgets.QWidget):
+    fade_steps = (0.4, 0.1)
+    fade_step_ms = 150
+
     def __init__(self, parent=None):
-        super(FloatingTools, self).__init__(parent, QtCore.Qt.Tool | QtCore.Qt.FramelessWindowHint)
+        init_started = time.perf_counter()
+        super().__init__(parent, QtCore.Qt.Tool | QtCore.Qt.FramelessWindowHint)
         self.setWindowTitle("Floating Tools")
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
         self.setAttribute(QtCore.Qt.WA_NoSystemBackground)
@@ -392,177 +2863,200 @@ class FloatingTools(QtWidgets.QWidget):
         self.frameColSpacer.addLayout(self.frame_col)
         self.mainLayout_col.addLayout(self.frameColSpacer)
 
-        self.is_minimized = False
+        # A relaunch runs this file again and rebinds the module-level singletons before this panel closes, so the
+        # panel keeps the ones it used and cleans up those in closeEvent
+        self.selection_service = selection_service
+        self.stall_monitor = stall_monitor
+        self.settings = settings
+        # Saved state is applied before anything is built, so a restored layout costs no extra layout pass
+        self.is_minimized = self.settings.get('minimized', False)
+        self.context_buttons = []
+        self.auto_switch_panels = self.settings.get('auto_switch_panels', False)
+        try:
+            # Rotate hotkeys use the increment last typed in the panel, including in an earlier session
+            command_table().rotate_increment = float(self.settings.get('rotate_increment', 90))
+        except ValueError:
+            pass
+        self.context_watcher = None
+        self.selection_readout = None
         self.setup_ui()  
 
+        self.context_watcher = SelectionContextWatcher(self)
+        self.context_watcher.contextChanged.connect(self.apply_selection_context)
+        self.context_watcher.schedule()
+
         # Set initial opacity
         self.setWindowOpacity(1)
         
-        # Create timer and animation
+        # Fading steps the window opacity through fade_steps, so the translucent window is recomposited once per step
+        # instead of on every frame of an animation
         self.fade_timer = QTimer(self)
         self.fade_timer.setSingleShot(True)
-        self.fade_timer.timeout.connect(self.start_fade_animation)
-        
-        self.fade_animation = QPropertyAnimation(self, b"windowOpacity")
-        self.fade_animation.setDuration(1000)  # 500 ms for fade effect
-        self.fade_animation.setEasingCurve(QEasingCurve.InOutQuad)
+        self.fade_timer.timeout.connect(self.step_fade)
+        self.fade_queue = []
 
         # Set up right-click menu for the frame
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_frame_context_menu)
-        self.fade_away_enabled = False
+        self.fade_away_enabled = self.settings.get('fade_away', False)
 
         self.context_menu_open = False
+        self.frame_context_menu = None
+        self.dragger = WindowDragger(self)
+        self.progress_bar = None
+        chunked_executor.progress = self.show_progress
+        startup_profiler.add('FloatingTools.__init__', init_started, time.perf_counter())
 
     #---------------------------------------------------------------------------------------------------------------
     def setup_ui(self):
-        frameWidth = 280
-
-        def frameStyleSheet(frame):
-            frame.setStyleSheet(f'''QFrame {{ border: 0px solid gray; border-radius: 4px; background-color: rgba(40, 40, 40, .6); }}''')
-
-        def mrs(col):
-            reset_move_button = CustomButton(text='Move', icon=':delete.png', color='#262626', size=16, tooltip="Resets the moved object values to Origin.")
-            reset_rotate_button = CustomButton(text='Rotate', icon=':delete.png', color='#262626', size=16, tooltip="Resets the rotated object values to Origin.")
-            reset_scale_button = CustomButton(text='Scale', icon=':delete.png', color='#262626', size=16, tooltip="Resets the scaled object values to Origin.")
-            reset_all_button = CustomButton(text='Reset All', color='#CF2222', tooltip="Resets all the object transform to Origin.")
-            reset_move_button.singleClicked.connect(self.reset_move)
-            reset_rotate_button.singleClicked.connect(self.reset_rotate)
-            reset_scale_button.singleClicked.connect(self.reset_scale)
-            reset_all_button.singleClicked.connect(self.reset_all)
-            col.addWidget(reset_move_button)
-            col.addWidget(reset_rotate_button)
-            col.addWidget(reset_scale_button)
-            col.addWidget(reset_all_button)
+        startup_profiler.section('setup_ui: panels')
+        self.panel_spec = PanelSpec.current()
+        self.panel_builder = PanelBuilder(self, self.panel_spec)
+        self.panels = {}
+        self.panel_containers = {}
+        self.panel_blocks = {}
+        self.panel_toggles = {}
+        self.more_toggles = {}
+        self.switch_toggles = {}
+        # One page per panel plus the minimized frame, so switching is a single setCurrentWidget. The page for None is
+        # shown when every toggle is off.
+        self.panel_stack = QtWidgets.QStackedWidget()
+        self.panel_stack.setSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Maximum)
+        self.frame_col.addWidget(self.panel_stack)
+        self.panel_pages = {}
+        self.frame_state = None
+        self.add_panel_page(None, QtWidgets.QWidget())
+        # Panels get an empty container now and are built the first time they are shown
+        for panel in self.panel_spec.panels:
+            container = QtWidgets.QWidget()
+            container_layout = QtWidgets.QVBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            self.add_panel_page(panel['id'], container)
+            self.panels[panel['id']] = panel
+            self.panel_containers[panel['id']] = container
 
         #==========================================================================================================================================
-        fs = 7
-        self.menu_frame_1 = QtWidgets.QFrame()
-        self.menu_frame_1.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.menu_frame_1.setFixedWidth(frameWidth)
-        frameStyleSheet(self.menu_frame_1)
-        menu_frame_layout_1 = QtWidgets.QVBoxLayout(self.menu_frame_1)
-        menu_frame_layout_1.setContentsMargins(fs, fs, fs, fs)
-        menu_frame_layout_1.setSpacing(7)
-        self.frame_col.addWidget(self.menu_frame_1)
-
-        frame1_col1 = QtWidgets.QHBoxLayout()
-        frame1_col1.setSpacing(7)
-        frame1_col2 = QtWidgets.QHBoxLayout()
-        frame1_col2.setSpacing(7)
-        frame1_col3_frame = QtWidgets.QFrame()
-        frame1_col3_frame.setStyleSheet(f'''QFrame {{ border: 0px solid gray; border-radius: 5px; background-color: rgba(30, 30, 30, .75); }}''')
-        frame1_col3 = QtWidgets.QHBoxLayout(frame1_col3_frame)
-        frame1_col3.setContentsMargins(7, 7, 7, 7)
-        #frame1_col3.setSpacing(4)
-
-        mrs(frame1_col1)
-
-        store_pos_button = CustomButton(text='Store Pos', color='#16AAA6', tooltip="Store Position: Stores the position of selected Vertices, Edges or Faces. Double Click to make locator visible")
-        move_to_pos_button = CustomButton(text='Move to Pos', color='#D58C09', tooltip="Move to Position: Move selected object(s) to the stored position.")
-        parent_constraint_button = CustomButton(icon=':parentConstraint.png', color='transparent', tooltip="Constraint active object to selected object.")
-        centerPivot_button = CustomButton(icon=':CenterPivot.png', color='transparent', tooltip="Resets the selected object(s) pivot to the center.")
-        deleteHistory_button = CustomButton(icon=':DeleteHistory.png', color='transparent', tooltip="Delete construction history on selected object(s).")
-        freezeTransform_button = CustomButton(icon=':FreezeTransform.png', color='transparent', tooltip="Changes curent transform values to base transform values.",ContextMenu=True)
-        freezeTransform_button.addToMenu("Freeze Translate", self.freeze_translate)
-        freezeTransform_button.addToMenu("Freeze Rotate", self.freeze_rotate)
-        freezeTransform_button.addToMenu("Freeze Scale", self.freeze_scale)
-        object_to_world_button = CustomButton(icon=':absolute.png', color='#4d4d4d', size=22, tooltip="Object to world Origin: Moves object to world origin.")
-        active_to_selected_button = CustomButton(icon=':absolute.png', color='#C41B16', size=22, tooltip="Snap to Active Object: Moves selected object(s) to Active Objects Position.")
-        pivot_to_world_button = CustomButton(icon=':absolute.png', color='#049E9F', size=22, tooltip="Pivot to Stored Position: Moves the object(s) Stored Position.")
-        pivot_to_selected_button = CustomButton(icon=':absolute.png', color='#6C9809', size=22, tooltip="Selected Pivot to Active Pivot: Moves the pivot of selected object(s) to the pivot of active objects(s).")
-        adj_grp_tt = '<b>Create Adjustment Group:</b> <br> Single Click: Create offset group for selected objects. <br> Double Click: Select the control object and the joint object to create the adjustment group.'
-        self.adjustment_grp_button = CustomButton(text='GRP', color='#133266', tooltip=adj_grp_tt)
-        self.adjustment_grp_button.setFixedWidth(35)
-
-        store_pos_button.singleClicked.connect(self.store_component_position)
-        store_pos_button.doubleClicked.connect(self.store_component_position_vis)
-        move_to_pos_button.singleClicked.connect(self.move_objects_to_stored_position)
-        parent_constraint_button.singleClicked.connect(self.parent_constraint)
-        parent_constraint_button.doubleClicked.connect(self.parent_constraint_options)
-        centerPivot_button.singleClicked.connect(self.center_pivot)
-        deleteHistory_button.singleClicked.connect(self.delete_history)
-        freezeTransform_button.singleClicked.connect(self.freeze_transformation)
-        object_to_world_button.singleClicked.connect(self.object_to_world_origin)
-        active_to_selected_button.singleClicked.connect(self.object_to_active_position)
-        pivot_to_world_button.singleClicked.connect(self.pivot_to_world_origin)
-        pivot_to_selected_button.singleClicked.connect(self.selected_pivot_to_active_pivot)
-        self.adjustment_grp_button.singleClicked.connect(self.create_adjustment_group)
-        self.adjustment_grp_button.doubleClicked.connect(self.create_adjustment_group_move)
-
-        frame1_col2.addWidget(store_pos_button)
-        frame1_col2.addWidget(move_to_pos_button)
-        frame1_col2.addWidget(parent_constraint_button)
-        frame1_col2.addWidget(self.adjustment_grp_button)
-        frame1_col3.addWidget(centerPivot_button)
-        frame1_col3.addWidget(deleteHistory_button)
-        frame1_col3.addWidget(freezeTransform_button)
-        frame1_col3.addWidget(object_to_world_button)
-        frame1_col3.addWidget(active_to_selected_button)
-        frame1_col3.addWidget(pivot_to_world_button)
-        frame1_col3.addWidget(pivot_to_selected_button)
-
-        menu_frame_layout_1.addLayout(frame1_col1)
-        menu_frame_layout_1.addLayout(frame1_col2)
-        menu_frame_layout_1.addWidget(frame1_col3_frame)
-
-        self.frame1_label = QtWidgets.QLabel('Modeling Tools')
-        self.frame1_label.setStyleSheet(f'''QLabel {{ color:rgba(160, 160, 160, .5) }}''')
+        startup_profiler.section('setup_ui: toggle column')
+        self.toggle_col = QtWidgets.QVBoxLayout()
+        self.toggle_col.setAlignment(QtCore.Qt.AlignTop)
+        self.toggle_col.setSpacing(4)
+        self.mainLayout_col.addLayout(self.toggle_col)
+
+        #self.mainLayout_col.addStretch()
         
-        frame1_base_col = QtWidgets.QHBoxLayout()
-        self.moreTools1 = ToggleButton("More", 11, tooltip='Show More Tools', border_radius=3, bg_color='rgba(40, 40, 40, .3)')
-        self.moreTools1.setFixedSize(50, 20)
-        self.moreTools1.setChecked(False)
-        self.moreTools1.toggled.connect(self.update_frame_visibility)
-        frame1_base_col.addWidget(self.frame1_label)
-        frame1_base_col.addStretch()
-        frame1_base_col.addWidget(self.moreTools1)
-        self.frame_col.addLayout(frame1_base_col)
+        self.toggle_col.addSpacing(5)
+        self.toggle_minimize_button = CustomButton(icon=":eye.png", size=20, color='rgba(50, 50, 50,.5)', tooltip="Maximize/Minimize", radius=10,ContextMenu=True,cmColor='#c42b1c')
+        self.toggle_minimize_button.addToMenu('Close',self.close)
+        self.toggle_minimize_button.clicked.connect(self.toggle_minimize)
+        self.toggle_col.addWidget(self.toggle_minimize_button)
 
+        self.toggle_col.addSpacing(10)
+        # The panel toggles share one widget so minimizing hides them in one call
+        self.panel_toggle_column = QtWidgets.QWidget()
+        panel_toggle_layout = QtWidgets.QVBoxLayout(self.panel_toggle_column)
+        panel_toggle_layout.setContentsMargins(0, 0, 0, 0)
+        panel_toggle_layout.setSpacing(4)
+        self.toggle_col.addWidget(self.panel_toggle_column)
+        saved_panel = self.settings.get('panel', '')
+        if saved_panel not in self.panels and saved_panel is not None:
+            saved_panel = next((panel['id'] for panel in self.panel_spec.panels if panel.get('checked')), None)
+        for index, panel in enumerate(self.panel_spec.panels):
+            toggle_button = ToggleButton(str(index + 1), index + 1, tooltip=panel.get('tooltip', panel['id']))
+            toggle_button.setChecked(panel['id'] == saved_panel)
+            toggle_button.toggled_with_id.connect(self.update_toggle)
+            panel_toggle_layout.addWidget(toggle_button)
+            self.panel_toggles[panel['id']] = toggle_button
+            if panel.get('switch_on'):
+                self.switch_toggles[panel['switch_on']] = toggle_button
         #==========================================================================================================================================
-        self.match_frame = QtWidgets.QFrame()
-        self.match_frame.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.match_frame.setFixedWidth(frameWidth)
-        frameStyleSheet(self.match_frame)
-        match_frame_layout = QtWidgets.QVBoxLayout(self.match_frame)
-        match_frame_layout.setContentsMargins(7,7,7,7)
-        
-        self.frame_col.addWidget(self.match_frame)
-
-        match_frameCol_1 = QtWidgets.QHBoxLayout()
-        match_frameCol_1.setSpacing(7)
-
-        def matchTransform(col):
-            match_move_button = CustomButton(text='Move', icon=':ghostingObjectTypeLocator.png', color='#262626', size=16, tooltip="Match Transforms.")
-            match_rotate_button = CustomButton(text='Rotate', icon=':ghostingObjectTypeLocator.png', color='#262626', size=16, tooltip="Match Rotation.")
-            match_scale_button = CustomButton(text='Scale', icon=':ghostingObjectTypeLocator.png', color='#262626', size=16, tooltip="Match Scaling.")
-            match_all_button = CustomButton(text='Match All', color='#CF2222', tooltip="Match All Transforms.")
-            match_move_button.singleClicked.connect(self.match_move)
-            match_rotate_button.singleClicked.connect(self.match_rotate)
-            match_scale_button.singleClicked.connect(self.match_scale)
-            match_all_button.singleClicked.connect(self.match_all)
-            col.addWidget(match_move_button)
-            col.addWidget(match_rotate_button)
-            col.addWidget(match_scale_button)
-            col.addWidget(match_all_button)
-
-        matchTransform(match_frameCol_1)
-        match_frame_layout.addLayout(match_frameCol_1)
+        startup_profiler.section('setup_ui: minimized frame')
+        minimized_page = QtWidgets.QWidget()
+        minimized_col = QtWidgets.QHBoxLayout(minimized_page)
+        minimized_col.setContentsMargins(0, 0, 0, 0)
+
+        self.minimized_frame = QtWidgets.QFrame()
+        self.minimized_frame.setFixedWidth(100)
+        self.minimized_frame.setStyleSheet('QFrame { border: 0px solid gray; border-radius: 5px; background-color: rgba(20, 20, 20, .4); }')
+        minimized_layout = QtWidgets.QHBoxLayout(self.minimized_frame)
+        self.minimized_label = QtWidgets.QLabel("Floating tools")
+        self.minimized_label.setStyleSheet('QLabel { color: rgba(222, 222, 222, .5); background-color: transparent;font-weight: bold;}')
+        minimized_layout.addWidget(self.minimized_label)
+        #minimized_layout.addWidget(self.toggle_minimize_button)
         
+        minimized_col.addStretch()
+        minimized_col.addWidget(self.minimized_frame)
+        self.add_panel_page('minimized', minimized_page)
 
-        #==========================================================================================================================================
+        self.frame_col.addStretch()
+        startup_profiler.section()
+        # Builds the visible panels, each timed as its own 'setup_ui: <panel>' phase
+        self.update_frame_visibility()
+
+        # Install event filter
+        self.installEventFilter(self)
+    
+        self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+
+    def add_panel_page(self, state, page):
+        # Pages that are not current ignore their size, so the stack is only as big as the page on show
+        if state is not None:
+            page.setSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Ignored)
+        self.panel_stack.addWidget(page)
+        self.panel_pages[state] = page
+
+    def build_panel(self, panel_id):
+        container = self.panel_containers[panel_id]
+        if startup_profiler.finished:
+            timer = tracer.span(f"build panel: {panel_id}", 'ui')
+        else:
+            timer = startup_profiler.phase(f"setup_ui: {panel_id}")
+        with timer:
+            panel, module = self.panels[panel_id], None
+            if 'plugin' in panel:
+                try:
+                    panel, module = self.panel_spec.load_plugin(panel)
+                except Exception as error:
+                    # Remembered as built, so a broken plugin warns once instead of on every toggle
+                    self.panel_blocks[panel_id] = []
+                    cmds.warning(f"Floating Tools could not load the {panel_id} panel from {panel['plugin'].module_name}: {error}")
+                    return
+            layout = container.layout()
+            bound = len(self.context_buttons)
+            try:
+                self.panel_blocks[panel_id] = self.panel_builder.build_panel(panel, layout, module)
+            except Exception as error:
+                # Bad values in a layout file or plugin only show up here; what was built is dropped for the built-in panel
+                cmds.warning(f"Floating Tools could not build the {panel_id} panel and uses the built-in one: {type(error).__name__}: {error}")
+                del self.context_buttons[bound:]
+                self.more_toggles.pop(panel_id, None)
+                while layout.count():
+                    widget = layout.takeAt(0).widget()
+                    if widget is not None:
+                        widget.deleteLater()
+                default = next((default for default in PANELS if default['id'] == panel_id), None)
+                builder = PanelBuilder(self, PanelSpec(dict(PANEL_ROWS), list(PANELS)))
+                self.panel_blocks[panel_id] = builder.build_panel(default, layout) if default else []
+            self.update_more(panel_id)
+        if self.context_watcher is not None and self.context_watcher.context:
+            self.apply_selection_context(self.context_watcher.context)
+
+    def build_selection_readout(self):
+        self.selection_readout = SelectionReadout()
+        return self.selection_readout
+
+    def build_orient_frame(self):
         cm = 3
         self.orientFrame = CustomFrame(style=f'''QFrame {{ border: 0px solid gray; border-radius: 5px; background-color: rgba(40, 40, 40, .5); }}''', height=None, margin=2)
-        frameStyleSheet(self.orientFrame)
-        self.orientFrame.setFixedWidth(frameWidth)
+        self.orientFrame.setStyleSheet(frame_style_sheet(4, 'rgba(40, 40, 40, .6)'))
+        self.orientFrame.setFixedWidth(PanelBuilder.frame_width)
         self.orientFrame_layout = QtWidgets.QHBoxLayout(self.orientFrame)
         self.orientFrame_layout.setContentsMargins(cm, cm, cm, cm)
         self.orientFrame_layout.setAlignment(QtCore.Qt.AlignLeft)
         self.orientFrame.layout.addLayout(self.orientFrame_layout)
-        self.frame_col.addWidget(self.orientFrame)
 
         self.increment_label = QtWidgets.QLabel("Set Increment:")
-        self.increment_input = QtWidgets.QLineEdit("90")
+        self.increment_input = QtWidgets.QLineEdit(str(self.settings.get('rotate_increment', "90")))
+        self.increment_input.textChanged.connect(lambda text: self.settings.set('rotate_increment', text))
         self.increment_input.setValidator(QtGui.QDoubleValidator())
         increment_input_col = '#333333'
         self.increment_input.setStyleSheet(f'''QLineEdit{{background-color: {increment_input_col}; color: white;}} QComboBox:hover {{background-color: {hex_value(increment_input_col, .8)};}} QToolTip {{background-color: {increment_input_col}; color: white; border:0px;}} ''')
@@ -600,143 +3094,28 @@ class FloatingTools(QtWidgets.QWidget):
         self.r_neg_Y_button.clicked.connect(lambda: self.rotate_object(0, -1, 0))
         self.r_pos_Z_button.clicked.connect(lambda: self.rotate_object(0, 0, 1))
         self.r_neg_Z_button.clicked.connect(lambda: self.rotate_object(0, 0, -1))
+        self.bind_context('objects', self.r_pos_X_button, self.r_neg_X_button, self.r_pos_Y_button, self.r_neg_Y_button, self.r_pos_Z_button, self.r_neg_Z_button)
 
         self.orientFrame_layout.addWidget(self.increment_input)
         self.orientFrame_layout.addWidget(XFrame)
         self.orientFrame_layout.addWidget(YFrame)
         self.orientFrame_layout.addWidget(ZFrame)
-        #==========================================================================================================================================
-        self.shapeFrame = QtWidgets.QFrame()
-        self.shapeFrame.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.shapeFrame.setFixedWidth(frameWidth)
-        
-        frameStyleSheet(self.shapeFrame)
-        shapeFrame_layout = QtWidgets.QVBoxLayout(self.shapeFrame)
-        shapeFrame_layout.setAlignment(QtCore.Qt.AlignLeft)
-        shapeFrame_layout.setContentsMargins(7,7,7,7)
-        self.frame_col.addWidget(self.shapeFrame)
-
-        shapeFrameCol_1 = QtWidgets.QHBoxLayout()
-        shapeFrameCol_1.setSpacing(7)
-
-        def shapeFrame(col):
-            circle_shape_button = CustomButton(text='⬤', width = None, color='#202C39', tooltip="Circle Shape")
-            square_shape_button = CustomButton(text='◻', width = None, color='#283845', tooltip="SquareShape")
-            box_shape_button = CustomButton(text='🎲', width = None, color='#596762', tooltip="Cube Shape")
-            triangle_shape_button = CustomButton(text='▲', width = None, color='#544E61', tooltip="Triangle Shape")
-            pyramid_shape_button = CustomButton(text='🗼', width = None, color='#867558', tooltip="Pyramid Shape")
-            arrow_shape_button = CustomButton(text='⬆', width = None, color='#205d8b', tooltip="Arrow Shape")
-            cycle_shape_button = CustomButton(text='↻', width = None, color='#783F8E', tooltip="Cycle Shape")
-
-            circle_shape_button.singleClicked.connect(self.circle_sc)
-            square_shape_button.singleClicked.connect(self.square_sc)
-            box_shape_button.singleClicked.connect(self.cube_sc)
-            triangle_shape_button.singleClicked.connect(self.triangle_sc)
-            pyramid_shape_button.singleClicked.connect(self.pyramid_sc)
-            arrow_shape_button.singleClicked.connect(self.arrow_sc)
-            cycle_shape_button.singleClicked.connect(self.cycle_sc)
-
-            col.addWidget(circle_shape_button)
-            col.addWidget(square_shape_button)
-            col.addWidget(box_shape_button)
-            col.addWidget(triangle_shape_button)
-            col.addWidget(pyramid_shape_button)
-            col.addWidget(arrow_shape_button)
-            col.addWidget(cycle_shape_button)
-
-        shapeFrame(shapeFrameCol_1)
-        shapeFrame_layout.addLayout(shapeFrameCol_1)
-        #==========================================================================================================================================
-        self.menu_frame_2 = QtWidgets.QFrame()
-        self.menu_frame_2.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.menu_frame_2.setFixedWidth(frameWidth)
-        frameStyleSheet(self.menu_frame_2)
-
-        cs = 6
-        menu_frame_layout_2 = QtWidgets.QVBoxLayout(self.menu_frame_2)
-        menu_frame_layout_2.setContentsMargins(fs, fs, fs, fs)
-        menu_frame_layout_2.setSpacing(cs)
-        self.frame_col.addWidget(self.menu_frame_2)
-        frame2_col1 = QtWidgets.QHBoxLayout()
-        frame2_col1.setSpacing(fs)
-        frame2_col2 = QtWidgets.QHBoxLayout()
-        frame2_col2.setSpacing(cs)
-        frame2_col3 = QtWidgets.QHBoxLayout()
-        frame2_col3.setSpacing(cs)
-        frame2_col4 = QtWidgets.QHBoxLayout()
-        frame2_col4.setSpacing(cs)
-        frame2_col2_frame = QtWidgets.QFrame()
-        frame2_col2_frame.setStyleSheet(f'''QFrame {{ border: 0px solid gray; border-radius: 5px; background-color: rgba(30, 30, 30, .75); }}''')
-        frame2_col2_col = QtWidgets.QVBoxLayout(frame2_col2_frame)
-        
-        
-        frame2_col2_col.setContentsMargins(cs, cs, cs, cs)
-        frame2_col2_col.setSpacing(cs)
-        
-        mrs(frame2_col1)
+        return self.orientFrame
 
-        buttons = [
-            CustomButton(text='Key', color='#d62e22', tooltip="Sets key frame."),
-            CustomButton(text='Key', color='#3fb07f', tooltip="Sets breakdown frame."),
-            
-            CustomButton(text='Copy', color='#293F64', tooltip="Copy selected key(s)."),
-            CustomButton(text='Paste', color='#1699CA', tooltip="Paste copied key(s)."),
-            CustomButton(text='Paste Inverse', color='#9416CA', tooltip="Paste Inverted copied keys(s)."),
-            CustomButton(text='<', color='#496d88', width=24, tooltip="Remove Inbetween at current time."),
-            CustomButton(text='>', color='#496d88', width=24, tooltip="Add Inbetween at current time."),
-            CustomButton(text='Delete Key', color='#A00000', size=16, tooltip="Deletes keys from the given start frame to the current frame."),
-        ]
-        #CustomButton(text='Mute all', color='#8c805a', tooltip="Mutes all the animation of selected objects."),
-        #CustomButton(text='Unmute all', color='#696969', tooltip="Unmutes all the animation of selected objects."),
-        for button in buttons[:4]:
-            frame2_col2.addWidget(button)
-        for button in buttons[4:]:
-            frame2_col3.addWidget(button)
-        anim_extra = CustomButton(icon=':moreOverlay.png', color='#444444', tooltip="More Options.",ContextMenu=True, onlyContext=True,cmColor='#5285a6')
-        anim_extra.addToMenu("Mute All", self.mute_all)
-        anim_extra.addToMenu("Unmute All", self.unMute_all)
-        anim_extra.addToMenu("Mute Selected", self.mute_selected)
-        anim_extra.addToMenu("Unmute Selected", self.unMute_selected)
-        anim_extra.addToMenu("Break Connections", self.break_connections)
-        frame2_col3.addWidget(anim_extra)
-        #for button in buttons[7:]:
-        #    frame2_col4.addWidget(button)
-
-        buttons[0].singleClicked.connect(self.set_key)
-        buttons[1].singleClicked.connect(self.set_breakdown)
-        #buttons[2].singleClicked.connect(self.mute_all)
-        #buttons[3].singleClicked.connect(self.unMute_all)
-        buttons[2].singleClicked.connect(self.copy_keys)
-        buttons[3].singleClicked.connect(self.paste_keys)
-        buttons[4].singleClicked.connect(self.paste_inverse)
-        buttons[5].singleClicked.connect(self.remove_inbetweens)
-        buttons[6].singleClicked.connect(self.add_inbetweens)
-        buttons[7].singleClicked.connect(self.delete_keys)
-
-        menu_frame_layout_2.addLayout(frame2_col1)
-        frame2_col2_col.addLayout(frame2_col2)
-        frame2_col2_col.addLayout(frame2_col3)
-        frame2_col2_col.addLayout(frame2_col4)
-        menu_frame_layout_2.addWidget(frame2_col2_frame)
-
-        tl_button_col = QtWidgets.QHBoxLayout()
-        
-        #----------------------------------------------------------------------------------------------------------------------------------------
+    def build_keytick_frame(self):
         self.keytick_frame = QtWidgets.QFrame()
-        self.keytick_frame.setStyleSheet(f'''QFrame {{ border: 0px solid gray; border-radius: 4px; background-color: rgba(40, 40, 40, .6); }}''')
+        self.keytick_frame.setStyleSheet(frame_style_sheet(4, 'rgba(40, 40, 40, .6)'))
         self.keytick_frame.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.keytick_frame.setFixedWidth(frameWidth)
+        self.keytick_frame.setFixedWidth(PanelBuilder.frame_width)
         fs = 7
         keytick_frame_layout = QtWidgets.QHBoxLayout(self.keytick_frame)
         keytick_frame_layout.setContentsMargins(fs, fs, fs, fs)
         keytick_frame_layout.setSpacing(fs)
 
-        #self.frame_col.addWidget(self.keytick_frame)
-
-        #frame2_col1.addWidget(keytick_frame)
         self.radio_group = QtWidgets.QButtonGroup(self)
         
         options = ["None", "Active", "Channel Box", "Smart"]
+        current_keytick = self.get_keytick()
         for i, option in enumerate(options):
             radio = QtWidgets.QRadioButton(option)
             radio.setStyleSheet(f"""
@@ -744,9 +3123,9 @@ class FloatingTools(QtWidgets.QWidget):
                 QRadioButton::indicator:checked {{background-color: #5285a6; border: 0px solid #5285a6; border-radius: 3px;}}
                 QRadioButton::indicator:hover {{background-color: #6a6a6a;}}
                 QRadioButton::indicator:checked:hover {{background-color: #62a0c7;}}
-                QToolTip{{background-color: {'#5285a6' if self.get_keytick()[1] == option else '#555555'}; color: white; border: 0px;}}
+                QToolTip{{background-color: {'#5285a6' if current_keytick[1] == option else '#555555'}; color: white; border: 0px;}}
             """)
-            tooltip_text = f'Change Keytick to <b>{option}</b>' if self.get_keytick()[1] != option else f'Current Keytick is <b>{option}</b>'
+            tooltip_text = f'Change Keytick to <b>{option}</b>' if current_keytick[1] != option else f'Current Keytick is <b>{option}</b>'
             radio.setToolTip(f'<div style="white-space: nowrap;">{tooltip_text}</div>')
             self.radio_group.addButton(radio, i)
             
@@ -754,201 +3133,115 @@ class FloatingTools(QtWidgets.QWidget):
 
         self.radio_group.buttonClicked.connect(self.keytick_toggle_option)
 
-        current_setting = self.get_keytick()[0]
+        current_setting = current_keytick[0]
         self.set_current_option(current_setting)
-        #-------------------------------------------------------------------------------------------------------------------------------------    
-        tl_button_col.addStretch()
-        tl_button_col.addWidget(self.keytick_frame)  
-        self.frame_col.addLayout(tl_button_col)  
-
-        self.frame2_label = QtWidgets.QLabel('Timeline Tools')
-        self.frame2_label.setStyleSheet(f'''QLabel {{ color:rgba(160, 160, 160, .5) }}''')  
-        self.frame_col.addWidget(self.frame2_label)   
-        #==========================================================================================================================================
-        
-        mf3Spacer = QtWidgets.QHBoxLayout()
-        self.menu_frame_3 = QtWidgets.QFrame()
-        self.menu_frame_3.setSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
-        self.menu_frame_3.setFixedWidth(250)
-        frameStyleSheet(self.menu_frame_3)
-
-        menu_frame_layout_3 = QtWidgets.QVBoxLayout(self.menu_frame_3)
-        menu_frame_layout_3.setContentsMargins(5,5,5,5)
-
-        mf3Spacer.addStretch()
-        mf3Spacer.addWidget(self.menu_frame_3)
-        self.frame_col.addLayout(mf3Spacer)
-
-        frame3_col1 = QtWidgets.QHBoxLayout()
-        frame3_col1.setSpacing(7)
-        frame3_col2 = QtWidgets.QHBoxLayout()
-        frame3_col2.setSpacing(7)
-        frame3_col3 = QtWidgets.QHBoxLayout()
-        frame3_col3.setSpacing(7)
-        frame3_col4 = QtWidgets.QHBoxLayout()
-        frame3_col4.setSpacing(7)
-        frame3_col2_frame = QtWidgets.QFrame()
-        frame3_col2_frame.setStyleSheet(f'''QFrame {{ border: 0px solid gray; border-radius: 5px; background-color: rgba(30, 30, 30, .6); }}''')
-        frame3_col2_col = QtWidgets.QVBoxLayout(frame3_col2_frame)
-        fs = 7
-        frame3_col2_col.setSpacing(fs)
-        frame3_col2_col.setContentsMargins(fs,fs,fs,fs)
-
-        #mrs(frame3_col1)
-
-        buttons = [
-            CustomButton(text='Key', color='#d62e22', tooltip="Sets key frame."),
-            CustomButton(text='Key', color='#0E8E9A', tooltip="Insert Key Inserts a key on the visible curves in the graph editor."),
-            CustomButton(text='Copy', color='#293F64', tooltip="Copy Keys:This copies the selected key(s)."),
-            CustomButton(text='Paste', color='#1699CA', tooltip="Paste Keys:This pastes the copied key(s)."),
-            CustomButton(text='Paste Selected', color='#5DA380', tooltip="Pastes the selected keys to the current frame in the graph editor."),
-            CustomButton(text='Invert', color='#965D94', tooltip="Inverts the selected keys in the graph editor."),
-            CustomButton(text='Zero Out', color='#AF8E4F', tooltip="Sets the selected keys to zero in the graph editor."),
-            CustomButton(text='Delete Key', color='#A00000', size=16, tooltip="Deletes selected keys."),
-        ]
-
-        for button in buttons[:4]:
-            frame3_col2.addWidget(button)
-        for button in buttons[4:6]:
-            frame3_col3.addWidget(button)
-        for button in buttons[6:]:
-            frame3_col4.addWidget(button)
-
-        buttons[0].singleClicked.connect(self.set_graph_key)
-        buttons[1].singleClicked.connect(self.insert_key)
-        buttons[2].singleClicked.connect(self.copy_graph_key)
-        buttons[3].singleClicked.connect(self.paste_graph_key)
-        buttons[4].singleClicked.connect(self.copy_and_paste_selected_keys)
-        buttons[5].singleClicked.connect(self.invert_keys)
-        buttons[6].singleClicked.connect(self.zero_out)
-        buttons[7].singleClicked.connect(self.delete_keys_graphEditor)
-
-        menu_frame_layout_3.addLayout(frame3_col1)
-        frame3_col2_col.addLayout(frame3_col2)
-        frame3_col2_col.addLayout(frame3_col3)
-        frame3_col2_col.addLayout(frame3_col4)
-        menu_frame_layout_3.addWidget(frame3_col2_frame)
-
-        self.frame3_label = QtWidgets.QLabel('Graph Editor Tools')
-        self.frame3_label.setStyleSheet(f'''QLabel {{ color:rgba(160, 160, 160, .5) }}''')
-        self.frame_col.addWidget(self.frame3_label)
-
-        #==========================================================================================================================================
-        self.toggle_col = QtWidgets.QVBoxLayout()
-        self.toggle_col.setAlignment(QtCore.Qt.AlignTop)
-        self.toggle_col.setSpacing(4)
-        self.mainLayout_col.addLayout(self.toggle_col)
-
-        #self.mainLayout_col.addStretch()
-        
-        self.toggle_col.addSpacing(5)
-        self.toggle_minimize_button = CustomButton(icon=":eye.png", size=20, color='rgba(50, 50, 50,.5)', tooltip="Maximize/Minimize", radius=10,ContextMenu=True,cmColor='#c42b1c')
-        self.toggle_minimize_button.addToMenu('Close',self.close)
-        self.toggle_minimize_button.clicked.connect(self.toggle_minimize)
-        self.toggle_col.addWidget(self.toggle_minimize_button)
-
-        self.toggle_col.addSpacing(10)
-        self.toggle_button_1 = ToggleButton("1", 1, tooltip='Modeling Tools')
-        self.toggle_button_1.setChecked(True)
-        self.toggle_button_2 = ToggleButton("2", 2, tooltip='Time Line Tools')
-        self.toggle_button_3 = ToggleButton("3", 3, tooltip='Graph Editor Tools')
-
-        self.toggle_button_1.toggled_with_id.connect(self.update_toggle)
-        self.toggle_button_2.toggled_with_id.connect(self.update_toggle)
-        self.toggle_button_3.toggled_with_id.connect(self.update_toggle)
-
-        self.toggle_col.addWidget(self.toggle_button_1)
-        self.toggle_col.addWidget(self.toggle_button_2)
-        self.toggle_col.addWidget(self.toggle_button_3)
-        #==========================================================================================================================================
-        minimized_col = QtWidgets.QHBoxLayout()
-
-        self.minimized_frame = QtWidgets.QFrame()
-        self.minimized_frame.setFixedWidth(100)
-        self.minimized_frame.setStyleSheet('QFrame { border: 0px solid gray; border-radius: 5px; background-color: rgba(20, 20, 20, .4); }')
-        minimized_layout = QtWidgets.QHBoxLayout(self.minimized_frame)
-        self.minimized_label = QtWidgets.QLabel("Floating tools")
-        self.minimized_label.setStyleSheet('QLabel { color: rgba(222, 222, 222, .5); background-color: transparent;font-weight: bold;}')
-        minimized_layout.addWidget(self.minimized_label)
-        #minimized_layout.addWidget(self.toggle_minimize_button)
-        
-        minimized_col.addStretch()
-        minimized_col.addWidget(self.minimized_frame)
-        self.frame_col.addLayout(minimized_col)
-        self.minimized_frame.hide()
-
-
-        self.frame_col.addStretch()
-        self.update_frame_visibility()
-
-        # Install event filter
-        self.installEventFilter(self)
-    
-        self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        return self.keytick_frame
     
+    def show_progress(self, label, done, total):
+        # Built on first use; it sits above the panels so it also shows while the panel is minimized
+        if total is None:
+            if self.progress_bar is not None:
+                self.progress_bar.hide()
+            return
+        if self.progress_bar is None:
+            self.progress_bar = QtWidgets.QProgressBar()
+            self.progress_bar.setFixedSize(PanelBuilder.frame_width, 18)
+            self.progress_bar.setStyleSheet('''QProgressBar { border: 0px; border-radius: 4px; background-color: rgba(40, 40, 40, .6); color: rgba(222, 222, 222, .8); font-size: 10px; }
+                QProgressBar::chunk { border-radius: 4px; background-color: #0E8E9A; }''')
+            self.progress_bar.setAlignment(QtCore.Qt.AlignCenter)
+            self.frame_col.insertWidget(0, self.progress_bar, 0, QtCore.Qt.AlignRight)
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"{label}  {done}/{total}  (Esc to cancel)")
+        self.progress_bar.show()
+
     def toggle_minimize(self):
         self.is_minimized = not self.is_minimized
         self.update_frame_visibility()
 
     def update_frame_visibility(self):
+        # The frame is in one state at a time: a panel id, 'minimized', or None when every toggle is off
         if self.is_minimized:
-            self.menu_frame_1.hide()
-            self.match_frame.hide()
-            self.orientFrame.hide()
-            self.shapeFrame.hide()
-            self.menu_frame_2.hide()
-            self.keytick_frame.hide()
-            self.menu_frame_3.hide()
-            self.toggle_button_1.hide()
-            self.toggle_button_2.hide()
-            self.toggle_button_3.hide()
-            self.minimized_frame.show()
-
-            self.moreTools1.hide()
-            self.frame1_label.hide()
-            self.frame2_label.hide()
-            self.frame3_label.hide()
+            state = 'minimized'
         else:
-            self.menu_frame_1.setVisible(self.toggle_button_1.isChecked())
-            self.moreTools1.setText("More" if self.moreTools1.isChecked() == False else "Less")
-            self.moreTools1.setToolTip("Show More Tools" if self.moreTools1.isChecked() == False else "Show Less Tools")
-            #self.adjustment_grp_button.setVisible(self.toggle_button_1.isChecked() and self.moreTools1.isChecked())
-            self.match_frame.setVisible(self.toggle_button_1.isChecked() and self.moreTools1.isChecked())
-            self.orientFrame.setVisible(self.toggle_button_1.isChecked() and self.moreTools1.isChecked())
-            self.shapeFrame.setVisible(self.toggle_button_1.isChecked() and self.moreTools1.isChecked())
-            
-            #self.moreTools1.show()
-            self.frame1_label.setVisible(self.toggle_button_1.isChecked())
-            self.moreTools1.setVisible(self.toggle_button_1.isChecked())
-
-            self.menu_frame_2.setVisible(self.toggle_button_2.isChecked())
-            self.keytick_frame.setVisible(self.toggle_button_2.isChecked())
-            self.frame2_label.setVisible(self.toggle_button_2.isChecked())
+            state = next((panel_id for panel_id, toggle_button in self.panel_toggles.items() if toggle_button.isChecked()), None)
+        if state != self.frame_state:
+            self.set_frame_state(state)
+            self.update_idle()
+        maya_main_window().activateWindow()
 
-            self.menu_frame_3.setVisible(self.toggle_button_3.isChecked())
-            self.frame3_label.setVisible(self.toggle_button_3.isChecked())
+    def set_frame_state(self, state):
+        # Updates are held until the new page is in place, so a switch costs one layout pass and one repaint
+        self.setUpdatesEnabled(False)
+        try:
+            if state in self.panel_containers and state not in self.panel_blocks:
+                self.build_panel(state)
+            self.panel_pages[self.frame_state].setSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Ignored)
+            page = self.panel_pages[state]
+            page.setSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+            self.panel_stack.setCurrentWidget(page)
+            self.panel_toggle_column.setVisible(state != 'minimized')
+            self.frame_state = state
+        finally:
+            self.setUpdatesEnabled(True)
+        self.settings.set('minimized', self.is_minimized)
+        if state != 'minimized':
+            self.settings.set('panel', state)
 
-            self.toggle_button_1.show()
-            self.toggle_button_2.show()
-            self.toggle_button_3.show()
-            self.minimized_frame.hide()
+    def toggle_more(self, panel_id):
+        self.setUpdatesEnabled(False)
+        try:
+            self.update_more(panel_id)
+        finally:
+            self.setUpdatesEnabled(True)
+        more = dict(self.settings.get('more', {}))
+        more[panel_id] = self.more_toggles[panel_id].isChecked()
+        self.settings.set('more', more)
         maya_main_window().activateWindow()
+
+    def update_more(self, panel_id):
+        more_toggle = self.more_toggles.get(panel_id)
+        if more_toggle is None:
+            return
+        more = more_toggle.isChecked()
+        for widget, needs_more in self.panel_blocks.get(panel_id, []):
+            if needs_more:
+                widget.setVisible(more)
+        more_toggle.setText("Less" if more else "More")
+        more_toggle.setToolTip("Show Less Tools" if more else "Show More Tools")
     
+    def bind_context(self, requirement, *buttons):
+        # requirement: 'selection', 'objects', 'two_objects', 'components' or 'keys'
+        for button in buttons:
+            self.context_buttons.append((button, requirement))
+
+    def context_allows(self, requirement, context):
+        if requirement == 'two_objects':
+            return context['objects'] > 1
+        return bool(context[requirement])
+
+    def apply_selection_context(self, context):
+        for button, requirement in self.context_buttons:
+            button.setEnabled(self.context_allows(requirement, context))
+
+        if self.auto_switch_panels and not self.is_minimized:
+            toggle_button = None
+            for requirement in ('keys', 'components'):
+                if context[requirement]:
+                    toggle_button = self.switch_toggles.get(requirement)
+                    break
+            if toggle_button is not None and not toggle_button.isChecked():
+                toggle_button.setChecked(True)
+
     def update_toggle(self, checked, button_id):
         if checked:
-            self.toggle_button_1.setChecked(button_id == 1)
-            self.toggle_button_2.setChecked(button_id == 2)
-            self.toggle_button_3.setChecked(button_id == 3)
+            for index, toggle_button in enumerate(self.panel_toggles.values()):
+                toggle_button.setChecked(index + 1 == button_id)
             self.update_frame_visibility()
     
-    def show_frame_context_menu(self, pos):
-        self.context_menu_open = True
-        menu = QtWidgets.QMenu(self)
+    def build_frame_context_menu(self):
         # Remove background and shadow
-        menu.setWindowFlags(menu.windowFlags() | QtCore.Qt.FramelessWindowHint | QtCore.Qt.NoDropShadowWindowHint)
-        menu.setAttribute(QtCore.Qt.WA_TranslucentBackground)
-        
-        menu.setStyleSheet('''
+        menu = create_popup_menu(self, '''
             QMenu {
                 background-color: rgba(51, 51, 51, 0);
                 border-radius: 3px;
@@ -964,87 +3257,204 @@ class FloatingTools(QtWidgets.QWidget):
                 background-color: #111111;
             }
         ''')
-        toggle_fade_action = menu.addAction("Toggle Fade Away")
-        toggle_fade_action.setCheckable(True)
-        toggle_fade_action.setChecked(self.fade_away_enabled)
+        self.toggle_fade_action = menu.addAction("Toggle Fade Away")
+        self.toggle_fade_action.setCheckable(True)
+        self.auto_switch_action = menu.addAction("Auto Switch Panels")
+        self.auto_switch_action.setCheckable(True)
+        self.toggle_trace_action = menu.addAction("Record Trace")
+        self.toggle_trace_action.setCheckable(True)
+        self.command_server_action = menu.addAction("Command Server")
+        self.command_server_action.setCheckable(True)
+        self.snap_action = menu.addAction("Snap to Edges")
+        self.snap_action.setCheckable(True)
+        self.stall_report_action = menu.addAction("Stall Report")
+        self.frame_context_menu = menu
+
+    def show_frame_context_menu(self, pos):
+        self.context_menu_open = True
+        if self.frame_context_menu is None:
+            self.build_frame_context_menu()
+        self.toggle_fade_action.setChecked(self.fade_away_enabled)
+        self.auto_switch_action.setChecked(self.auto_switch_panels)
+        self.toggle_trace_action.setChecked(tracer.enabled)
+        self.command_server_action.setChecked(command_server().running())
+        self.snap_action.setChecked(self.dragger.snap)
         
-        action = menu.exec_(self.mapToGlobal(pos))
+        action = self.frame_context_menu.exec_(self.mapToGlobal(pos))
         self.context_menu_open = False
         if self.fade_away_enabled:
-            self.fade_timer.start(10)
-        if action == toggle_fade_action:
+            self.start_fade()
+        if action == self.toggle_fade_action:
             self.toggle_fade_away()
+        elif action == self.auto_switch_action:
+            self.auto_switch_panels = not self.auto_switch_panels
+            self.settings.set('auto_switch_panels', self.auto_switch_panels)
+            if self.auto_switch_panels and self.context_watcher.context:
+                self.apply_selection_context(self.context_watcher.context)
+        elif action == self.toggle_trace_action:
+            self.toggle_trace()
+        elif action == self.command_server_action:
+            self.toggle_command_server()
+        elif action == self.stall_report_action:
+            self.stall_monitor.print_report()
+        elif action == self.snap_action:
+            self.dragger.snap = not self.dragger.snap
+            self.settings.set('snap_to_edges', self.dragger.snap)
+
+    def toggle_trace(self):
+        if tracer.enabled:
+            stop_trace()
+        else:
+            start_trace()
+
+    def toggle_command_server(self):
+        server = command_server()
+        if server.running():
+            server.stop()
+            print("Floating Tools command server stopped")
+        else:
+            server.start()
 
     def toggle_fade_away(self):
         self.fade_away_enabled = not self.fade_away_enabled
+        self.settings.set('fade_away', self.fade_away_enabled)
         if not self.fade_away_enabled:
             self.fade_timer.stop()
-            self.fade_animation.stop()
             self.setWindowOpacity(1.0)
  
     #---------------------------------------------------------------------------------------------------------------
+    def closeEvent(self, event):
+        self.settings.close()
+        self.stall_monitor.set_active(False)
+        if chunked_executor.progress == self.show_progress:
+            chunked_executor.progress = None
+        self.context_watcher.stop()
+        if self.selection_readout is not None:
+            self.selection_readout.stop()
+        self.selection_service.uninstall()
+        super().closeEvent(event)
+
+    def event(self, event):
+        # The window's UpdateRequest paints the whole backing store, so one span covers the full UI repaint
+        if startup_profiler.paint_pending is not None and event.type() == QtCore.QEvent.UpdateRequest:
+            result = super().event(event)
+            startup_profiler.finish()
+            return result
+        if tracer.enabled and event.type() == QtCore.QEvent.UpdateRequest:
+            with tracer.span('ui repaint', 'paint'):
+                return super().event(event)
+        return super().event(event)
+
     def eventFilter(self, obj, event):
         if event.type() == QtCore.QEvent.WindowActivate:
             # Prevent the widget from taking focus
             maya_main_window().activateWindow()
             return True
-        return super(FloatingTools, self).eventFilter(obj, event)
+        return super().eventFilter(obj, event)
     
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.LeftButton:
-            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
+            self.dragger.press(event.globalPos())
             event.accept()
         maya_main_window().activateWindow()
 
     def mouseMoveEvent(self, event):
         if event.buttons() == QtCore.Qt.LeftButton:
-            self.move(event.globalPos() - self.drag_position)
+            self.dragger.drag(event.globalPos())
+            event.accept()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton:
+            self.dragger.release()
             event.accept()
 
     def enterEvent(self, event):
+        # Key selection has no callback; refresh when the pointer comes back to the panel
+        self.context_watcher.schedule()
         if self.fade_away_enabled:
             self.fade_timer.stop()
-            self.fade_animation.stop()
-            self.fade_animation.setDuration(100)  # 100ms for fade in
-            self.fade_animation.setStartValue(self.windowOpacity())
-            self.fade_animation.setEndValue(1.0)
-            self.fade_animation.start()
-        super(FloatingTools, self).enterEvent(event)
+            if self.windowOpacity() < 1.0:
+                self.setWindowOpacity(1.0)
+        super().enterEvent(event)
 
     def leaveEvent(self, event):
         if self.fade_away_enabled and not self.context_menu_open:
-            self.fade_timer.start(10)  # 1000ms delay before fade out
-        super(FloatingTools, self).leaveEvent(event)
+            self.start_fade()
+        super().leaveEvent(event)
 
-    def start_fade_animation(self):
-        if self.fade_away_enabled and not self.context_menu_open:
-            self.fade_animation.setDuration(400)  # 1000ms for fade out
-            self.fade_animation.setStartValue(self.windowOpacity())
-            self.fade_animation.setEndValue(0.1)
-            self.fade_animation.start()
+    def start_fade(self):
+        self.fade_queue = list(self.fade_steps)
+        self.fade_timer.start(10)
+
+    def step_fade(self):
+        if not self.fade_away_enabled or self.context_menu_open or not self.fade_queue:
+            return
+        self.setWindowOpacity(self.fade_queue.pop(0))
+        if self.fade_queue:
+            self.fade_timer.start(self.fade_step_ms)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_idle()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_idle()
+
+    def update_idle(self):
+        # Nothing runs for a panel nobody can see: selection listeners, readout callbacks and the fade timer pause while
+        # the window is hidden or minimized, and the readout also while its panel is not the one on show
+        if self.context_watcher is None:
+            return
+        watching = self.isVisible() and not self.is_minimized
+        self.context_watcher.set_active(watching)
+        # The stall monitor keeps running while minimized, since hotkeys and the radial menu still run actions
+        self.stall_monitor.set_active(self.isVisible())
+        if self.selection_readout is not None:
+            self.selection_readout.set_active(watching and self.selection_readout.isVisible())
+        if not watching:
+            self.fade_timer.stop()
     #---------------------------------------------------------------------------------------------------------------
-    def circle_sc(self):
+    @tool_command('Create Circle Control')
+    def circle_sc():
         #create_curve('circle',circle_18_shape)
         cmds.circle(c=(0, 0, 0), nr=(0, 1, 0), sw=360, r=1, d=3, ut=0, tol=0.0001, s=8, ch=1)[0]
-    def square_sc(self):
+    @tool_command('Create Square Control')
+    @undoable
+    def square_sc():
         create_curve('square',square_shape)
-    def cube_sc(self):
+    @tool_command('Create Cube Control')
+    @undoable
+    def cube_sc():
         create_curve('box',cube_shape)
-    def triangle_sc(self):
+    @tool_command('Create Triangle Control')
+    @undoable
+    def triangle_sc():
         create_curve('triangle',triangle_shape)
-    def pyramid_sc(self):
+    @tool_command('Create Pyramid Control')
+    @undoable
+    def pyramid_sc():
         create_curve('pyramid',pyramid_shape)
-    def arrow_sc(self):
+    @tool_command('Create Arrow Control')
+    @undoable
+    def arrow_sc():
         create_curve('arrow',arrow_shape)
-    def cycle_sc(self):
+    @tool_command('Create Cycle Control')
+    @undoable
+    def cycle_sc():
         create_curve('cycle',cycle_shape)
     
     #-------------------------------------------------------------------------------------------------------------------------------------
     def get_keytick(self):
-        check_none = True if mel.eval('timeControl -q -showKeys $gPlayBackSlider;') == 'none' else False
-        check_active = True if mel.eval('timeControl -q -showKeys $gPlayBackSlider;') == 'active' else False
+        with startup_profiler.phase('get_keytick'):
+            return self.query_keytick()
+
+    def query_keytick(self):
+        show_keys = mel.eval('timeControl -q -showKeys $gPlayBackSlider;')
+        check_none = True if show_keys == 'none' else False
+        check_active = True if show_keys == 'active' else False
         s_checker = mel.eval('timeControl -q -showKeysCombined $gPlayBackSlider;')
-        check_channelBox = True if mel.eval('timeControl -q -showKeys $gPlayBackSlider;') == 'mainChannelBox' and s_checker == 0 else False
+        check_channelBox = True if show_keys == 'mainChannelBox' and s_checker == 0 else False
         check_smart = True if s_checker == 1 else False
 
         if check_none:
@@ -1096,41 +3506,44 @@ class FloatingTools(QtWidgets.QWidget):
     #-------------------------------------------------------------------------------------------------------------------------------------
 
     def rotate_object(self, x, y, z):
-        increment = float(self.increment_input.text())
-        selected_objects = cmds.ls(selection=True)
-        if not selected_objects:
-            cmds.warning("No objects selected.")
-            return
-
-        for obj in selected_objects:
-            cmds.rotate(x * increment, y * increment, z * increment, obj, relative=True, objectSpace=True)
+        rotate_selected(x, y, z, float(self.increment_input.text()))
 
-    def center_pivot(self):
-        mel.eval('''CenterPivot;''')
+    @tool_command('Center Pivot')
+    def center_pivot():
+        run_operation('center_pivot')
         
-    def delete_history(self):
-        mel.eval('''DeleteHistory;''')
+    @tool_command('Delete History')
+    def delete_history():
+        run_operation('delete_history')
     
-    def freeze_transformation(self):
-        cmds.makeIdentity(apply=True, translate=True, rotate=True, scale=True, normal=False, preserveNormals=True)
+    @tool_command('Freeze Transformations')
+    def freeze_transformation():
+        run_operation('freeze_transformation')
     
-    def freeze_translate(self):
-        cmds.makeIdentity(apply=True, translate=True, rotate=False, scale=False, normal=False, preserveNormals=True)
+    @tool_command('Freeze Translate')
+    def freeze_translate():
+        run_operation('freeze_translate')
     
-    def freeze_rotate(self):
-        cmds.makeIdentity(apply=True, translate=False, rotate=True, scale=False, normal=False, preserveNormals=True)
+    @tool_command('Freeze Rotate')
+    def freeze_rotate():
+        run_operation('freeze_rotate')
     
-    def freeze_scale(self):
-        cmds.makeIdentity(apply=True, translate=False, rotate=False, scale=True, normal=False, preserveNormals=True)
+    @tool_command('Freeze Scale')
+    def freeze_scale():
+        run_operation('freeze_scale')
     
-    def object_to_world_origin(self):
+    @tool_command('Object to World Origin')
+    def object_to_world_origin():
         mel.eval('''
                     string $obj[] = `ls -sl`;
                     move -rpr 0 0 0 $obj;
                  ''')
     
-    def pivot_to_world_origin(self):
-        selected_objects = cmds.ls(selection=True, long=True)
+    @tool_command('Pivot to Stored Position')
+    @undoable
+    def pivot_to_world_origin():
+        snapshot = selection_service.snapshot()
+        selected_objects = snapshot.names(long=True)
         if not cmds.objExists('storedPositionLocator'):
             create_loc_object('storedPositionLocator')
             #cmds.spaceLocator(name='storedPositionLocator')
@@ -1140,13 +3553,15 @@ class FloatingTools(QtWidgets.QWidget):
 
         for obj in selected_objects:
             cmds.xform(obj, ws=True, piv=source_pivot)
-        cmds.select(selected_objects)
+        selection_service.reselect(snapshot)
         #cmds.xform(ws=True, piv=(0, 0, 0))
         #mel.eval('''xform -ws -piv 0 0 0;''')
     
-    def selected_pivot_to_active_pivot(self):
+    @tool_command('Pivot to Active Pivot')
+    @undoable
+    def selected_pivot_to_active_pivot():
         # Get the selected objects
-        selected_objects = cmds.ls(selection=True)
+        selected_objects = selection_service.snapshot().names()
 
         # Check if there are at least two objects selected
         if len(selected_objects) > 1:
@@ -1163,38 +3578,15 @@ class FloatingTools(QtWidgets.QWidget):
         else:
             cmds.warning("Please select at least two objects.")
 
-    @undoable
-    def object_to_active_position(self):
-        selected_objects = cmds.ls(selection=True, long=True)
-
-        if len(selected_objects) > 1:
-            active_object = selected_objects[-1]
-            
-            # Get the position of the active object
-            active_position = cmds.xform(active_object, query=True, worldSpace=True, rotatePivot=True)
-            
-            # Loop through the other selected objects and set their positions to the active object's position
-            for obj in selected_objects[:-1]:
-                if obj != active_object:
-                    # Get the current world space rotate pivot of the object
-                    current_position = cmds.xform(obj, query=True, worldSpace=True, rotatePivot=True)
-                    
-                    # Calculate the difference between the stored position and current position
-                    offset = [active_position[i] - current_position[i] for i in range(3)]
-                    
-                    # Move the object by the calculated offset
-                    cmds.move(offset[0], offset[1], offset[2], obj, relative=True, worldSpace=True)
-
-            cmds.select(selected_objects[:-1], replace=True)
-        else:
-            cmds.warning("Please select at least two objects.")
+    @tool_command('Snap to Active Object')
+    def object_to_active_position():
+        run_operation('object_to_active_position')
  
+    @tool_command('Store Position')
     @undoable
-    def store_component_position(self):
+    def store_component_position():
         # Get the active selection
-        selection = om.MGlobal.getActiveSelectionList()
-        
-        if selection.isEmpty():
+        if selection_service.snapshot().is_empty():
             if cmds.objExists('storedPositionLocator'):
                 cmds.move(0, 0, 0, 'storedPositionLocator', absolute=True, worldSpace=True)
                 cmds.setAttr('storedPositionLocator.visibility', 0)
@@ -1226,12 +3618,11 @@ class FloatingTools(QtWidgets.QWidget):
         cmds.setAttr('storedPositionLocator.visibility', 0)
         print("Manipulator position stored:", manipulator_pos)
 
+    @tool_command('Store Position (Visible Locator)')
     @undoable
-    def store_component_position_vis(self):
+    def store_component_position_vis():
         # Get the active selection
-        selection = om.MGlobal.getActiveSelectionList()
-        
-        if selection.isEmpty():
+        if selection_service.snapshot().is_empty():
             if cmds.objExists('storedPositionLocator'):
                 cmds.move(0, 0, 0, 'storedPositionLocator', absolute=True, worldSpace=True)
                 cmds.setAttr('storedPositionLocator.visibility', 1)
@@ -1264,9 +3655,10 @@ class FloatingTools(QtWidgets.QWidget):
         cmds.setAttr('storedPositionLocator.visibility', 1)
         print("Manipulator position stored:", manipulator_pos)
     
+    @tool_command('Store Average Position')
     @undoable
-    def store_component_position_avg(self):
-        selection = cmds.ls(selection=True, flatten=True)
+    def store_component_position_avg():
+        selection = selection_service.snapshot().names(flatten=True)
 
         if not selection:
             cmds.warning("Nothing selected. Please select vertices, edges, faces, or objects.")
@@ -1316,243 +3708,59 @@ class FloatingTools(QtWidgets.QWidget):
 
         print("Component or object position stored:", avg_position)
     
-    @undoable
-    def move_objects_to_stored_position(self):
-        selected_objects = cmds.ls(selection=True, long=True)
-        
-        # Check if the stored position locator exists
-        if not cmds.objExists('storedPositionLocator'):
-            create_loc_object('storedPositionLocator')
-            cmds.setAttr('storedPositionLocator.visibility', 0)
-
-        # Get the stored position
-        stored_position = cmds.xform('storedPositionLocator', query=True, translation=True, worldSpace=True)
-
-        # Check if there are any objects selected
-        if not selected_objects:
-            cmds.warning("Please select at least one object to move.")
-            return
-
-        # Loop through the selected objects and move them to the stored position
-        for obj in selected_objects:
-            # Get the current world space rotate pivot of the object
-            current_position = cmds.xform(obj, query=True, worldSpace=True, rotatePivot=True)
-            
-            # Calculate the difference between the stored position and current position
-            offset = [stored_position[i] - current_position[i] for i in range(3)]
-            
-            # Move the object by the calculated offset
-            cmds.move(offset[0], offset[1], offset[2], obj, relative=True, worldSpace=True)
-        
-        cmds.select(selected_objects)
-        print(f"Moved {len(selected_objects)} object(s) to stored position: {stored_position}")
+    @tool_command('Move to Stored Position')
+    def move_objects_to_stored_position():
+        run_operation('move_to_stored_position')
     
-    def match_move(self):
+    @tool_command('Match Translation')
+    def match_move():
         mel.eval('''MatchTranslation;''')
     
-    def match_rotate(self):
+    @tool_command('Match Rotation')
+    def match_rotate():
         mel.eval('''MatchRotation;''')
     
-    def match_scale(self):
+    @tool_command('Match Scaling')
+    def match_scale():
         mel.eval('''MatchScaling;''')
     
-    def match_all(self):
+    @tool_command('Match All Transforms')
+    def match_all():
         mel.eval('''MatchTransform;''')
 
-    @undoable
-    def reset_move(self):
-        cmds.undoInfo(openChunk=True)
-        try:
-            # Get the list of selected objects
-            sel_objs = cmds.ls(sl=True)
-
-            # Loop through each selected object
-            for obj in sel_objs:
-                # Get the current translate values
-                tx = cmds.getAttr(f"{obj}.tx")
-                ty = cmds.getAttr(f"{obj}.ty")
-                tz = cmds.getAttr(f"{obj}.tz")
-
-                # Check if the attributes are locked
-                tx_locked = cmds.getAttr(f"{obj}.tx", lock=True)
-                ty_locked = cmds.getAttr(f"{obj}.ty", lock=True)
-                tz_locked = cmds.getAttr(f"{obj}.tz", lock=True)
-
-                # Reset the translate values if the attribute is not locked
-                if not tx_locked:
-                    cmds.setAttr(f"{obj}.tx", 0)
-
-                if not ty_locked:
-                    cmds.setAttr(f"{obj}.ty", 0)
-
-                if not tz_locked:
-                    cmds.setAttr(f"{obj}.tz", 0)
-        finally:
-            cmds.undoInfo(closeChunk=True) 
+    @tool_command('Reset Move')
+    def reset_move():
+        run_operation('reset_move')
     
-    @undoable
-    def reset_rotate(self):
-        cmds.undoInfo(openChunk=True)
-        try:
-            # Get the list of selected objects
-            sel_objs = cmds.ls(sl=True)
-
-            # Loop through each selected object
-            for obj in sel_objs:
-                # Get the current rotate values
-                rx = cmds.getAttr(f"{obj}.rx")
-                ry = cmds.getAttr(f"{obj}.ry")
-                rz = cmds.getAttr(f"{obj}.rz")
-
-                # Check if the rotate attributes are locked
-                rx_locked = cmds.getAttr(f"{obj}.rx", lock=True)
-                ry_locked = cmds.getAttr(f"{obj}.ry", lock=True)
-                rz_locked = cmds.getAttr(f"{obj}.rz", lock=True)
-
-                # Reset the rotate values if the attribute is not locked
-                if not rx_locked:
-                    cmds.setAttr(f"{obj}.rx", 0)
-                if not ry_locked:
-                    cmds.setAttr(f"{obj}.ry", 0)
-                if not rz_locked:
-                    cmds.setAttr(f"{obj}.rz", 0)
-        finally:
-            cmds.undoInfo(closeChunk=True)
+    @tool_command('Reset Rotate')
+    def reset_rotate():
+        run_operation('reset_rotate')
 
-    @undoable   
-    def reset_scale(self):
-        cmds.undoInfo(openChunk=True)
-        try:
-            # Get the list of selected objects
-            sel_objs = cmds.ls(sl=True)
-
-            # Loop through each selected object
-            for obj in sel_objs:
-                # Get the current scale values
-                sx = cmds.getAttr(f"{obj}.sx")
-                sy = cmds.getAttr(f"{obj}.sy")
-                sz = cmds.getAttr(f"{obj}.sz")
-
-                # Check if the scale attributes are locked
-                sx_locked = cmds.getAttr(f"{obj}.sx", lock=True)
-                sy_locked = cmds.getAttr(f"{obj}.sy", lock=True)
-                sz_locked = cmds.getAttr(f"{obj}.sz", lock=True)
-
-                # Reset the scale values if the attribute is not locked
-                if not sx_locked:
-                    cmds.setAttr(f"{obj}.sx", 1)
-                if not sy_locked:
-                    cmds.setAttr(f"{obj}.sy", 1)
-                if not sz_locked:
-                    cmds.setAttr(f"{obj}.sz", 1)
-        finally:
-            cmds.undoInfo(closeChunk=True) 
+    @tool_command('Reset Scale')
+    def reset_scale():
+        run_operation('reset_scale')
 
-    @undoable
-    def reset_all(self):
-        cmds.undoInfo(openChunk=True)
-        try:
-            # Get the list of selected objects
-            sel_objs = cmds.ls(sl=True)
-
-            # Loop through each selected object
-            for obj in sel_objs:
-                # Get the current translate, rotate, and scale values
-                tx = cmds.getAttr(f"{obj}.tx")
-                ty = cmds.getAttr(f"{obj}.ty")
-                tz = cmds.getAttr(f"{obj}.tz")
-                rx = cmds.getAttr(f"{obj}.rx")
-                ry = cmds.getAttr(f"{obj}.ry")
-                rz = cmds.getAttr(f"{obj}.rz")
-                sx = cmds.getAttr(f"{obj}.sx")
-                sy = cmds.getAttr(f"{obj}.sy")
-                sz = cmds.getAttr(f"{obj}.sz")
-
-                # Check if the attributes are locked
-                tx_locked = cmds.getAttr(f"{obj}.tx", lock=True)
-                ty_locked = cmds.getAttr(f"{obj}.ty", lock=True)
-                tz_locked = cmds.getAttr(f"{obj}.tz", lock=True)
-                rx_locked = cmds.getAttr(f"{obj}.rx", lock=True)
-                ry_locked = cmds.getAttr(f"{obj}.ry", lock=True)
-                rz_locked = cmds.getAttr(f"{obj}.rz", lock=True)
-                sx_locked = cmds.getAttr(f"{obj}.sx", lock=True)
-                sy_locked = cmds.getAttr(f"{obj}.sy", lock=True)
-                sz_locked = cmds.getAttr(f"{obj}.sz", lock=True)
-
-                # Reset the translate values if the attribute is not locked
-                if not tx_locked:
-                    cmds.setAttr(f"{obj}.tx", 0)
-                if not ty_locked:
-                    cmds.setAttr(f"{obj}.ty", 0)
-                if not tz_locked:
-                    cmds.setAttr(f"{obj}.tz", 0)
-
-                # Reset the rotate values if the attribute is not locked
-                if not rx_locked:
-                    cmds.setAttr(f"{obj}.rx", 0)
-                if not ry_locked:
-                    cmds.setAttr(f"{obj}.ry", 0)
-                if not rz_locked:
-                    cmds.setAttr(f"{obj}.rz", 0)
-
-                # Reset the scale values if the attribute is not locked
-                if not sx_locked:
-                    cmds.setAttr(f"{obj}.sx", 1)
-                if not sy_locked:
-                    cmds.setAttr(f"{obj}.sy", 1)
-                if not sz_locked:
-                    cmds.setAttr(f"{obj}.sz", 1)
-        finally:
-            cmds.undoInfo(closeChunk=True) 
+    @tool_command('Reset All')
+    def reset_all():
+        run_operation('reset_all')
     #---------------------------------------------------------------------------------------------------------------
-    def parent_constraint(self):
+    @tool_command('Parent Constraint')
+    def parent_constraint():
         mel.eval("ParentConstraint ;")
 
-    def parent_constraint_options(self):
+    @tool_command('Parent Constraint Options')
+    def parent_constraint_options():
         mel.eval("ParentConstraintOptions ;")
-    @undoable
-    def create_adjustment_group(self):
-        # Get the selected objects
-        selection = cmds.ls(selection=True, long=True)
-        
-        # Check if there is at least one object selected
-        if not selection:
-            cmds.error("No objects selected. Please select at least one object.")
-            return
-
-        for ctrl_obj in selection:
-            # Get the short name of the control object for naming the group
-            ctrl_short_name = ctrl_obj.split('|')[-1]
-            grp1_name = f"{ctrl_short_name}_offset"
-            #grp2_name = f"{ctrl_short_name}_xform"
-            #grp3_name = f"{ctrl_short_name}_topGrp"
-            
-            # Get the current parent of the control object
-            current_parent = cmds.listRelatives(ctrl_obj, parent=True, fullPath=True)
-            
-            # Create a group for ctrl_obj
-            ctrl_grp1 = cmds.group(empty=True, name=grp1_name)
-            #ctrl_grp2 = cmds.group(empty=True, name=grp2_name)
-            #ctrl_grp3 = cmds.group(empty=True, name=grp3_name)
-            
-            # Match the transform of the new group to the control object
-            cmds.matchTransform(ctrl_grp1, ctrl_obj)
-            #cmds.matchTransform(ctrl_grp2, ctrl_obj)
-            #cmds.matchTransform(ctrl_grp3, ctrl_obj)
-            
-            # If the control object had a parent, parent the new group to it
-            if current_parent:
-                cmds.parent(ctrl_grp1, current_parent[0])
-                
-            # Parent the control object to the new group
-            cmds.parent(ctrl_obj, ctrl_grp1)
-            #cmds.parent(ctrl_grp1, ctrl_grp2)
-            #cmds.parent(ctrl_grp2, ctrl_grp3)
+    @tool_command('Create Adjustment Group')
+    def create_adjustment_group():
+        run_operation('create_adjustment_group')
             
+    @tool_command('Create Adjustment Group at Joint')
+    @suspend_evaluation()
     @undoable
-    def create_adjustment_group_move(self):
+    def create_adjustment_group_move():
         # Get the selected objects
-        selection = cmds.ls(selection=True, long=True)
+        selection = selection_service.snapshot().names(long=True)
         
         if len(selection) < 2:
             cmds.warning("Please select at least two objects: the control object and then the joint object.")
@@ -1599,122 +3807,82 @@ class FloatingTools(QtWidgets.QWidget):
         cmds.matchTransform(ctrl_grp1, jnt_obj)
 
     #---------------------------------------------------------------------------------------------------------------
-    def set_key(self):
+    @tool_command('Set Key')
+    def set_key():
         mel.eval("setKeyframe -breakdown 0 -preserveCurveShape 1 -hierarchy none -controlPoints 0 -shape 0;")
     
-    def set_breakdown(self):
+    @tool_command('Set Breakdown')
+    def set_breakdown():
         mel.eval("setKeyframe -breakdown 1 -preserveCurveShape 1 -hierarchy none -controlPoints 0 -shape 0;")
     
-    def insert_key(self):
+    @tool_command('Insert Key')
+    def insert_key():
         mel.eval("InsertKey;")
     
-    def copy_keys(self):
+    @tool_command('Copy Keys')
+    def copy_keys():
         mel.eval("timeSliderCopyKey;")
     
-    def paste_keys(self):
+    @tool_command('Paste Keys')
+    def paste_keys():
         mel.eval("timeSliderPasteKey false;")
     
-    @undoable
-    def paste_inverse(self):
-        mel.eval("timeSliderPasteKey false;")
-        try:
-            # Get the list of selected objects
-            sel_objs = cmds.ls(sl=True)
-
-            # Loop through each selected object
-            for obj in sel_objs:
-                # Get the current translate, rotate, and scale values
-                tx = cmds.getAttr(f"{obj}.tx")
-                ty = cmds.getAttr(f"{obj}.ty")
-                tz = cmds.getAttr(f"{obj}.tz")
-                rx = cmds.getAttr(f"{obj}.rx")
-                ry = cmds.getAttr(f"{obj}.ry")
-                rz = cmds.getAttr(f"{obj}.rz")
-                sx = cmds.getAttr(f"{obj}.sx")
-                sy = cmds.getAttr(f"{obj}.sy")
-                sz = cmds.getAttr(f"{obj}.sz")
-
-                # Check if the attributes are locked
-                tx_locked = cmds.getAttr(f"{obj}.tx", lock=True)
-                ty_locked = cmds.getAttr(f"{obj}.ty", lock=True)
-                tz_locked = cmds.getAttr(f"{obj}.tz", lock=True)
-                rx_locked = cmds.getAttr(f"{obj}.rx", lock=True)
-                ry_locked = cmds.getAttr(f"{obj}.ry", lock=True)
-                rz_locked = cmds.getAttr(f"{obj}.rz", lock=True)
-                sx_locked = cmds.getAttr(f"{obj}.sx", lock=True)
-                sy_locked = cmds.getAttr(f"{obj}.sy", lock=True)
-                sz_locked = cmds.getAttr(f"{obj}.sz", lock=True)
-
-                # Reset the translate values if the attribute is not locked
-                if not tx_locked:
-                    cmds.setAttr(f"{obj}.tx", tx * -1)
-
-                '''if not ty_locked:
-                    cmds.setAttr(f"{obj}.ty", ty * -1)
-                if not tz_locked:
-                    cmds.setAttr(f"{obj}.tz", tz * -1)'''
-
-                # Reset the rotate values if the attribute is not locked
-                if not rx_locked:
-                    cmds.setAttr(f"{obj}.rx", rx)
-                if not ry_locked:
-                    cmds.setAttr(f"{obj}.ry", ry * -1)
-                if not rz_locked:
-                    cmds.setAttr(f"{obj}.rz", rz * -1)
-                
-                '''# Reset the scale values if the attribute is not locked
-                if not sx_locked:
-                    cmds.setAttr(f"{obj}.sx", 1)
-                if not sy_locked:
-                    cmds.setAttr(f"{obj}.sy", 1)
-                if not sz_locked:
-                    cmds.setAttr(f"{obj}.sz", 1)'''
-        finally:
-            cmds.undoInfo(closeChunk=True) 
+    @tool_command('Paste Inverse')
+    def paste_inverse():
+        run_operation('paste_inverse')
     
-    def add_inbetweens(self):
+    @tool_command('Add Inbetween')
+    def add_inbetweens():
         mel.eval("timeSliderEditKeys addInbetween;")
 
-    def remove_inbetweens(self):
+    @tool_command('Remove Inbetween')
+    def remove_inbetweens():
         mel.eval("timeSliderEditKeys removeInbetween;")
 
-    def delete_keys(self):
+    @tool_command('Delete Keys')
+    def delete_keys():
         mel.eval('''timeSliderClearKey;''')
 
     #---------------------------------------------------------------------------------------------------------------
-    def mute_all(self):
+    @tool_command('Mute All')
+    def mute_all():
         mel.eval('channelBoxCommand -muteall;')
     
+    @tool_command('Unmute All')
     @undoable
-    def unMute_all(self):
+    def unMute_all():
         mel.eval('channelBoxCommand -unmuteall;')
 
-    def mute_selected(self):
+    @tool_command('Mute Selected')
+    def mute_selected():
         mel.eval('channelBoxCommand -mute;')
     
-    def unMute_selected(self):
+    @tool_command('Unmute Selected')
+    def unMute_selected():
         mel.eval('channelBoxCommand -unmute;')
 
-    def break_connections(self):
+    @tool_command('Break Connections')
+    def break_connections():
         mel.eval('channelBoxCommand -break;')
 
     #---------------------------------------------------------------------------------------------------------------
     #----------------------------------------------------------------------------------------------------------------
-    def set_graph_key(self):
+    @tool_command('Set Graph Key')
+    def set_graph_key():
         mel.eval("setKeyframe -breakdown 0 -preserveCurveShape 1 -hierarchy none -controlPoints 0 -shape 0;")
-
-    def insert_key(self):
-        mel.eval("InsertKey;")
     
-    def copy_graph_key(self):
+    @tool_command('Copy Graph Keys')
+    def copy_graph_key():
         mel.eval("copyKey ;")
     
-    def paste_graph_key(self):
+    @tool_command('Paste Graph Keys')
+    def paste_graph_key():
         current_time = cmds.currentTime(query=True)
         cmds.pasteKey(time=(current_time, current_time), option="merge")
     
+    @tool_command('Paste Selected Keys')
     @undoable 
-    def copy_and_paste_selected_keys(self):
+    def copy_and_paste_selected_keys():
         # Get the selected keys
         selected_keys = cmds.keyframe(q=True, sl=True)
         
@@ -1732,40 +3900,25 @@ class FloatingTools(QtWidgets.QWidget):
         cmds.pasteKey(time=(current_time, current_time), option="merge")
         print("Keys pasted at the current time.")
 
+    @tool_command('Invert Keys')
     @undoable
-    def invert_keys(self):
+    def invert_keys():
         mel.eval('scaleKey -scaleSpecifiedKeys 1 -autoSnap 0 -timeScale 1 -timePivot 0 -floatScale 1 -floatPivot 0 -valueScale -1 -valuePivot 0 ;')
 
-    @undoable        
-    def zero_out(self):
-        # Get the selected keyframes
-        selected_keys = cmds.keyframe(query=True, selected=True)
-
-        if selected_keys:
-            # Get the selected animation curves
-            anim_curves = cmds.keyframe(query=True, selected=True, name=True)
-            
-            if anim_curves:
-                # Get all selected keyframe times
-                key_times = cmds.keyframe(query=True, selected=True, timeChange=True)
-                
-                for curve in anim_curves:
-                    for time in key_times:
-                        # Set the value of each selected keyframe to zero
-                        cmds.keyframe(curve, edit=True, time=(time,), valueChange=0)
-                
-                print(f"Set {len(key_times)} keyframe(s) to zero across {len(anim_curves)} animation curve(s).")
-            else:
-                print("No animation curve selected.")
-        else:
-            print("No keyframe selected. Please select keyframe(s) in the Graph Editor.")
+    @tool_command('Zero Out')
+    def zero_out():
+        run_operation('zero_out')
 
-    def delete_keys_graphEditor(self):
+    @tool_command('Delete Graph Keys')
+    def delete_keys_graphEditor():
         mel.eval("cutKey -animation keys -clear;")
 
     #----------------------------------------------------------------------------------------------------------------
     
 def show_floating_tool():
+    global startup_profiler
+    if startup_profiler.finished:
+        startup_profiler = StartupProfiler()
     try:
         if hasattr(maya_main_window(), '_floating_tool_widget'):
             maya_main_window()._floating_tool_widget.close()
@@ -1775,9 +3928,18 @@ def show_floating_tool():
 
     floating_tool_widget = FloatingTools(parent=maya_main_window())
     floating_tool_widget.setObjectName("floatingTool")
-    floating_tool_widget.move(1280, 700)
+    floating_tool_widget.move(initial_window_position())
+    selection_service.install()
+    with startup_profiler.phase('runtime commands'):
+        install_runtime_commands()
+    with startup_profiler.phase('radial menu'):
+        prebuild_radial_menu()
+    startup_profiler.paint_pending = time.perf_counter()
     floating_tool_widget.show()
     maya_main_window()._floating_tool_widget = floating_tool_widget
     maya_main_window().activateWindow()
 
-show_floating_tool()
+startup_profiler.add('import: total', _import_started, time.perf_counter())
+# The shelf button runs this as __main__; imports (batch runner, mayapy) get the commands without the panel
+if __name__ == "__main__":
+    show_floating_tool()
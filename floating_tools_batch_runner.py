@@ -0,0 +1,211 @@
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# Headless runner for the Floating Tools commands. Run it with mayapy, for example:
+#   mayapy floating_tools_batch_runner.py scenes/ --steps delete_history freeze_transformation center_pivot "reset_all=*_ctrl" --workers 4 --save
+# Each worker is a mayapy process that initializes maya.standalone once and then opens, cleans and saves scenes one
+# after another. Results and timings are streamed to a JSONL report, one line per file, as soon as each file is done.
+
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENE_EXTENSIONS = ('.ma', '.mb')
+DEFAULT_STEPS = ('delete_history', 'freeze_transformation', 'center_pivot')
+
+floating_tools = None
+
+#----------------------------------------------------------------------------------------------------------------
+def collect_scenes(paths, file_list=None):
+    scenes = []
+    if file_list:
+        with open(file_list) as f:
+            paths = list(paths) + [line.strip() for line in f if line.strip()]
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                scenes.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(SCENE_EXTENSIONS))
+        elif path.lower().endswith(SCENE_EXTENSIONS):
+            scenes.append(path)
+    # Keep the order but drop duplicates, so a file listed twice is not processed by two workers at once
+    unique = []
+    for scene in scenes:
+        scene = os.path.abspath(scene)
+        if scene not in unique:
+            unique.append(scene)
+    return unique
+
+def parse_steps(steps):
+    # "reset_all=*_ctrl" runs reset_all on the transforms matching *_ctrl; a bare name runs on every transform
+    parsed = []
+    for step in steps:
+        name, _, pattern = step.partition('=')
+        parsed.append((name, pattern or None))
+    return parsed
+
+#----------------------------------------------------------------------------------------------------------------
+def init_worker():
+    global floating_tools
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    if TOOL_DIR not in sys.path:
+        sys.path.insert(0, TOOL_DIR)
+    import floating_tools
+
+def scene_transforms(pattern=None):
+    from maya import cmds
+    transforms = cmds.ls(type='transform', long=True) or []
+    startup_cameras = set()
+    for camera in cmds.ls(type='camera', long=True) or []:
+        if cmds.camera(camera, query=True, startupCamera=True):
+            startup_cameras.update(cmds.listRelatives(camera, parent=True, fullPath=True) or [])
+    transforms = [node for node in transforms if node not in startup_cameras]
+    if pattern:
+        transforms = [node for node in transforms if fnmatch.fnmatchcase(node.split('|')[-1], pattern)]
+    return transforms
+
+def process_scene(path, steps, save, output_dir):
+    from maya import cmds
+    started = time.perf_counter()
+    result = {'file': path, 'ok': True, 'worker': os.getpid(), 'steps': []}
+    try:
+        cmds.file(new=True, force=True)
+        cmds.file(path, open=True, force=True, prompt=False, ignoreVersion=True)
+        result['open_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        # Undo history is never used here and only costs memory and time
+        cmds.undoInfo(state=False)
+        for name, pattern in steps:
+            step_started = time.perf_counter()
+            step = {'step': name, 'selection': pattern}
+            targets = scene_transforms(pattern)
+            step['nodes'] = len(targets)
+            if targets:
+                cmds.select(targets, replace=True)
+                floating_tools.run_tool_command(name)
+            step['ms'] = round((time.perf_counter() - step_started) * 1000, 2)
+            result['steps'].append(step)
+
+        if save or output_dir:
+            save_started = time.perf_counter()
+            if output_dir:
+                cmds.file(rename=os.path.join(output_dir, os.path.basename(path)))
+            file_type = 'mayaBinary' if path.lower().endswith('.mb') else 'mayaAscii'
+            result['saved_to'] = cmds.file(save=True, type=file_type, force=True)
+            result['save_ms'] = round((time.perf_counter() - save_started) * 1000, 2)
+    except Exception as error:
+        result['ok'] = False
+        result['error'] = f"{type(error).__name__}: {error}"
+    result['total_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+#----------------------------------------------------------------------------------------------------------------
+def run_pool(context, workers, scenes, steps, save, output_dir, record):
+    # Returns the scenes left unfinished because a worker crashed, which breaks the pool and fails every pending future
+    broken = set()
+    with ProcessPoolExecutor(max_workers=min(workers, len(scenes)), mp_context=context, initializer=init_worker) as pool:
+        futures = {pool.submit(process_scene, scene, steps, save, output_dir): scene for scene in scenes}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken.add(futures[future])
+                continue
+            except Exception as error:
+                result = {'file': futures[future], 'ok': False, 'error': f"{type(error).__name__}: {error}"}
+            record(result)
+    return [scene for scene in scenes if scene in broken]
+
+def run_batch(scenes, steps, workers, report, save=False, output_dir=None):
+    if output_dir and not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    started = time.perf_counter()
+    failed = 0
+    # Maya is not fork-safe, so workers are always spawned as fresh mayapy processes
+    context = multiprocessing.get_context('spawn')
+    with open(report, 'w') as report_file:
+        def record(result):
+            nonlocal failed
+            failed += not result['ok']
+            report_file.write(json.dumps(result) + '\n')
+            report_file.flush()
+            print(f"{'ok' if result['ok'] else 'FAILED'}  {result['file']}  {result.get('total_ms', 0):.0f} ms")
+
+        # A scene that crashes mayapy takes the scenes queued with it down too, so unfinished scenes go to a fresh
+        # pool. One caught in two crashes gets a worker of its own, and is reported as failed if it crashes that too.
+        crashes = {}
+        pending = scenes
+        suspects = []
+        while pending:
+            broken = run_pool(context, workers, pending, steps, save, output_dir, record)
+            pending = []
+            for scene in broken:
+                crashes[scene] = crashes.get(scene, 0) + 1
+                (suspects if crashes[scene] > 1 else pending).append(scene)
+        for scene in suspects:
+            if run_pool(context, 1, [scene], steps, save, output_dir, record):
+                record({'file': scene, 'ok': False, 'error': "The mayapy worker crashed on this scene"})
+
+        summary = {'summary': {'files': len(scenes), 'failed': failed, 'workers': workers, 'steps': [name for name, pattern in steps],
+                               'retried_after_crash': len(crashes), 'total_ms': round((time.perf_counter() - started) * 1000, 2)}}
+        report_file.write(json.dumps(summary) + '\n')
+    return failed
+
+def serve(port, scenes):
+    # A headless stand-in for an artist session, for testing pipeline scripts against the command server
+    init_worker()
+    from maya import cmds
+    if scenes:
+        cmds.file(scenes[0], open=True, force=True, prompt=False, ignoreVersion=True)
+    server = floating_tools.CommandServer(port)
+    print(f"Serving Floating Tools commands on {server.host}:{port}, Ctrl+C to stop")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    if server.error is not None:
+        print(f"Could not listen on port {port}: {server.error}")
+        return 1
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Floating Tools commands over many Maya scenes with a pool of mayapy workers.")
+    parser.add_argument('paths', nargs='*', help="Scene files or folders to search for .ma/.mb files")
+    parser.add_argument('--file-list', help="Text file with one scene path per line")
+    parser.add_argument('--steps', nargs='+', default=list(DEFAULT_STEPS), help="Commands to run in order, optionally as name=pattern")
+    parser.add_argument('--workers', type=int, default=max(1, min(4, os.cpu_count() or 1)), help="Number of mayapy worker processes")
+    parser.add_argument('--report', default='floating_tools_batch_report.jsonl', help="JSONL report path")
+    parser.add_argument('--save', action='store_true', help="Save each scene in place")
+    parser.add_argument('--output-dir', help="Save cleaned scenes to this folder instead of in place")
+    parser.add_argument('--serve', type=int, metavar='PORT', help="Open the first scene (if any) and serve JSON-RPC batches on localhost instead of running steps")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+
+    try:
+        import maya.standalone
+    except ImportError:
+        parser.error("maya.standalone is not available. Run this script with mayapy.")
+    if args.serve:
+        return serve(args.serve, collect_scenes(args.paths, args.file_list))
+    if TOOL_DIR not in sys.path:
+        sys.path.insert(0, TOOL_DIR)
+    # Importing the tool does not need a Maya session, so step names are checked before any worker starts
+    import floating_tools as tool
+    steps = parse_steps(args.steps)
+    unknown = [name for name, pattern in steps if name not in tool.TOOL_COMMANDS]
+    if unknown:
+        parser.error(f"Unknown steps: {', '.join(unknown)}. Available: {', '.join(sorted(tool.TOOL_COMMANDS))}")
+    scenes = collect_scenes(args.paths, args.file_list)
+    if not scenes:
+        parser.error("No .ma/.mb scenes found.")
+
+    failed = run_batch(scenes, steps, args.workers, args.report, save=args.save, output_dir=args.output_dir)
+    print(f"{len(scenes) - failed}/{len(scenes)} scenes processed, report written to {args.report}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import itertools
+import json
+import socket
+
+# Client for the Floating Tools command server (right-click the tool's frame > Command Server, or
+# `mayapy floating_tools_batch_runner.py --serve PORT` for a headless session). It has no Maya imports, so pipeline
+# scripts can use it from any Python:
+#
+#   import floating_tools_client
+#   floating_tools_client.call([
+#       ('reset_all', {'targets': controls}),
+#       ('store_component_position_avg', {'targets': ['body.vtx[10:20]']}),
+#       ('zero_out', {'curves': ['arm_ctrl_rotateX']}),
+#   ])
+#
+# One call() is one batch: it runs in a single undo chunk in the Maya session and all results come back together.
+
+DEFAULT_PORT = 7720
+
+_ids = itertools.count(1)
+
+def request(method, params=None):
+    return {'jsonrpc': '2.0', 'id': next(_ids), 'method': method, 'params': params or {}}
+
+def call(requests, port=DEFAULT_PORT, host='127.0.0.1', timeout=60):
+    # requests are (method, params) pairs or ready-made JSON-RPC dicts; responses come back in request order
+    batch = [item if isinstance(item, dict) else request(*item) for item in requests]
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.sendall(json.dumps(batch).encode() + b'\n')
+        with connection.makefile('rb') as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("The Floating Tools command server closed the connection without answering.")
+    responses = json.loads(line)
+    if isinstance(responses, dict):
+        # A batch-level error such as a parse error
+        raise RuntimeError(responses.get('error', {}).get('message', responses))
+    order = {item.get('id'): index for index, item in enumerate(batch)}
+    return sorted(responses, key=lambda response: order.get(response.get('id'), len(order)))
+
+def commands(port=DEFAULT_PORT, host='127.0.0.1'):
+    return call([('commands', None)], port=port, host=host)[0]['result']
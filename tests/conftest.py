@@ -0,0 +1,14 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from maya import cmds
+except ImportError:
+    cmds = None
+
+if cmds is not None and not hasattr(cmds, 'ls'):
+    # mayapy, before maya.standalone.initialize()
+    import maya.standalone
+    maya.standalone.initialize()
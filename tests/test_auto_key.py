@@ -0,0 +1,30 @@
+import pytest
+
+cmds = pytest.importorskip('maya.cmds')
+# The test opens a new scene, so it only runs in mayapy
+pytestmark = pytest.mark.skipif(not cmds.about(batch=True), reason="needs mayapy")
+
+import floating_tools
+
+@pytest.fixture
+def auto_key():
+    state = cmds.autoKeyframe(query=True, state=True)
+    cmds.autoKeyframe(state=True)
+    yield
+    cmds.autoKeyframe(state=state)
+
+def test_reset_keys_animated_channels_when_auto_key_is_on(auto_key):
+    cmds.file(new=True, force=True)
+    ctrl = cmds.group(empty=True, name='ctrl')
+    cmds.setKeyframe(ctrl, attribute='translateX', time=1, value=5)
+    cmds.setKeyframe(ctrl, attribute='translateX', time=10, value=5)
+    cmds.currentTime(10)
+    cmds.select(ctrl, replace=True)
+    floating_tools.selection_service.invalidate()
+
+    floating_tools.run_operation('reset_move')
+
+    assert cmds.keyframe(ctrl, attribute='translateX', query=True, valueChange=True) == pytest.approx([5, 0])
+    # Only channels that already had keys are keyed, as auto-key does
+    assert cmds.keyframe(ctrl, attribute='translateY', query=True) is None
+    assert cmds.getAttr(ctrl + '.translateX') == pytest.approx(0)
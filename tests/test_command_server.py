@@ -0,0 +1,61 @@
+import json
+import socket
+import threading
+
+import pytest
+
+pytest.importorskip('maya.cmds')
+import floating_tools
+import floating_tools_client
+
+PORT = 7721
+
+def serve(server, client):
+    # The server runs in the foreground like `--serve` does; the client talks to it from a thread and stops it
+    result = {}
+    ready = threading.Event()
+
+    def run_client():
+        ready.wait(5)
+        try:
+            result['value'] = client()
+        except Exception as error:
+            result['error'] = error
+        finally:
+            server.loop.call_soon_threadsafe(server.loop.stop)
+
+    thread = threading.Thread(target=run_client, daemon=True)
+    thread.start()
+    server.serve(ready)
+    thread.join(5)
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+def send_lines(lines):
+    with socket.create_connection(('127.0.0.1', PORT), timeout=30) as connection:
+        with connection.makefile('rb') as stream:
+            responses = []
+            for line in lines:
+                connection.sendall(line + b'\n')
+                responses.append(json.loads(stream.readline()))
+    return responses
+
+def test_request_over_64_kib():
+    padding = 'x' * (200 * 1024)
+    responses = serve(floating_tools.CommandServer(PORT), lambda: floating_tools_client.call([('commands', {'padding': padding})], port=PORT))
+    assert 'result' in responses[0]
+
+def test_request_over_line_limit_is_rejected_and_the_connection_carries_on():
+    server = floating_tools.CommandServer(PORT)
+    server.line_limit = 64 * 1024
+    too_long = json.dumps(floating_tools_client.request('commands', {'padding': 'x' * (200 * 1024)})).encode()
+    fits = json.dumps(floating_tools_client.request('commands')).encode()
+    rejected, answered = serve(server, lambda: send_lines([too_long, fits]))
+    assert rejected['error']['code'] == -32600
+    assert 'result' in answered
+
+def test_non_object_params_are_rejected():
+    request = dict(floating_tools_client.request('commands'), params=[1, 2])
+    responses = serve(floating_tools.CommandServer(PORT), lambda: floating_tools_client.call([request], port=PORT))
+    assert responses[0]['error']['code'] == -32602
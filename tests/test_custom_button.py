@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip('maya.cmds')
+omui = pytest.importorskip('maya.OpenMayaUI')
+# Buttons hand focus back to Maya's main window on press, so these run in an interactive session
+pytestmark = pytest.mark.skipif(omui.MQtUtil.mainWindow() is None, reason="needs an interactive Maya session")
+
+import floating_tools
+from floating_tools import QtCore, QtWidgets
+
+# The same Qt binding the tool picked, PySide6 or PySide2
+QtTest = pytest.importorskip(QtCore.__name__.split('.')[0] + '.QtTest')
+
+def held_click(button, ms):
+    QtTest.QTest.mousePress(button, QtCore.Qt.LeftButton)
+    QtTest.QTest.qWait(ms)
+    QtTest.QTest.mouseRelease(button, QtCore.Qt.LeftButton)
+
+@pytest.mark.parametrize('with_double_click', [False, True])
+def test_press_held_longer_than_the_double_click_interval_still_clicks(with_double_click):
+    interval = QtWidgets.QApplication.doubleClickInterval()
+    button = floating_tools.CustomButton('Test')
+    button.show()
+    clicks = []
+    button.singleClicked.connect(lambda: clicks.append('single'))
+    if with_double_click:
+        button.doubleClicked.connect(lambda: clicks.append('double'))
+    try:
+        held_click(button, interval + 100)
+        QtTest.QTest.qWait(interval + 50)
+        assert clicks == ['single']
+    finally:
+        button.deleteLater()
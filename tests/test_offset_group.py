@@ -0,0 +1,20 @@
+import pytest
+
+cmds = pytest.importorskip('maya.cmds')
+# The test opens a new scene, so it only runs in mayapy
+pytestmark = pytest.mark.skipif(not cmds.about(batch=True), reason="needs mayapy")
+
+import floating_tools
+
+def test_selected_parent_and_child_each_get_an_offset_group():
+    cmds.file(new=True, force=True)
+    parent_ctrl = cmds.group(empty=True, name='parent_ctrl')
+    child_ctrl = cmds.group(empty=True, name='child_ctrl', parent=parent_ctrl)
+    cmds.move(1, 2, 3, child_ctrl, worldSpace=True)
+    cmds.select(parent_ctrl, child_ctrl, replace=True)
+    floating_tools.selection_service.invalidate()
+
+    floating_tools.run_operation('create_adjustment_group')
+
+    assert cmds.ls('child_ctrl', long=True) == ['|parent_ctrl_offset|parent_ctrl|child_ctrl_offset|child_ctrl']
+    assert cmds.xform('child_ctrl_offset', query=True, worldSpace=True, translation=True) == pytest.approx([1, 2, 3])
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+cmds = pytest.importorskip('maya.cmds')
+omui = pytest.importorskip('maya.OpenMayaUI')
+import floating_tools
+
+def write_layout(tmp_path, layout):
+    path = tmp_path / 'floating_tools_layout.json'
+    path.write_text(json.dumps(layout))
+    return str(path)
+
+@pytest.mark.parametrize('layout', [
+    [1, 2],
+    {'panels': [{'tooltip': 'no id'}]},
+    {'panels': [{'id': 'extra', 'tooltip': 'no blocks'}]},
+    {'rows': 5},
+    {'rows': {'reset': 5}},
+    {'rows': {'reset': ['not a button']}},
+    {'order': 3},
+])
+def test_malformed_layout_falls_back_to_the_built_in_panels(tmp_path, layout):
+    spec = floating_tools.PanelSpec.load(write_layout(tmp_path, layout))
+    assert spec.rows == floating_tools.PANEL_ROWS
+    assert [panel['id'] for panel in spec.panels][:len(floating_tools.PANELS)] == [panel['id'] for panel in floating_tools.PANELS]
+
+@pytest.mark.skipif(omui.MQtUtil.mainWindow() is None, reason="needs an interactive Maya session")
+@pytest.mark.parametrize('layout', [
+    # Right shape, but CustomButton cannot take a text width
+    {'rows': {'reset': [{'text': 'R', 'width': 'wide'}]}},
+    {'panels': [{'id': 'modeling', 'tooltip': 'Modeling', 'blocks': [{'row': 'no_such_row'}]}]},
+])
+def test_panel_that_fails_to_build_uses_the_built_in_panel(tmp_path, monkeypatch, layout):
+    monkeypatch.setattr(floating_tools, 'panel_layout_path', lambda: write_layout(tmp_path, layout))
+    monkeypatch.setattr(floating_tools.PanelSpec, 'cached', None)
+    panel = floating_tools.FloatingTools(parent=floating_tools.maya_main_window())
+    try:
+        if 'modeling' not in panel.panel_blocks:
+            panel.build_panel('modeling')
+        built_in = next(built_in for built_in in floating_tools.PANELS if built_in['id'] == 'modeling')
+        assert len(panel.panel_blocks['modeling']) == len(built_in['blocks'])
+    finally:
+        panel.close()
+        panel.deleteLater()
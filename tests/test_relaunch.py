@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+cmds = pytest.importorskip('maya.cmds')
+omui = pytest.importorskip('maya.OpenMayaUI')
+
+# The panel needs Maya's main window, so these run in an interactive session, e.g. from the Script Editor:
+#   import pytest; pytest.main(['-q', '<path to this folder>'])
+pytestmark = pytest.mark.skipif(omui.MQtUtil.mainWindow() is None, reason="needs an interactive Maya session")
+
+TOOL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'floating_tools.py')
+
+def launch(namespace):
+    # The shelf button runs the whole file as __main__, into the same globals every time
+    with open(TOOL_PATH) as f:
+        exec(compile(f.read(), TOOL_PATH, 'exec'), namespace)
+    return namespace['maya_main_window']()._floating_tool_widget
+
+@pytest.fixture
+def namespace():
+    namespace = {'__name__': '__main__'}
+    yield namespace
+    widget = getattr(namespace['maya_main_window'](), '_floating_tool_widget', None)
+    if widget is not None:
+        widget.close()
+
+def test_relaunch_removes_previous_selection_callbacks(namespace):
+    first_panel = launch(namespace)
+    first_service = namespace['selection_service']
+    assert first_service.installed()
+
+    second_panel = launch(namespace)
+    second_service = namespace['selection_service']
+    assert second_service is not first_service
+    assert first_service._callback_ids == []
+    assert first_service._listeners == []
+    assert second_service.installed()
+    assert second_panel.context_watcher.schedule in second_service._listeners
+    assert first_panel.context_watcher.schedule not in second_service._listeners
+
+    # Selection changes must only reach the live panel
+    cmds.select(cmds.polyCube()[0], replace=True)
+    namespace['QtWidgets'].QApplication.processEvents()
+    assert second_panel.context_watcher.context is not None
+
+def test_relaunch_stops_previous_stall_monitor(namespace):
+    launch(namespace)
+    first_monitor = namespace['stall_monitor']
+    assert first_monitor.active()
+
+    second_panel = launch(namespace)
+    assert not first_monitor.active()
+    assert second_panel.stall_monitor is namespace['stall_monitor']
+    assert second_panel.stall_monitor.active()
+
+def test_relaunch_reads_settings_the_closing_panel_saved(namespace):
+    first_panel = launch(namespace)
+    fade_away = first_panel.fade_away_enabled
+    first_panel.toggle_fade_away()
+    assert namespace['settings'].pending()
+
+    # The change is still waiting for its delayed write when the relaunch loads the file
+    second_panel = launch(namespace)
+    assert second_panel.fade_away_enabled is not fade_away
+    second_panel.toggle_fade_away()